@@ -19,6 +19,8 @@ from typing import Any, Optional
 import anthropic
 
 from meta_ads_analyzer.models import AdAnalysis, AdContent, AdType
+from meta_ads_analyzer.utils.claude_client import get_claude
+from meta_ads_analyzer.utils.jsonio import loads_fenced
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -35,7 +37,6 @@ class AdAnalyzer:
         self.max_concurrent = a_cfg.get("max_concurrent", 3)
         self.temperature = a_cfg.get("temperature", 0.3)
         self.max_retries = a_cfg.get("max_retries", 3)
-        self._client = anthropic.AsyncAnthropic()
         self._prompt_template = self._load_prompt()
 
     def _load_prompt(self) -> str:
@@ -70,7 +71,7 @@ class AdAnalyzer:
 
         for attempt in range(self.max_retries):
             try:
-                response = await self._client.messages.create(
+                response = await get_claude().messages.create(
                     model=self.model,
                     max_tokens=4096,
                     temperature=self.temperature,
@@ -163,14 +164,7 @@ class AdAnalyzer:
         """Parse Claude's JSON response into AdAnalysis."""
         try:
             # Extract JSON from response (may be wrapped in markdown code block)
-            json_match = re.search(r"```(?:json)?\s*\n?(.*?)\n?```", response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                # Try parsing the entire response as JSON
-                json_str = response_text.strip()
-
-            data = json.loads(json_str)
+            data = loads_fenced(response_text)
 
             return AdAnalysis(
                 ad_id=ad.ad_id,
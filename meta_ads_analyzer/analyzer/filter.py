@@ -10,6 +10,7 @@ Determines which ads qualify for analysis based on:
 from __future__ import annotations
 
 import hashlib
+from collections import Counter
 from typing import Any, Optional
 
 from meta_ads_analyzer.models import (
@@ -64,11 +65,13 @@ class AdFilter:
                 included += 1
 
         # Build reason breakdown for summary
-        reason_counts: dict[str, int] = {}
-        for c in results:
-            if c.status == AdStatus.FILTERED_OUT and c.filter_reason:
-                r = c.filter_reason.value
-                reason_counts[r] = reason_counts.get(r, 0) + 1
+        reason_counts = dict(
+            Counter(
+                c.filter_reason.value
+                for c in results
+                if c.status == AdStatus.FILTERED_OUT and c.filter_reason
+            )
+        )
 
         logger.info(
             f"Filtering complete: {included} included, {filtered} filtered out "
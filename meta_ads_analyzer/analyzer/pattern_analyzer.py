@@ -6,8 +6,8 @@ commonalities, and strategic insights across all analyzed ads.
 
 from __future__ import annotations
 
+import bisect
 import json
-import re
 from pathlib import Path
 from typing import Any, Optional
 
@@ -15,12 +15,28 @@ import anthropic
 from jinja2 import Template
 
 from meta_ads_analyzer.models import AdAnalysis, PatternReport, QualityReport
+from meta_ads_analyzer.utils.claude_client import stream_text
+from meta_ads_analyzer.utils.jsonio import loads_fenced
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 PROMPT_PATH = Path(__file__).parent.parent.parent / "prompts" / "pattern_analysis.txt"
 
+_EMPTY_VALUES = (None, "", [], {})
+
+
+def _compact_for_prompt(ad_data: dict[str, Any]) -> dict[str, Any]:
+    """Drop empty fields and repeated list entries to cut prompt tokens."""
+    compact = {}
+    for key, value in ad_data.items():
+        if value in _EMPTY_VALUES:
+            continue
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            value = list(dict.fromkeys(value))
+        compact[key] = value
+    return compact
+
 
 class PatternAnalyzer:
     """Identify patterns across multiple ad analyses."""
@@ -30,8 +46,7 @@ class PatternAnalyzer:
         self.model = a_cfg.get("model", "claude-sonnet-4-20250514")
         self.temperature = a_cfg.get("temperature", 0.3)
         self.max_retries = a_cfg.get("max_retries", 3)
-        self._client = anthropic.AsyncAnthropic()
-        self._prompt_template = self._load_prompt()
+        self._prompt_template = Template(self._load_prompt())
 
     def _load_prompt(self) -> str:
         if PROMPT_PATH.exists():
@@ -67,7 +82,7 @@ class PatternAnalyzer:
         # Prepare ad analyses as JSON for the prompt
         analyses_data = []
         for a in analyses:
-            analyses_data.append({
+            analyses_data.append(_compact_for_prompt({
                 "ad_id": a.ad_id,
                 "impression_rank": impression_rank_map.get(a.ad_id, len(analyses)),
                 "days_since_launch": a.days_since_launch if a.days_since_launch is not None else 999,
@@ -110,7 +125,7 @@ class PatternAnalyzer:
                 "cta_strategy": a.cta_strategy,
                 "analysis_confidence": a.analysis_confidence,
                 "copy_quality_score": a.copy_quality_score,
-            })
+            }))
 
         # Calculate dataset size for adaptive depth
         total_ads = len(analyses)
@@ -120,7 +135,7 @@ class PatternAnalyzer:
             search_query=search_query,
             brand=brand or "Unknown",
             total_ads=total_ads,
-            analyses_json=json.dumps(analyses_data, indent=2),
+            analyses_json=json.dumps(analyses_data, ensure_ascii=False, separators=(",", ":")),
             small_dataset=(dataset_size == "small"),
             dataset_size=dataset_size,
         )
@@ -128,14 +143,13 @@ class PatternAnalyzer:
         # Call Claude for pattern analysis (with retries)
         for attempt in range(self.max_retries):
             try:
-                response = await self._client.messages.create(
+                text = await stream_text(
                     model=self.model,
                     max_tokens=16384,
                     temperature=self.temperature,
                     messages=[{"role": "user", "content": prompt}],
                 )
 
-                text = response.content[0].text
                 report = self._parse_response(
                     text, search_query, brand, len(analyses), quality_report
                 )
@@ -179,8 +193,7 @@ class PatternAnalyzer:
         dataset_size: str = "large",
     ) -> str:
         # Use Jinja2 for template rendering with conditional support
-        template = Template(self._prompt_template)
-        return template.render(
+        return self._prompt_template.render(
             search_query=search_query,
             brand=brand,
             total_ads=total_ads,
@@ -199,13 +212,7 @@ class PatternAnalyzer:
     ) -> Optional[PatternReport]:
         """Parse pattern analysis response into PatternReport."""
         try:
-            json_match = re.search(r"```(?:json)?\s*\n?(.*?)\n?```", response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = response_text.strip()
-
-            data = json.loads(json_str)
+            data = loads_fenced(response_text)
 
             report = PatternReport(
                 search_query=search_query,
@@ -600,41 +607,36 @@ class PatternAnalyzer:
         This matrix shows which root cause + mechanism combinations are used,
         making it easy to spot saturated, underexploited, and missing combos.
         """
-        from collections import defaultdict
-
-        # Build matrix from actual ad data
-        matrix_data = defaultdict(lambda: {"ads": [], "count": 0})
-
-        for ad in analyses:
-            root = ad.root_cause or "none stated in ad"
-            mech = ad.mechanism or "none stated in ad"
-
-            # Clean up the text for grouping
-            root_clean = root[:80].strip()
-            mech_clean = mech[:80].strip()
-
-            key = (root_clean, mech_clean)
-            matrix_data[key]["ads"].append(ad.ad_id)
-            matrix_data[key]["count"] += 1
-            matrix_data[key]["root_cause"] = root_clean
-            matrix_data[key]["mechanism"] = mech_clean
+        from collections import Counter, defaultdict
 
-        # Sort by frequency descending
-        sorted_combos = sorted(
-            matrix_data.values(), key=lambda x: x["count"], reverse=True
-        )
-
-        # Calculate percentages
+        # Group ads by cleaned (root cause, mechanism) text
+        keys = [
+            (
+                (ad.root_cause or "none stated in ad")[:80].strip(),
+                (ad.mechanism or "none stated in ad")[:80].strip(),
+            )
+            for ad in analyses
+        ]
+        counts = Counter(keys)
+
+        # Only the first 3 ad IDs per combo are shown as examples
+        examples: dict[tuple[str, str], list[str]] = defaultdict(list)
+        for key, ad in zip(keys, analyses):
+            ids = examples[key]
+            if len(ids) < 3:
+                ids.append(ad.ad_id)
+
+        # Rows by frequency descending, with percentages
         total_ads = len(analyses)
         matrix_rows = []
-        for combo in sorted_combos:
-            pct = round((combo["count"] / total_ads) * 100) if total_ads > 0 else 0
+        for (root_clean, mech_clean), count in counts.most_common():
+            pct = round((count / total_ads) * 100) if total_ads > 0 else 0
             matrix_rows.append({
-                "root_cause": combo["root_cause"],
-                "mechanism": combo["mechanism"],
-                "num_ads": combo["count"],
+                "root_cause": root_clean,
+                "mechanism": mech_clean,
+                "num_ads": count,
                 "percent": pct,
-                "example_ads": combo["ads"][:3],  # First 3 ad IDs as examples
+                "example_ads": examples[(root_clean, mech_clean)],
             })
 
         # Add matrix to report as a new field
@@ -652,7 +654,10 @@ class PatternAnalyzer:
         return report
 
     def _format_matrix_text(self, matrix_rows: list[dict], total_ads: int) -> str:
-        """Format Root Cause x Mechanism matrix as text table."""
+        """Format Root Cause x Mechanism matrix as text table.
+
+        ``matrix_rows`` must be sorted by percent descending.
+        """
         lines = []
         lines.append("## ROOT CAUSE × MECHANISM MATRIX")
         lines.append("")
@@ -668,18 +673,21 @@ class PatternAnalyzer:
         )
         lines.append("|---|---|---|---|---|")
 
-        for row in matrix_rows:
-            pct = row["percent"]
-            # Classify status
-            if pct >= 60:
-                status = "🔴 SATURATED"
-            elif pct >= 30:
-                status = "🟡 MODERATE"
-            elif pct > 0:
-                status = "🟢 UNDEREXPLOITED"
-            else:
-                status = "⚪ NONE"
+        # Rows are sorted by percent, so each status is a contiguous run:
+        # 60%+ saturated, 30%+ moderate, above 0 underexploited, else none
+        neg_pcts = [-row["percent"] for row in matrix_rows]
+        saturated_end = bisect.bisect_right(neg_pcts, -60)
+        moderate_end = bisect.bisect_right(neg_pcts, -30)
+        underexploited_end = bisect.bisect_left(neg_pcts, 0)
+        statuses = (
+            ["🔴 SATURATED"] * saturated_end
+            + ["🟡 MODERATE"] * (moderate_end - saturated_end)
+            + ["🟢 UNDEREXPLOITED"] * (underexploited_end - moderate_end)
+            + ["⚪ NONE"] * (len(matrix_rows) - underexploited_end)
+        )
 
+        for row, status in zip(matrix_rows, statuses):
+            pct = row["percent"]
             root_short = row["root_cause"][:40] + (
                 "..." if len(row["root_cause"]) > 40 else ""
             )
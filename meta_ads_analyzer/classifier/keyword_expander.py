@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-import json
 from typing import Optional
 
-import anthropic
-
 from meta_ads_analyzer.models import ProductType
+from meta_ads_analyzer.utils.claude_client import get_claude
+from meta_ads_analyzer.utils.jsonio import loads_enclosed
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -55,7 +54,7 @@ Return ONLY a JSON array of {count} related keywords, no other text:
 ["keyword1", "keyword2", "keyword3", "keyword4"]"""
 
     try:
-        client = anthropic.AsyncAnthropic()
+        client = get_claude()
         response = await client.messages.create(
             model=config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514"),
             max_tokens=512,
@@ -66,12 +65,8 @@ Return ONLY a JSON array of {count} related keywords, no other text:
         text = response.content[0].text.strip()
 
         # Extract JSON array
-        if "[" in text and "]" in text:
-            start = text.find("[")
-            end = text.rfind("]") + 1
-            json_text = text[start:end]
-            keywords = json.loads(json_text)
-
+        keywords = loads_enclosed(text)
+        if keywords is not None:
             # Validate and clean
             keywords = [k.strip() for k in keywords if isinstance(k, str) and k.strip()]
             keywords = keywords[:count]  # Limit to requested count
@@ -117,7 +112,7 @@ Return ONLY a JSON array, no other text:
 [{{"category": "red light eye device", "keyword": "red light therapy eye device"}}, ...]"""
 
     try:
-        client = anthropic.AsyncAnthropic()
+        client = get_claude()
         response = await client.messages.create(
             model=config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514"),
             max_tokens=512,
@@ -127,12 +122,8 @@ Return ONLY a JSON array, no other text:
 
         text = response.content[0].text.strip()
 
-        if "[" in text and "]" in text:
-            start = text.find("[")
-            end = text.rfind("]") + 1
-            json_text = text[start:end]
-            items = json.loads(json_text)
-
+        items = loads_enclosed(text)
+        if items is not None:
             # Validate: each item must have both keys
             valid = [
                 item for item in items
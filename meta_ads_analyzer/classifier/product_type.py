@@ -2,15 +2,26 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from operator import attrgetter
 from urllib.parse import urlparse
 
-import anthropic
-
 from meta_ads_analyzer.models import ProductType, ScrapedAd
+from meta_ads_analyzer.utils.claude_client import get_claude
+from meta_ads_analyzer.utils.jsonio import loads_enclosed
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+_SUPPLEMENT_TERMS = (
+    'capsule', 'pill', 'tablet', 'drop', 'softgel', 'formula', 'ingredient',
+    'dosage', 'serving', 'supplement', 'vitamin', 'mineral', 'herb', 'extract',
+    'mg', 'mcg', 'iu', 'daily', 'bottle', 'dose', 'proprietary blend'
+)
+
+# Fields shown to Claude per ad, fetched in one C-level call
+_AD_FIELDS = attrgetter('page_name', 'headline', 'cta_text', 'link_url', 'primary_text')
+
 
 def extract_domain(url: str) -> str:
     """Extract domain from URL."""
@@ -30,16 +41,8 @@ def detect_supplement_signals(ad: ScrapedAd) -> bool:
     Returns:
         True if ad contains clear supplement signals
     """
-    text = (ad.primary_text or "") + " " + (ad.headline or "") + " " + (ad.description or "")
-    text_lower = text.lower()
-
-    supplement_terms = [
-        'capsule', 'pill', 'tablet', 'drop', 'softgel', 'formula', 'ingredient',
-        'dosage', 'serving', 'supplement', 'vitamin', 'mineral', 'herb', 'extract',
-        'mg', 'mcg', 'iu', 'daily', 'bottle', 'dose', 'proprietary blend'
-    ]
-
-    return any(term in text_lower for term in supplement_terms)
+    text_lower = ad.searchable_text_lower
+    return any(term in text_lower for term in _SUPPLEMENT_TERMS)
 
 
 async def classify_product_type_batch(ads: list[ScrapedAd], config: dict) -> dict[str, ProductType]:
@@ -99,16 +102,14 @@ async def _classify_with_claude(ads: list[ScrapedAd], config: dict) -> dict[str,
     """
     # Build batch classification prompt with ENHANCED SIGNALS
     ad_samples = []
-    for i, ad in enumerate(ads[:50], 1):  # Limit to 50 ads per batch
-        text = ad.primary_text or ""
-        headline = ad.headline or ""
-        cta = ad.cta_text or ""
-        description = ad.description or ""
-        domain = extract_domain(ad.link_url) if ad.link_url else ""
+    # Limit to 50 ads per batch
+    for i, (page_name, headline, cta, link_url, text) in enumerate(map(_AD_FIELDS, ads[:50]), 1):
+        domain = extract_domain(link_url) if link_url else ""
 
         # Include ALL signals in classification
         ad_samples.append(
-            f"{i}. [{ad.page_name}] {headline} | CTA: {cta} | {text[:150]} | Domain: {domain}"
+            f"{i}. [{page_name}] {headline or ''} | CTA: {cta or ''} | "
+            f"{(text or '')[:150]} | Domain: {domain}"
         )
 
     prompt = f"""Classify product type for each ad. Be AGGRESSIVE - only use "unknown" if genuinely no signal.
@@ -143,7 +144,7 @@ Return JSON array (one per ad): ["supplement", "device", "supplement", ...]
 ONLY return the JSON array, no other text."""
 
     try:
-        client = anthropic.AsyncAnthropic()
+        client = get_claude()
         response = await client.messages.create(
             model=config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514"),
             max_tokens=2048,
@@ -151,18 +152,10 @@ ONLY return the JSON array, no other text."""
             messages=[{"role": "user", "content": prompt}],
         )
 
-        # Parse response
-        import json
-
+        # Parse JSON array from response
         text = response.content[0].text.strip()
-
-        # Extract JSON array from response
-        if "[" in text and "]" in text:
-            start = text.find("[")
-            end = text.rfind("]") + 1
-            json_text = text[start:end]
-            classifications = json.loads(json_text)
-        else:
+        classifications = loads_enclosed(text)
+        if classifications is None:
             logger.warning("Could not parse product type classifications, defaulting to unknown")
             return {ad.ad_id: ProductType.UNKNOWN for ad in ads}
 
@@ -182,6 +175,11 @@ ONLY return the JSON array, no other text."""
         return {ad.ad_id: ProductType.UNKNOWN for ad in ads}
 
 
+def product_type_breakdown(ads: list[ScrapedAd]) -> dict[str, int]:
+    """Count ads per product type value ("None" for unclassified), for logging."""
+    return dict(Counter(ad.product_type.value if ad.product_type else "None" for ad in ads))
+
+
 def get_dominant_product_type(ads: list[ScrapedAd]) -> tuple[ProductType, dict[ProductType, int]]:
     """Get dominant product type from a list of ads.
 
@@ -196,18 +194,18 @@ def get_dominant_product_type(ads: list[ScrapedAd]) -> tuple[ProductType, dict[P
     Returns:
         Tuple of (dominant_type, distribution_dict)
     """
-    distribution: dict[ProductType, int] = {}
-    for ad in ads:
-        distribution[ad.product_type] = distribution.get(ad.product_type, 0) + 1
+    candidates = Counter(ad.product_type for ad in ads)
+    distribution: dict[ProductType, int] = dict(candidates)
 
     # Remove UNKNOWN from consideration
-    candidates = {pt: count for pt, count in distribution.items() if pt != ProductType.UNKNOWN}
+    del candidates[ProductType.UNKNOWN]
 
     if not candidates:
         return ProductType.UNKNOWN, distribution
 
-    sorted_candidates = sorted(candidates.items(), key=lambda x: x[1], reverse=True)
-    dominant_type, dominant_count = sorted_candidates[0]
+    # Only the leader and runner-up matter, so don't sort every candidate
+    top_two = candidates.most_common(2)
+    dominant_type, dominant_count = top_two[0]
     total_non_unknown = sum(candidates.values())
     dominant_pct = dominant_count / total_non_unknown * 100
 
@@ -220,12 +218,12 @@ def get_dominant_product_type(ads: list[ScrapedAd]) -> tuple[ProductType, dict[P
         return ProductType.UNKNOWN, distribution
 
     # Must also be ≥1.5× the runner-up (prevents 34% vs 33% from filtering)
-    if len(sorted_candidates) > 1:
-        runner_up_count = sorted_candidates[1][1]
+    if len(top_two) > 1:
+        runner_up_type, runner_up_count = top_two[1]
         if dominant_count < runner_up_count * 1.5:
             logger.info(
                 f"No clear dominant product type ({dominant_type.value}={dominant_count} vs "
-                f"{sorted_candidates[1][0].value}={runner_up_count}, ratio={dominant_count/runner_up_count:.2f} < 1.5) — "
+                f"{runner_up_type.value}={runner_up_count}, ratio={dominant_count/runner_up_count:.2f} < 1.5) — "
                 "using all product types"
             )
             return ProductType.UNKNOWN, distribution
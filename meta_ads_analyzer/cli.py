@@ -8,12 +8,10 @@ Usage:
 
 from __future__ import annotations
 
-import asyncio
-import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 def _pdf_output_dir() -> Path:
     """Return PDF output directory — env override for Docker, Desktop fallback locally."""
@@ -21,22 +19,46 @@ def _pdf_output_dir() -> Path:
 
 import typer
 from rich.console import Console
-from rich.table import Table
 
-from meta_ads_analyzer.models import MarketResult, ScanResult, SelectionResult
-from meta_ads_analyzer.utils.config import load_config
-from meta_ads_analyzer.utils.logging import setup_logging
+# Heavy modules (pydantic models, asyncio, the pipelines) are imported inside
+# the commands that need them so `meta-ads --help` starts quickly.
+if TYPE_CHECKING:
+    from meta_ads_analyzer.models import MarketResult, ScanResult, SelectionResult
 
 app = typer.Typer(
     name="meta-ads",
     help="Extract, transcribe, and analyze Meta Ads Library ads at scale.",
     add_completion=False,
+    no_args_is_help=True,
 )
 console = Console()
 
 
+def _setup(log_level: str, config_path: Optional[Path]) -> dict:
+    """Configure logging and load config for a command."""
+    from meta_ads_analyzer.utils.config import load_config
+    from meta_ads_analyzer.utils.logging import setup_logging
+
+    setup_logging(log_level)
+    return load_config(config_path)
+
+
+def _run_async(coro):
+    """Run a coroutine to completion, on uvloop when it is installed."""
+    import asyncio
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+
 def _display_advertiser_table(advertisers: list, top: int = 25) -> None:
     """Display top N advertisers in a Rich table."""
+    from rich.table import Table
+
     table = Table(title=f"Top {min(top, len(advertisers))} Advertisers")
     table.add_column("Rank", style="cyan", width=6)
     table.add_column("Advertiser", style="green")
@@ -103,8 +125,9 @@ def _save_scan_results(
     save_path.parent.mkdir(parents=True, exist_ok=True)
 
     # Save JSON
-    with open(save_path, "w") as f:
-        json.dump(scan_result.model_dump(mode="json"), f, indent=2, default=str)
+    from meta_ads_analyzer.utils.jsonio import write_model_json
+
+    write_model_json(save_path, scan_result)
 
     return save_path
 
@@ -127,8 +150,7 @@ def run(
     debug: bool = typer.Option(False, "--debug", help="Save debug screenshots to output/debug/"),
 ):
     """Analyze ads for a single brand/keyword."""
-    setup_logging(log_level)
-    config = load_config(config_path)
+    config = _setup(log_level, config_path)
 
     # Apply CLI overrides
     if max_ads is not None:
@@ -148,7 +170,7 @@ def run(
     from meta_ads_analyzer.pipeline import Pipeline
 
     pipeline = Pipeline(config)
-    report = asyncio.run(pipeline.run(query=query, brand=brand))
+    report = _run_async(pipeline.run(query=query, brand=brand))
 
     if report.executive_summary:
         console.print("\n[bold]Executive Summary:[/]")
@@ -169,6 +191,9 @@ def batch(
         None, "--config", "-c", help="Path to config TOML file"
     ),
     log_level: str = typer.Option("INFO", "--log-level", "-l", help="Log level"),
+    concurrency: Optional[int] = typer.Option(
+        None, "--concurrency", "-j", help="Brands to analyze at once (default: config)"
+    ),
 ):
     """Analyze multiple brands from a JSON file.
 
@@ -179,15 +204,15 @@ def batch(
         ...
     ]
     """
-    setup_logging(log_level)
-    config = load_config(config_path)
+    config = _setup(log_level, config_path)
 
     if not brands_file.exists():
         console.print(f"[red]File not found: {brands_file}[/]")
         raise typer.Exit(1)
 
-    with open(brands_file) as f:
-        queries = json.load(f)
+    from meta_ads_analyzer.utils.jsonio import read_json
+
+    queries = read_json(brands_file)
 
     if not isinstance(queries, list):
         console.print("[red]JSON file must contain a list of {query, brand} objects[/]")
@@ -200,7 +225,7 @@ def batch(
     from meta_ads_analyzer.pipeline import BatchPipeline
 
     batch_pipeline = BatchPipeline(config)
-    reports = asyncio.run(batch_pipeline.run_batch(queries))
+    reports = _run_async(batch_pipeline.run_batch(queries, concurrency=concurrency))
 
     # Summary
     console.print("\n[bold]═══ Batch Summary ═══[/]")
@@ -229,8 +254,7 @@ def scan(
     log_level: str = typer.Option("INFO", "--log-level", "-l", help="Log level"),
 ):
     """Scan Meta Ads Library for metadata only (no downloads or analysis)."""
-    setup_logging(log_level)
-    config = load_config(config_path)
+    config = _setup(log_level, config_path)
 
     # Apply CLI overrides
     if max_ads is not None:
@@ -246,7 +270,7 @@ def scan(
     # Run scan
     from meta_ads_analyzer.scanner import run_scan
 
-    scan_result = asyncio.run(run_scan(query, config))
+    scan_result = _run_async(run_scan(query, config))
 
     # Display advertiser table
     if scan_result.advertisers:
@@ -289,10 +313,15 @@ def market(
     output: Optional[Path] = typer.Option(None, "--output", "-o", help="Output directory"),
     log_level: str = typer.Option("INFO", "--log-level", "-l"),
     debug: bool = typer.Option(False, "--debug", help="Print per-stage ad funnel breakdown for each brand"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Re-run adjacent keyword scans instead of using today's cache "
+        "(cached dimension extractions are bypassed with 'compare --no-cache')",
+    ),
 ):
     """Competitive market research - analyze multiple brands for a keyword."""
-    setup_logging(log_level)
-    config = load_config(config_path)
+    config = _setup(log_level, config_path)
 
     # Apply overrides
     config.setdefault("scraper", {})["headless"] = headless
@@ -301,6 +330,8 @@ def market(
         config.setdefault("reporting", {})["output_dir"] = str(output)
     if debug:
         config.setdefault("market", {})["debug"] = True
+    if no_cache:
+        config.setdefault("scan", {})["adjacent_cache"] = False
 
     console.print(f"\n[bold]Market Research: {query}[/]")
     if brand:
@@ -312,7 +343,7 @@ def market(
     from meta_ads_analyzer.market_pipeline import MarketPipeline
 
     market_pipeline = MarketPipeline(config)
-    result = asyncio.run(
+    result = _run_async(
         market_pipeline.run(
             keyword=query,
             top_brands=top_brands,
@@ -354,6 +385,8 @@ def _display_market_summary(result: MarketResult):
         console.print("[yellow]No brands analyzed[/]")
         return
 
+    from rich.table import Table
+
     table = Table(title=f"Market Overview: {result.keyword}")
     table.add_column("Brand", style="green", width=25)
     table.add_column("Ads", justify="right", style="cyan")
@@ -406,16 +439,22 @@ def compare(
     ads_per_brand: int = typer.Option(10, "--ads-per-brand", help="Ads per brand (when using --from-scan)"),
     enhance: bool = typer.Option(False, "--enhance", help="Add Claude strategic layer"),
     json_output: bool = typer.Option(False, "--json", help="Output JSON to stdout"),
+    no_cache: bool = typer.Option(
+        False,
+        "--no-cache",
+        help="Re-run strategic dimension extraction instead of using cached Claude responses",
+    ),
     output: Optional[Path] = typer.Option(None, "--output", "-o", help="Output directory"),
     config_path: Optional[Path] = typer.Option(None, "--config", "-c"),
     log_level: str = typer.Option("INFO", "--log-level", "-l"),
 ):
     """Compare brands - generate Market Map and Loophole Document."""
-    setup_logging(log_level)
-    config = load_config(config_path)
+    config = _setup(log_level, config_path)
 
     if output:
         config.setdefault("reporting", {})["output_dir"] = str(output)
+    if no_cache:
+        config.setdefault("analyzer", {}).update(dimension_cache=False, response_cache=False)
 
     console.print(f"\n[bold]Market Comparison: {query}[/]")
     if brand:
@@ -424,7 +463,7 @@ def compare(
     from meta_ads_analyzer.compare_pipeline import ComparePipeline
 
     pipeline = ComparePipeline(config)
-    result = asyncio.run(
+    result = _run_async(
         pipeline.run(
             keyword=query,
             focus_brand=brand,
@@ -438,7 +477,12 @@ def compare(
 
     # Display results
     if json_output:
-        console.print_json(data=result.model_dump(mode="json"))
+        if console.is_terminal:
+            console.print_json(data=result.model_dump(mode="json"))
+        else:
+            # Piped: the same text, serialized by pydantic-core without an
+            # intermediate dict or highlighting pass
+            typer.echo(result.model_dump_json(indent=2))
     elif result.competition_level == "blue_ocean" and result.blue_ocean_result:
         # Blue ocean — PDF was already generated by market pipeline, but regenerate if not found
         console.print(f"\n[bold yellow]🌊 Blue Ocean Market: {query}[/]")
@@ -588,18 +632,27 @@ def pdf(
 @app.command()
 def install_browser():
     """Install Playwright browsers (required first-time setup)."""
-    import subprocess
+    import asyncio
+    import sys
+
+    async def _install() -> int:
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "playwright", "install", "chromium",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        # Stream installer output as it arrives instead of buffering it all
+        async for line in proc.stdout:
+            console.print(line.decode(errors="replace").rstrip(), markup=False, highlight=False)
+        return await proc.wait()
 
     console.print("[cyan]Installing Playwright Chromium browser...[/]")
-    result = subprocess.run(
-        ["python", "-m", "playwright", "install", "chromium"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode == 0:
+    returncode = _run_async(_install())
+    if returncode == 0:
         console.print("[green]Browser installed successfully![/]")
     else:
-        console.print(f"[red]Installation failed:[/]\n{result.stderr}")
+        console.print(f"[red]Installation failed (exit code {returncode})[/]")
+        raise typer.Exit(returncode)
 
 
 if __name__ == "__main__":
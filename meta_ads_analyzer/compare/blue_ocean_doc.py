@@ -7,22 +7,40 @@ from adjacent category competitors.
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+import asyncio
+import hashlib
+from datetime import date, datetime, timezone
+from operator import itemgetter
+from pathlib import Path
 from typing import Any, Optional
 
+from meta_ads_analyzer.classifier.keyword_expander import generate_related_keywords
+from meta_ads_analyzer.classifier.product_type import (
+    filter_ads_by_product_type,
+    get_dominant_product_type,
+)
 from meta_ads_analyzer.compare.strategic_dimensions import (
     BlueOceanAdConcept,
     BlueOceanResult,
     BlueOceanWeekPlan,
 )
+from meta_ads_analyzer.models import ProductType
+from meta_ads_analyzer.scanner import run_scan
+from meta_ads_analyzer.scraper.browser_pool import BrowserPool
+from meta_ads_analyzer.selector import aggregate_by_advertiser
+from meta_ads_analyzer.utils.claude_cache import cached_json_response
+from meta_ads_analyzer.utils.claude_client import get_claude
+from meta_ads_analyzer.utils.jsonio import loads_fenced, read_json, write_json, write_model_json
 from meta_ads_analyzer.utils.logging import get_logger
+from meta_ads_analyzer.utils.prompt_template import PromptTemplate
 
 logger = get_logger(__name__)
 
+DEFAULT_ADJACENT_CACHE_DIR = "output/adjacent_cache"
+
 # ── Prompts ────────────────────────────────────────────────────────────────────
 
-_GOLD_STANDARD_PROMPT = """You are a world-class direct response strategist. You have deep ad analysis data from brands in markets adjacent to "{keyword}".
+_GOLD_STANDARD_PROMPT = PromptTemplate("""You are a world-class direct response strategist. You have deep ad analysis data from brands in markets adjacent to "{keyword}".
 
 === TARGET MARKET ===
 Product: {keyword}
@@ -169,9 +187,9 @@ RULES:
 - loophole_type options: ROOT CAUSE, MECHANISM, INGREDIENT, AUTHORITY, PROOF, AVATAR
 - risk_level options: LOW RISK, MEDIUM RISK, HIGH RISK
 - focus_brand_strengths and focus_brand_gaps: only populate if focus brand data is provided; otherwise keep as []
-"""
+""")
 
-_FALLBACK_PROMPT = """You are a world-class direct response strategist analyzing a blue ocean market opportunity.
+_FALLBACK_PROMPT = PromptTemplate("""You are a world-class direct response strategist analyzing a blue ocean market opportunity.
 
 MARKET: {keyword}
 
@@ -246,9 +264,9 @@ Generate a complete blue ocean execution strategy. Return ONLY valid JSON:
   "focus_brand_strengths": [],
   "focus_brand_gaps": []
 }}
-"""
+""")
 
-_FOCUS_SECTION = """FOCUS BRAND ANALYSIS — {focus_brand}:
+_FOCUS_SECTION = PromptTemplate("""FOCUS BRAND ANALYSIS — {focus_brand}:
 Total ads analyzed: {ads_analyzed}
 
 Root causes used in ads:
@@ -265,7 +283,7 @@ Top pain points:
 
 Executive summary from ad patterns:
 {summary}
-"""
+""")
 
 
 # ── Main function ─────────────────────────────────────────────────────────────
@@ -292,24 +310,22 @@ async def generate_blue_ocean_doc(
     Returns:
         BlueOceanResult
     """
-    from anthropic import AsyncAnthropic
-
-    client = AsyncAnthropic()
+    client = get_claude()
     model = config.get("claude", {}).get("model", "claude-sonnet-4-20250514")
 
     brands_scanned = len(brand_ad_counts)
-    max_qualifying_ads = max(brand_ad_counts.values()) if brand_ad_counts else 0
-    sorted_counts = sorted(brand_ad_counts.items(), key=lambda x: x[1], reverse=True)
+    sorted_counts = sorted(brand_ad_counts.items(), key=itemgetter(1), reverse=True)
+    max_qualifying_ads = sorted_counts[0][1] if sorted_counts else 0
 
     # Build focus section
     focus_section = ""
     focus_brand_data: dict = {}
     if focus_brand and focus_brand_pattern_report:
         pr = focus_brand_pattern_report
-        root_causes = _extract_patterns(pr.root_cause_patterns, "root_cause", 5)
-        mechanisms = _extract_patterns(pr.mechanism_patterns, "mechanism", 5)
-        avatar_patterns = _extract_patterns(pr.target_customer_patterns, "profile", 3)
-        pain_points = _extract_patterns(pr.common_pain_points, "pain_point", 5)
+        root_causes, root_cause_values = _extract_patterns(pr.root_cause_patterns, "root_cause", 5)
+        mechanisms, mechanism_values = _extract_patterns(pr.mechanism_patterns, "mechanism", 5)
+        avatar_patterns, _ = _extract_patterns(pr.target_customer_patterns, "profile", 3)
+        pain_points, pain_point_values = _extract_patterns(pr.common_pain_points, "pain_point", 5)
         focus_section = _FOCUS_SECTION.format(
             focus_brand=focus_brand,
             ads_analyzed=pr.total_ads_analyzed,
@@ -321,10 +337,10 @@ async def generate_blue_ocean_doc(
         )
         focus_brand_data = {
             "ads_analyzed": pr.total_ads_analyzed,
-            "root_causes": [p.get("root_cause", p.get("pattern", "")) for p in pr.root_cause_patterns[:5]],
-            "mechanisms": [p.get("mechanism", p.get("pattern", "")) for p in pr.mechanism_patterns[:5]],
+            "root_causes": root_cause_values,
+            "mechanisms": mechanism_values,
             "avatar": avatar_patterns,
-            "pain_points": [p.get("pain_point", p.get("pattern", "")) for p in pr.common_pain_points[:5]],
+            "pain_points": pain_point_values,
         }
 
     # Use gold standard prompt if we have adjacent brand analyses
@@ -349,28 +365,36 @@ async def generate_blue_ocean_doc(
             focus_section=focus_section,
         )
 
-    # Call Claude
-    logger.info(f"Generating blue ocean strategy for '{keyword}' with Claude...")
-    try:
+    async def _fetch() -> dict:
+        logger.info(f"Generating blue ocean strategy for '{keyword}' with Claude...")
         response = await client.messages.create(
             model=model,
             max_tokens=6000,
             messages=[{"role": "user", "content": prompt}],
         )
-        raw = response.content[0].text.strip()
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        if raw.endswith("```"):
-            raw = raw[: raw.rfind("```")]
-        claude_data = json.loads(raw.strip())
-    except Exception as e:
-        logger.error(f"Claude blue ocean generation failed: {e}")
+        raw = response.content[0].text
+        # Extract JSON from response (may be wrapped in markdown code block)
+        return loads_fenced(raw)
+
+    async def _generate() -> dict:
+        try:
+            return await cached_json_response(prompt, model, config, _fetch)
+        except Exception as e:
+            logger.error(f"Claude blue ocean generation failed: {e}")
+            return _fallback_claude_data(keyword)
+
+    if has_adjacent_data or max_qualifying_ads > 0 or focus_section:
+        # Scan adjacent keywords for blue ocean confirmation table while Claude
+        # runs; both branches handle their own failures.
+        claude_data, adjacent_keywords = await asyncio.gather(
+            _generate(), _scan_adjacent_keywords(keyword, config)
+        )
+    else:
+        # Nothing for Claude to analyze (no competitors, no focus brand) — skip
+        # the call and use the template
+        logger.info(f"No competing ads for '{keyword}', using fallback blue ocean template")
         claude_data = _fallback_claude_data(keyword)
-
-    # Scan adjacent keywords for blue ocean confirmation table
-    adjacent_keywords = await _scan_adjacent_keywords(keyword, config)
+        adjacent_keywords = await _scan_adjacent_keywords(keyword, config)
 
     # Build ad concepts
     ad_concepts = [
@@ -398,7 +422,7 @@ async def generate_blue_ocean_doc(
     return BlueOceanResult(
         keyword=keyword,
         focus_brand=focus_brand,
-        generated_at=datetime.utcnow().isoformat(),
+        generated_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
         brands_scanned=brands_scanned,
         max_qualifying_ads=max_qualifying_ads,
         brand_ad_counts=[{"brand": b, "qualifying_ads": c} for b, c in sorted_counts],
@@ -531,14 +555,23 @@ def _format_adjacent_brands_for_prompt(brand_reports: list) -> str:
     return "\n".join(lines)
 
 
-def _extract_patterns(patterns: list, key: str, limit: int) -> str:
-    """Extract pattern text from a list of pattern dicts."""
-    results = []
+_FALLBACK_PATTERN_KEYS = ("pattern", "text")
+
+
+def _extract_patterns(patterns: list, key: str, limit: int) -> tuple[str, list[str]]:
+    """Extract pattern text from a list of pattern dicts.
+
+    Returns the bulleted prompt text and the bare values in a single pass.
+    """
+    lines: list[str] = []
+    values: list[str] = []
     for p in patterns[:limit]:
-        text = p.get(key) or p.get("pattern") or p.get("text") or ""
+        text = p.get(key) or next((p[k] for k in _FALLBACK_PATTERN_KEYS if p.get(k)), "")
         if text:
-            results.append(f"  - {str(text)[:120]}")
-    return "\n".join(results) if results else "  - (none detected)"
+            text = str(text)
+            values.append(text)
+            lines.append(f"  - {text[:120]}")
+    return "\n".join(lines) or "  - (none detected)", values
 
 
 def _fallback_claude_data(keyword: str) -> dict:
@@ -612,45 +645,88 @@ def _fallback_claude_data(keyword: str) -> dict:
     }
 
 
+def _adjacent_cache_path(keyword: str, config: dict) -> Optional[Path]:
+    """Return today's cache file for keyword's adjacent scans, or None if disabled."""
+    scan_cfg = config.get("scan", {})
+    if not scan_cfg.get("adjacent_cache", True):
+        return None
+    country = config.get("scraper", {}).get("filters", {}).get("country", "US")
+    key = hashlib.blake2b(
+        f"{keyword.strip().lower()}|{country}|{date.today().isoformat()}".encode(),
+        digest_size=16,
+    ).hexdigest()
+    return Path(scan_cfg.get("adjacent_cache_dir", DEFAULT_ADJACENT_CACHE_DIR)) / f"{key}.json"
+
+
 async def _scan_adjacent_keywords(keyword: str, config: dict) -> list[dict]:
-    """Scan 3-4 adjacent keywords to confirm neighboring markets are also blue ocean."""
-    try:
-        from meta_ads_analyzer.classifier.keyword_expander import generate_related_keywords
-        from meta_ads_analyzer.models import ProductType
-        from meta_ads_analyzer.scanner import run_scan
-        from meta_ads_analyzer.classifier.product_type import (
-            get_dominant_product_type,
-            filter_ads_by_product_type,
-        )
-        from meta_ads_analyzer.selector import aggregate_by_advertiser
+    """Scan 3-4 adjacent keywords to confirm neighboring markets are also blue ocean.
 
+    Results are cached on disk per keyword, country and day, since adjacent
+    markets rarely change between same-day re-runs.
+    """
+    cache_path = _adjacent_cache_path(keyword, config)
+    if cache_path is not None and cache_path.exists():
+        try:
+            results = read_json(cache_path)
+            logger.info(f"Using cached adjacent keyword scans for '{keyword}'")
+            return results
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable adjacent scan cache {cache_path.name}: {e}")
+
+    results = await _run_adjacent_scans(keyword, config)
+    # Empty results usually mean a failed expansion or scan — don't pin them
+    if cache_path is not None and results:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json(cache_path, results)
+        except OSError as e:
+            logger.warning(f"Could not write adjacent scan cache: {e}")
+    return results
+
+
+async def _run_adjacent_scans(keyword: str, config: dict) -> list[dict]:
+    """Expand keyword into related terms and scan each one."""
+    try:
         related = await generate_related_keywords(keyword, ProductType.UNKNOWN, config, count=4)
         if not related:
             return []
 
-        results = []
-        for kw in related[:4]:
+        semaphore = asyncio.Semaphore(config.get("scan", {}).get("adjacent_concurrency", 4))
+
+        async def _scan_one(kw: str, pool: BrowserPool) -> Optional[dict]:
+            # Everything per keyword is inside the try, so a failure in the
+            # scan or in summarizing it is logged and only drops that keyword
             try:
-                scan = await run_scan(kw, config)
+                async with semaphore:
+                    scan = await run_scan(kw, config, browser_pool=pool)
+
                 dominant_type, _ = get_dominant_product_type(scan.ads)
                 if dominant_type != ProductType.UNKNOWN:
-                    filtered = filter_ads_by_product_type(scan.ads, dominant_type, allow_unknown=True)
+                    filtered = filter_ads_by_product_type(
+                        scan.ads, dominant_type, allow_unknown=True
+                    )
                 else:
                     filtered = scan.ads
 
                 advertisers = aggregate_by_advertiser(filtered)
                 brands_with_50_plus = sum(1 for adv in advertisers if adv.ad_count >= 50)
                 max_ads = max((adv.ad_count for adv in advertisers), default=0)
-
-                results.append({
-                    "keyword": kw,
-                    "total_brands": len(advertisers),
-                    "brands_with_50_plus": brands_with_50_plus,
-                    "max_ads": max_ads,
-                    "has_competition": brands_with_50_plus >= 3,
-                })
             except Exception as e:
                 logger.warning(f"Adjacent scan failed for '{kw}': {e}")
+                return None
+
+            return {
+                "keyword": kw,
+                "total_brands": len(advertisers),
+                "brands_with_50_plus": brands_with_50_plus,
+                "max_ads": max_ads,
+                "has_competition": brands_with_50_plus >= 3,
+            }
+
+        # One Chromium for all adjacent scans; each scan gets its own context
+        async with BrowserPool.from_config(config) as pool:
+            raw = await asyncio.gather(*[_scan_one(kw, pool) for kw in related[:4]])
+        results = [r for r in raw if r is not None]
 
         return results
     except Exception as e:
@@ -660,11 +736,8 @@ async def _scan_adjacent_keywords(keyword: str, config: dict) -> list[dict]:
 
 def save_blue_ocean_doc(result: BlueOceanResult, output_dir) -> None:
     """Save blue ocean result to JSON file."""
-    from pathlib import Path
-
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     path = output_dir / "blue_ocean_report.json"
-    with open(path, "w") as f:
-        json.dump(result.model_dump(mode="json"), f, indent=2, default=str)
+    write_model_json(path, result)
     logger.info(f"Blue ocean report saved: {path}")
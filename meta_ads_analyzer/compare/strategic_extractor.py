@@ -2,27 +2,53 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import itertools
 import json
 from pathlib import Path
 from typing import Any
 
-import anthropic
 from jinja2 import Template
 
-from meta_ads_analyzer.compare.strategic_dimensions import (
-    MassDesirePattern,
-    MechanismPattern,
-    PainPointPattern,
-    RootCausePattern,
-    StrategicDimensions,
-    SymptomPattern,
-    TargetAudiencePattern,
-)
+from meta_ads_analyzer.compare.strategic_dimensions import StrategicDimensions
 from meta_ads_analyzer.models import BrandReport
+from meta_ads_analyzer.utils.claude_cache import cached_json_response
+from meta_ads_analyzer.utils.claude_client import stream_text
+from meta_ads_analyzer.utils.jsonio import loads_fenced
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+PROMPT_PATH = (
+    Path(__file__).parent.parent.parent / "prompts" / "strategic_dimension_extraction.txt"
+)
+
+_DIMENSION_KEYS = (
+    "root_causes",
+    "mechanisms",
+    "target_audiences",
+    "pain_points",
+    "symptoms",
+    "mass_desires",
+)
+
+# Pattern report lists fed to the prompt: (attribute, id prefix, text key)
+_PROMPT_PATTERN_SOURCES = (
+    ("common_pain_points", "pain", "pain_point"),
+    ("common_symptoms", "symptom", "symptom"),
+    ("root_cause_patterns", "root", "root_cause"),
+    ("mechanism_patterns", "mech", "mechanism"),
+    ("mass_desire_patterns", "desire", "desire"),
+)
+_PATTERNS_PER_SOURCE = 10
+
+
+@functools.cache
+def _prompt_template() -> Template:
+    """Read and compile the extraction prompt once per process."""
+    return Template(PROMPT_PATH.read_text())
+
 
 async def extract_strategic_dimensions(
     brand_report: BrandReport, config: dict[str, Any]
@@ -38,96 +64,88 @@ async def extract_strategic_dimensions(
     """
     logger.info(f"Extracting strategic dimensions for {brand_report.advertiser.page_name}")
 
-    # Build analyses JSON from pattern report
+    # Build analyses JSON from the top patterns in the pattern report
     pr = brand_report.pattern_report
-    analyses = []
-
-    # Extract available pattern data
-    for i, pain_point in enumerate(pr.common_pain_points[:10], 1):
-        analyses.append(
-            {
-                "id": f"pain_{i}",
-                "pain_point": pain_point.get("pain_point", ""),
-                "frequency": pain_point.get("frequency", 0),
-            }
-        )
-
-    for i, symptom in enumerate(pr.common_symptoms[:10], 1):
-        analyses.append(
-            {
-                "id": f"symptom_{i}",
-                "symptom": symptom.get("symptom", ""),
-                "frequency": symptom.get("frequency", 0),
-            }
-        )
-
-    for i, root_cause in enumerate(pr.root_cause_patterns[:10], 1):
-        analyses.append(
-            {
-                "id": f"root_{i}",
-                "root_cause": root_cause.get("root_cause", ""),
-                "frequency": root_cause.get("frequency", 0),
-            }
-        )
-
-    for i, mechanism in enumerate(pr.mechanism_patterns[:10], 1):
-        analyses.append(
-            {
-                "id": f"mech_{i}",
-                "mechanism": mechanism.get("mechanism", ""),
-                "frequency": mechanism.get("frequency", 0),
-            }
-        )
-
-    for i, desire in enumerate(pr.mass_desire_patterns[:10], 1):
-        analyses.append(
-            {
-                "id": f"desire_{i}",
-                "desire": desire.get("desire", ""),
-                "frequency": desire.get("frequency", 0),
-            }
-        )
-
-    # Load prompt template
-    prompt_path = Path("prompts/strategic_dimension_extraction.txt")
-    with open(prompt_path) as f:
-        template_text = f.read()
+    analyses = [
+        {
+            "id": f"{prefix}_{i}",
+            key: pattern.get(key, ""),
+            "frequency": pattern.get("frequency", 0),
+        }
+        for attr, prefix, key in _PROMPT_PATTERN_SOURCES
+        for i, pattern in enumerate(itertools.islice(getattr(pr, attr), _PATTERNS_PER_SOURCE), 1)
+    ]
 
-    # Render prompt using jinja2
-    template = Template(template_text)
-    prompt = template.render(
+    prompt = _prompt_template().render(
         brand_name=brand_report.advertiser.page_name,
         keyword=brand_report.keyword,
         total_ads=pr.total_ads_analyzed,
-        analyses_json=json.dumps(analyses, indent=2),
+        analyses_json=json.dumps(analyses, ensure_ascii=False, separators=(",", ":")),
     )
 
-    # Call Claude
-    client = anthropic.AsyncAnthropic()
-    response = await client.messages.create(
-        model=config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514"),
-        max_tokens=4096,
-        temperature=0,
-        messages=[{"role": "user", "content": prompt}],
+    analyzer_cfg = config.get("analyzer", {})
+    model = analyzer_cfg.get("model", "claude-sonnet-4-20250514")
+
+    async def _fetch() -> dict:
+        text = await stream_text(
+            model=model,
+            max_tokens=4096,
+            temperature=0,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return _parse_dimensions_response(text.strip())
+
+    # The prompt is rendered from the pattern report alone and sampled at
+    # temperature 0, so an unchanged report re-uses the cached extraction
+    # (e.g. when re-running compare for another focus brand); empty
+    # (unparseable) results aren't cached.
+    data = await cached_json_response(
+        prompt,
+        model,
+        config,
+        _fetch,
+        should_cache=lambda d: any(d.get(key) for key in _DIMENSION_KEYS),
+        enabled=analyzer_cfg.get("dimension_cache", False),
     )
 
-    # Parse response
-    text = response.content[0].text.strip()
-    data = _parse_dimensions_response(text)
-
-    # Convert to StrategicDimensions model
-    return StrategicDimensions(
-        root_causes=[RootCausePattern(**rc) for rc in data.get("root_causes", [])],
-        mechanisms=[MechanismPattern(**m) for m in data.get("mechanisms", [])],
-        target_audiences=[
-            TargetAudiencePattern(**ta) for ta in data.get("target_audiences", [])
-        ],
-        pain_points=[PainPointPattern(**pp) for pp in data.get("pain_points", [])],
-        symptoms=[SymptomPattern(**s) for s in data.get("symptoms", [])],
-        mass_desires=[MassDesirePattern(**md) for md in data.get("mass_desires", [])],
+    # Validate all six pattern lists in one pass through pydantic-core
+    return StrategicDimensions.model_validate(
+        {key: data.get(key) or [] for key in _DIMENSION_KEYS}
     )
 
 
+async def extract_strategic_dimensions_many(
+    brand_reports: list[BrandReport], config: dict[str, Any]
+) -> list[StrategicDimensions]:
+    """Extract strategic dimensions for several brands concurrently.
+
+    At most ``[analyzer] max_concurrent`` extractions are in flight at once.
+    A brand whose extraction fails is logged and gets empty dimensions, so one
+    failed call doesn't discard the others.
+
+    Args:
+        brand_reports: Brand reports to extract from
+        config: Config dict with API settings
+
+    Returns:
+        StrategicDimensions for each report, in input order
+    """
+    semaphore = asyncio.Semaphore(config.get("analyzer", {}).get("max_concurrent", 3))
+
+    async def _extract_one(report: BrandReport) -> StrategicDimensions:
+        async with semaphore:
+            try:
+                return await extract_strategic_dimensions(report, config)
+            except Exception as e:
+                logger.error(
+                    f"Strategic dimension extraction failed for "
+                    f"{report.advertiser.page_name}: {e}"
+                )
+                return StrategicDimensions()
+
+    return await asyncio.gather(*(_extract_one(report) for report in brand_reports))
+
+
 def _parse_dimensions_response(text: str) -> dict:
     """Parse Claude's strategic dimensions response.
 
@@ -138,32 +156,11 @@ def _parse_dimensions_response(text: str) -> dict:
         Dict with 6 dimension lists
     """
     try:
-        # Look for JSON code block
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            json_text = text[start:end].strip()
-        elif "```" in text:
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            json_text = text[start:end].strip()
-        else:
-            # Assume entire response is JSON
-            json_text = text.strip()
-
-        data = json.loads(json_text)
-        return data
+        return loads_fenced(text)
 
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse dimensions response as JSON: {e}")
-        logger.debug(f"Response text: {text[:500]}...")
+        logger.debug("Response text: %.500s...", text)
 
         # Return empty structure
-        return {
-            "root_causes": [],
-            "mechanisms": [],
-            "target_audiences": [],
-            "pain_points": [],
-            "symptoms": [],
-            "mass_desires": [],
-        }
+        return {key: [] for key in _DIMENSION_KEYS}
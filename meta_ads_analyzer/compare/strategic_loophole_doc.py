@@ -10,12 +10,13 @@ Each loophole is a COMPLETE AD STRATEGY combining all 6 dimensions.
 
 from __future__ import annotations
 
+import asyncio
 import json
-from datetime import datetime
+import weakref
+from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Optional
-
-import anthropic
+from typing import Any, Callable, Optional
 
 from meta_ads_analyzer.compare.strategic_dimensions import (
     LoopholeOpportunity,
@@ -23,6 +24,19 @@ from meta_ads_analyzer.compare.strategic_dimensions import (
     StrategicMarketMap,
 )
 from meta_ads_analyzer.models import BrandReport
+from meta_ads_analyzer.utils.claude_batch import batch_message, batch_mode
+from meta_ads_analyzer.utils.claude_cache import cached_json_response
+from meta_ads_analyzer.utils.claude_client import (
+    get_claude,
+    log_usage,
+    message_text,
+    stream_message,
+)
+from meta_ads_analyzer.utils.jsonio import (
+    StreamedArrayItems,
+    loads_fenced,
+    write_model_json,
+)
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -47,28 +61,27 @@ async def generate_strategic_loophole_doc(
     """
     logger.info("Generating strategic loophole document with Claude analysis")
 
-    # Build competitive landscape table
-    competitive_landscape = _build_competitive_landscape(market_map)
-
-    # Generate loopholes using Claude
-    loopholes = await _generate_loopholes_with_claude(
-        market_map, brand_reports, focus_brand, config
+    # Build competitive landscape table (shared by every focus brand of a map)
+    competitive_landscape = _per_market_map(
+        _landscape_cache, market_map, _build_competitive_landscape
     )
 
-    # Generate market narrative
-    market_narrative = await _generate_market_narrative(
-        market_map, brand_reports, config
+    # Loopholes and market narrative are independent Claude calls; run both
+    # at once so the doc takes as long as the slower one, not their sum.
+    loopholes, market_narrative = await asyncio.gather(
+        _generate_loopholes_with_claude(market_map, brand_reports, focus_brand, config),
+        _generate_market_narrative(market_map, brand_reports, config),
     )
 
-    # Generate what NOT to do
-    what_not_to_do = _generate_what_not_to_do(market_map)
+    # Generate what NOT to do (also depends on the market map alone)
+    what_not_to_do = _per_market_map(_what_not_to_do_cache, market_map, _generate_what_not_to_do)
 
     # Build metadata
     meta = {
         "keyword": market_map.meta.get("keyword", ""),
         "focus_brand": focus_brand,
         "brands_compared": market_map.meta.get("brands_compared", 0),
-        "generated_at": datetime.utcnow().isoformat(),
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
     }
 
     return StrategicLoopholeDocument(
@@ -81,22 +94,27 @@ async def generate_strategic_loophole_doc(
     )
 
 
+# Landscape columns and the brand summary keys they are read from, in order
+_LANDSCAPE_COLUMNS = ("brand", "root_cause", "mechanism", "pain_point", "desire")
+_landscape_values = itemgetter(
+    "brand", "primary_root_cause", "primary_mechanism", "primary_pain_point", "primary_desire"
+)
+
+
 def _build_competitive_landscape(market_map: StrategicMarketMap) -> list[dict]:
     """Build competitive landscape table comparing brands across key dimensions."""
-    landscape = []
+    return [
+        dict(zip(_LANDSCAPE_COLUMNS, _landscape_values(summary)))
+        for summary in market_map.brand_summaries
+    ]
 
-    for summary in market_map.brand_summaries:
-        landscape.append(
-            {
-                "brand": summary["brand"],
-                "root_cause": summary["primary_root_cause"],
-                "mechanism": summary["primary_mechanism"],
-                "pain_point": summary["primary_pain_point"],
-                "desire": summary["primary_desire"],
-            }
-        )
 
-    return landscape
+# At most 7 loopholes of roughly 2,200 output tokens each under the schema
+_MAX_LOOPHOLES = 7
+_LOOPHOLE_MAX_TOKENS = 16384
+# Thinking budget when [analyzer] extended_thinking is on. Thinking tokens
+# count against max_tokens, so the budget is added on top of the answer's.
+_THINKING_BUDGET_TOKENS = 4000
 
 
 async def _generate_loopholes_with_claude(
@@ -107,242 +125,327 @@ async def _generate_loopholes_with_claude(
 ) -> list[LoopholeOpportunity]:
     """Use Claude to generate 5-7 validated loopholes as complete ad strategies."""
 
-    prompt = _build_loophole_generation_prompt(market_map, brand_reports, focus_brand)
+    instructions, market_data, focus_section = _build_loophole_generation_prompt(
+        market_map, brand_reports, focus_brand
+    )
+
+    model = config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514")
 
-    client = anthropic.AsyncAnthropic()
-    response = await client.messages.create(
-        model=config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514"),
-        max_tokens=16384,
+    params = dict(
+        model=model,
+        max_tokens=_LOOPHOLE_MAX_TOKENS,
         temperature=0.3,
-        messages=[{"role": "user", "content": prompt}],
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    # Ordered slowest- to fastest-changing. The schema is far
+                    # below the 1024-token minimum cacheable prefix on its own,
+                    # so the first breakpoint follows the instructions and
+                    # covers both; the second adds the market data, shared by
+                    # every focus brand of one market. Breakpoints only pay off
+                    # once their prefix reaches that minimum.
+                    {"type": "text", "text": _LOOPHOLE_OUTPUT_SCHEMA},
+                    {
+                        "type": "text",
+                        "text": instructions,
+                        "cache_control": {"type": "ephemeral"},
+                    },
+                    {
+                        "type": "text",
+                        "text": market_data,
+                        "cache_control": {"type": "ephemeral"},
+                    },
+                    {"type": "text", "text": focus_section},
+                ],
+            }
+        ],
     )
+    if config.get("analyzer", {}).get("extended_thinking", False):
+        # Extended thinking doesn't accept a temperature other than the default
+        del params["temperature"]
+        params["max_tokens"] += _THINKING_BUDGET_TOKENS
+        params["thinking"] = {"type": "enabled", "budget_tokens": _THINKING_BUDGET_TOKENS}
+
+    async def _fetch() -> dict:
+        nonlocal truncated
+        # Each loophole is parsed as soon as its object closes in the stream,
+        # so the reply is already parsed when it ends, and a reply cut off at
+        # max_tokens still keeps the loopholes it completed.
+        scanner = StreamedArrayItems()
+        streamed: list[dict] = []
+        if batch_mode(config):
+            label = f"{market_map.meta.get('keyword', '')}-{focus_brand or 'market'}-loopholes"
+            message = await batch_message(label, **params)
+        else:
+            message = await stream_message(
+                on_text=lambda chunk: streamed.extend(scanner.feed(chunk)), **params
+            )
 
-    # Parse response
-    text = response.content[0].text.strip()
-    data = _parse_loopholes_response(text)
+        if message.stop_reason == "max_tokens":
+            # Keep what completed for this run, but don't cache a short set
+            truncated = True
+            logger.warning(
+                f"Loophole reply hit max_tokens ({params['max_tokens']}); "
+                "using the loopholes it completed without caching them"
+            )
+        if streamed and not scanner.failed:
+            return {"loopholes": streamed}
+        return _parse_loopholes_response(message_text(message).strip())
+
+    # The prompt blocks are canonical, so identical market data + focus brand
+    # hash to the same entry. The other request parameters (max_tokens,
+    # temperature, thinking) are part of the key, so toggling extended thinking
+    # doesn't return the other mode's reply. Unparseable (empty) and truncated
+    # responses aren't cached.
+    request_options = _canonical_json({k: v for k, v in params.items() if k != "messages"})
+    truncated = False
+    data = await cached_json_response(
+        "\0".join(
+            (_LOOPHOLE_OUTPUT_SCHEMA, instructions, market_data, focus_section, request_options)
+        ),
+        model,
+        config,
+        _fetch,
+        should_cache=lambda d: bool(d.get("loopholes")) and not truncated,
+    )
 
     # Convert to LoopholeOpportunity models
     loopholes = []
-    for i, loop_data in enumerate(data.get("loopholes", [])[:7], 1):
+    for i, loop_data in enumerate(data.get("loopholes", [])[:_MAX_LOOPHOLES], 1):
         loop_data["loophole_id"] = f"L{i}"
         loopholes.append(LoopholeOpportunity(**loop_data))
 
     return loopholes
 
 
-def _build_loophole_generation_prompt(
+# LoopholeOpportunity output schema, sent as the first prompt block ahead of
+# the instructions.
+_LOOPHOLE_OUTPUT_SCHEMA = """<output_schema>
+{"loopholes": [{
+  "title": "str, max 30 words",
+  "the_gap": "str, 3-5 paragraphs: what ALL brands fail to explain and why it's a gap, citing dimension patterns",
+  "tam_size": "large|medium|small",
+  "tam_rationale": "str, 2-3 sentences incl. % of market with this pain",
+  "meta_competition": "none|low|medium",
+  "meta_competition_evidence": "str, 2-3 sentences citing brand counts from the data",
+  "believability_score": 0.85,
+  "root_cause": "str, exact and specific",
+  "mechanism": "str, exact and specific",
+  "target_avatar": "str, e.g. Women 45-65, health-conscious, frustrated with failed solutions",
+  "pain_point": "str, e.g. Crepey skin on arms and neck causing daily embarrassment",
+  "symptoms": ["str, e.g. Avoiding sleeveless shirts in summer"],
+  "mass_desire": "str, e.g. Smooth, firm skin that looks 10 years younger in 8 weeks",
+  "sophistication_response": "new_mechanism|new_information|new_identity",
+  "response_rationale": "str",
+  "hook_examples": ["3-5 str, e.g. After 45, this hormone drops 60%. Here's what happens to your lymphatic drainage (and your skin)"],
+  "proof_strategy": "str",
+  "objection_handling": "str, Objection: '...' → Answer: '...' pairs",
+  "priority_score": 95,
+  "effort_level": "low|medium|high",
+  "timeline": "str, e.g. 4-6 weeks (new creative, no R&D)",
+  "risk_level": "low|medium|high",
+  "defensibility": "str, why competitors can't easily copy it"
+}]}
+</output_schema>"""
+
+# Data-independent part of the loophole prompt. Kept byte-stable so it can be
+# served from Anthropic's prompt cache; market data is sent as a later block.
+_LOOPHOLE_INSTRUCTIONS = """You are an expert direct response strategist finding loophole opportunities in competitive Meta advertising.
+
+<task>
+Generate 5-7 loopholes derived ONLY from real competitive gaps in the Root Cause × Mechanism matrix in the market data below. Do not invent mechanisms competitors don't use or conspicuously lack.
+
+A loophole is an ARBITRAGE OPPORTUNITY (not "use question hooks"): high TAM + low Meta competition + believable root cause/mechanism combo. Each is a COMPLETE AD STRATEGY: root cause, mechanism, avatar (demographics + psychographics), pain point + symptoms, mass desire, sophistication response, 3-5 specific hooks, proof strategy, objection handling.
+</task>
+
+<matrix_key>SATURATED 60%+ share: avoid | MODERATE 30-59%: viable | Underexploited <30%: good | WIDE OPEN 0%: best if believable</matrix_key>
+
+<rules>
+1. Matrix first: "none stated" SATURATED → be first to clearly explain root cause + mechanism; several MODERATE combos → underexploited variations or more depth; 0% combo → only if genuinely believable.
+2. Then depth/specificity gaps: surface vs cellular/molecular root causes; "supports X" vs specific pathways; identity/tribe variants of an audience; uncovered pain intensities/contexts; unreferenced daily symptoms; missing timeframes/measurable outcomes.
+3. TAM: large = 30%+ of target market, medium = 10-30%, small = <10%.
+4. Meta competition: none = 0 brands; low = 1-2 brands lightly; medium = 3+ brands or 1-2 heavily.
+5. Believability 0-1: obvious root cause +0.3, mechanism directly fixes root cause +0.3, strong proof +0.2, no unfalsifiable claims +0.2.
+6. Sophistication: Stage 3-4 → new_mechanism / new_information; Stage 5 → new_identity (tribal, anti-establishment, cultural).
+7. priority_score (0-100) = TAM (large 40, medium 25, small 10) + competition (none 40, low 25, medium 10) + believability × 20.
+8. Effort: low = launch within 2 weeks (content only); medium = 4-8 weeks (new creative, maybe ingredient story); high = 8+ weeks (R&D, clinical studies, reformulation).
+9. Risk: low = provable, mainstream; medium = needs education, some skepticism; high = contrarian, high skepticism.
+</rules>
+
+<critical>
+Derive every loophole from matrix gaps and cite exact percentages/patterns from the data. Never invent mechanisms (fascia, glymphatic, estrogen, inflammation, circadian...) absent from competitor data. No generic advice: execution-ready this week, with real hook copy. Scores must follow the formula. Match loopholes to market stage. If a focus brand is given, tailor loopholes to its gaps. Output must match <output_schema> above.
+</critical>"""
+
+
+def _round_floats(obj: Any) -> Any:
+    """Round floats (recursively) so tiny numeric drift doesn't change the prompt."""
+    if isinstance(obj, float):
+        return round(obj, 4)
+    if isinstance(obj, dict):
+        return {k: _round_floats(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_round_floats(v) for v in obj]
+    return obj
+
+
+def _canonical_json(obj: Any) -> str:
+    """Serialize prompt data byte-identically for identical inputs.
+
+    Sorted keys, compact separators and rounded floats keep the market data
+    block stable across runs so it stays eligible for prompt cache hits.
+    """
+    return json.dumps(
+        _round_floats(obj), sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+
+
+# Values derived from a StrategicMarketMap alone, keyed by id(). Entries are
+# dropped by weakref.finalize when the map is collected, so a recycled id can
+# never return a stale value. Maps are treated as immutable once built.
+_market_data_cache: dict[int, str] = {}
+_landscape_cache: dict[int, list[dict]] = {}
+_what_not_to_do_cache: dict[int, list[str]] = {}
+
+
+def _per_market_map(
+    cache: dict[int, Any],
     market_map: StrategicMarketMap,
-    brand_reports: list[BrandReport],
-    focus_brand: Optional[str],
-) -> str:
-    """Build prompt for Claude to generate execution-ready loopholes."""
+    build: Callable[[StrategicMarketMap], Any],
+) -> Any:
+    """Return build(market_map), computed once per market map.
 
-    # Extract dimension comparisons
-    root_causes = market_map.root_cause_comparison.model_dump()
-    mechanisms = market_map.mechanism_comparison.model_dump()
-    audiences = market_map.audience_comparison.model_dump()
-    pain_points = market_map.pain_point_comparison.model_dump()
-    symptoms = market_map.symptom_comparison.model_dump()
-    desires = market_map.desire_comparison.model_dump()
+    Every focus brand in a run shares the same market map, so anything built
+    from the map alone only needs building the first time. Callers must not
+    mutate the result; StrategicLoopholeDocument validation copies it.
+    """
+    key = id(market_map)
+    if key not in cache:
+        cache[key] = build(market_map)
+        weakref.finalize(market_map, cache.pop, key, None)
+    return cache[key]
+
+
+def _market_data_block(market_map: StrategicMarketMap) -> str:
+    """Return the market data prompt block, rendered once per market map."""
+    return _per_market_map(_market_data_cache, market_map, _render_market_data)
+
+
+# (prompt key, StrategicMarketMap field) for each dimension comparison
+_DIMENSION_SECTIONS = (
+    ("root_causes", "root_cause_comparison"),
+    ("mechanisms", "mechanism_comparison"),
+    ("target_audiences", "audience_comparison"),
+    ("pain_points", "pain_point_comparison"),
+    ("symptoms", "symptom_comparison"),
+    ("mass_desires", "desire_comparison"),
+)
 
-    sophistication = market_map.sophistication_level.model_dump()
+_MARKET_DATA_FIELDS = {field for _, field in _DIMENSION_SECTIONS} | {"sophistication_level"}
 
-    prompt = f"""You are an expert direct response strategist analyzing competitive advertising for loophole opportunities.
 
-## Market Context
+# Matrix row fields sent to Claude. brands_using repeats brand names on every
+# row; num_brands carries the count the instructions actually cite.
+_PROMPT_MATRIX_FIELDS = (
+    "root_cause",
+    "mechanism",
+    "root_cause_cluster",
+    "num_brands",
+    "total_ads",
+    "market_share",
+    "gap",
+)
 
-**Keyword**: {market_map.meta['keyword']}
-**Brands Compared**: {market_map.meta['brands_compared']}
-**Focus Brand**: {focus_brand or 'None (market-wide analysis)'}
-**Market Sophistication**: {sophistication['stage_name']}
-**Strategic Response**: {sophistication['strategic_response']}
 
-## 6-Dimension Market Analysis
+def _compact_comparison(comparison: dict) -> dict:
+    """Reduce a dumped DimensionComparison to what the loophole prompt uses.
+
+    The section heading already names the dimension, and absent patterns are
+    dropped rather than sent as empty objects.
+    """
+    return {
+        "patterns": [
+            pattern
+            for pattern in (
+                comparison["pattern_1"], comparison["pattern_2"], comparison["pattern_3"]
+            )
+            if pattern
+        ],
+        "how_patterns_differ": comparison["how_patterns_differ"],
+        "loopholes": comparison["loopholes"],
+    }
 
-### ROOT CAUSES
-{json.dumps(root_causes, indent=2)}
 
-### MECHANISMS
-{json.dumps(mechanisms, indent=2)}
+def _render_market_data(market_map: StrategicMarketMap) -> str:
+    """Render the per-market analysis block of the loophole prompt."""
 
-### TARGET AUDIENCES
-{json.dumps(audiences, indent=2)}
+    # Extract dimension comparisons in a single pydantic-core dump and encode
+    # all six as one JSON object
+    dumped = market_map.model_dump(include=_MARKET_DATA_FIELDS)
+    dimensions = _canonical_json(
+        {key: _compact_comparison(dumped[field]) for key, field in _DIMENSION_SECTIONS}
+    )
+    matrix = [
+        {key: row[key] for key in _PROMPT_MATRIX_FIELDS if key in row}
+        for row in market_map.root_cause_mechanism_matrix
+    ]
 
-### PAIN POINTS
-{json.dumps(pain_points, indent=2)}
+    sophistication = dumped["sophistication_level"]
+
+    return f"""## Market Context
+
+**Keyword**: {market_map.meta['keyword']}
+**Brands Compared**: {market_map.meta['brands_compared']}
+**Market Sophistication**: {sophistication['stage_name']}
+**Strategic Response**: {sophistication['strategic_response']}
 
-### SYMPTOMS
-{json.dumps(symptoms, indent=2)}
+## 6-Dimension Market Analysis
 
-### MASS DESIRES
-{json.dumps(desires, indent=2)}
+{dimensions}
 
 ## ROOT CAUSE × MECHANISM MATRIX (CRITICAL - USE THIS!)
 
 This matrix shows which root cause + mechanism combinations are actually used by brands:
 
-{json.dumps(market_map.root_cause_mechanism_matrix, indent=2)}
-
-**Matrix Key**:
-- **SATURATED** (60%+ market share): Avoid - too crowded
-- **MODERATE** (30-59% market share): Competitive but viable
-- **Underexploited** (<30% market share): Good opportunity
-- **WIDE OPEN** (0% market share): Best opportunity if believable
-
-## Your Task: Generate 5-7 Validated Loopholes FROM THE MATRIX
-
-**CRITICAL RULE**: Loopholes MUST be derived from actual competitive gaps in the matrix above. DO NOT invent new mechanisms that aren't based on what competitors are (or aren't) doing.
-
-A loophole is NOT "use question hooks" but an ARBITRAGE OPPORTUNITY where:
-- **High TAM** (large addressable audience)
-- **Low Meta Competition** (few/no brands running this angle per matrix)
-- **Believable Mechanism** (credible root cause + mechanism combo)
-
-Each loophole must be a COMPLETE AD STRATEGY combining:
-- Specific root cause to lead with (from or missing from matrix)
-- Specific mechanism to position (from or missing from matrix)
-- Specific avatar (demographics + psychographics)
-- Pain point and symptoms to reference
-- Mass desire/transformation promise
-- Market sophistication response (new_mechanism / new_information / new_identity)
-- 3-5 specific hook examples (NOT generic templates)
-- Proof strategy
-- Objection handling
-
-## Loophole Identification Rules (USE MATRIX DATA ONLY!)
-
-1. **PRIMARY: Analyze the Root Cause × Mechanism matrix**:
-   - If matrix shows "none stated" is SATURATED: Opportunity is "be the first to clearly explain root cause + mechanism"
-   - If matrix shows multiple combos at MODERATE: Find underexploited variations or go deeper on depth
-   - If matrix shows specific combo at 0%: Assess if it's believable (not just theoretically possible)
-   - DO NOT invent new mechanisms - identify what's MISSING from actual competitive landscape
-
-2. **SECONDARY: Look for depth/specificity gaps**:
-   - Root causes: Do brands explain at surface level when molecular/cellular depth is missing?
-   - Mechanisms: Do brands claim "supports X" when specific pathways aren't explained?
-   - Audiences: Are there identity/tribe variations within the same pain point?
-   - Pain points: Are there intensity levels or contexts not covered?
-   - Symptoms: Are there specific daily experiences not referenced?
-   - Desires: Are there specific timeframes/measurable outcomes missing?
-
-2. **Assess TAM size**:
-   - Large: Broad pain point affecting 30%+ of target market
-   - Medium: Specific pain point affecting 10-30%
-   - Small: Niche pain point affecting <10%
-
-3. **Assess Meta Competition**:
-   - None: 0 brands running this angle
-   - Low: 1-2 brands running lightly (not their primary angle)
-   - Medium: 3+ brands or 1-2 running heavily
-
-4. **Assess Believability** (0-1 score):
-   - Root cause feels obvious? +0.3
-   - Mechanism connects directly to root cause? +0.3
-   - Proof strategy is strong? +0.2
-   - Avoids unfalsifiable claims? +0.2
-
-5. **Apply Market Sophistication Framework**:
-   - If Stage 3-4: Prioritize new_mechanism and new_information loopholes
-   - If Stage 5: Prioritize new_identity loopholes (tribal, anti-establishment, cultural)
-
-6. **Score each loophole** (0-100):
-   - TAM size: large=40pts, medium=25pts, small=10pts
-   - Competition: none=40pts, low=25pts, medium=10pts
-   - Believability: score * 20pts
-
-7. **Effort & Timeline**:
-   - Low effort: Can launch within 2 weeks (content only)
-   - Medium effort: 4-8 weeks (requires new creative, maybe ingredient story)
-   - High effort: 8+ weeks (requires R&D, clinical studies, or product reformulation)
-
-8. **Risk Level**:
-   - Low: Claims are provable, mainstream acceptance
-   - Medium: Claims require education, moderate skepticism
-   - High: Contrarian claims, high customer skepticism
-
-## Output Format
-
-Return valid JSON with this structure:
-
-```json
-{{
-  "loopholes": [
-    {{
-      "title": "The Hormonal Trigger Nobody Explains (30-word max)",
-      "the_gap": "3-5 paragraph explanation: What's missing from the market? Why is this a gap? What do ALL brands fail to explain? Be specific - reference the actual patterns from dimension analysis.",
-      "tam_size": "large",
-      "tam_rationale": "2-3 sentences: Why is the addressable audience large? What % of the target market has this pain point?",
-      "meta_competition": "none",
-      "meta_competition_evidence": "2-3 sentences: Proof that few/no brands run this angle. Reference dimension analysis data showing 0 or 1-2 brands.",
-      "believability_score": 0.85,
-      "root_cause": "Specific root cause to lead with (exact text, not generic)",
-      "mechanism": "Specific mechanism to position (exact explanation, not generic)",
-      "target_avatar": "Specific avatar: Women 45-65, health-conscious, frustrated with failed solutions, refuse to accept aging as inevitable",
-      "pain_point": "Crepey skin on arms and neck causing daily embarrassment",
-      "symptoms": ["Avoiding sleeveless shirts in summer", "Feeling self-conscious in photos", "Hiding arms with cardigans year-round"],
-      "mass_desire": "Smooth, firm skin that looks 10 years younger in 8 weeks",
-      "sophistication_response": "new_mechanism",
-      "response_rationale": "At Stage 3-4, new mechanism explanation breaks through skepticism by showing HOW this works differently.",
-      "hook_examples": [
-        "The upstream hormonal trigger that CAUSES lymphatic congestion (and why no cream can fix it without this)",
-        "Why your lymphatic system didn't just fail—here's the hidden hormone that shut it down first",
-        "After 45, this hormone drops 60%. Here's what happens to your lymphatic drainage (and your skin)"
-      ],
-      "proof_strategy": "Clinical study showing hormone levels correlate with lymphatic function. Before/after skin elasticity measurements. Ingredient mechanism of action data.",
-      "objection_handling": "Objection: 'Is this just another hormone cream?' → Answer: 'No. This targets the UPSTREAM trigger before hormones drop, preventing the cascade.' Objection: 'How long until I see results?' → Answer: 'Lymphatic drainage improves within 2 weeks. Visible skin improvement by week 4-6.'",
-      "priority_score": 95,
-      "effort_level": "medium",
-      "timeline": "4-6 weeks (new creative + ingredient story, no R&D needed)",
-      "risk_level": "low",
-      "defensibility": "Once you establish the upstream hormonal trigger narrative, competitors look surface-level. Requires clinical research to match depth."
-    }}
-  ]
-}}
-```
-
-## CRITICAL RULES
-
-1. **USE THE MATRIX** - ALL loopholes must be derived from Root Cause × Mechanism matrix gaps. If matrix shows "none stated" is SATURATED, the loophole is "be first to explain clearly" NOT "try fascia/glymphatic/estrogen" unless those appear in competitor data
-2. **Reference actual dimension data** - cite specific patterns, frequencies, gaps from the analysis with exact percentages from matrix
-3. **NO inventing mechanisms** - if competitors don't mention fascia/glymphatic/estrogen/inflammation/circadian, don't create loopholes around them. Use what IS or ISN'T in the data
-4. **NO generic advice** - every loophole must be execution-ready THIS WEEK based on real competitive gaps
-5. **Specific hook language** - write actual hooks, not "use emotional triggers"
-6. **Score rigorously** - TAM + Competition + Believability formula must match output
-7. **Apply sophistication framework** - match loopholes to market stage
-8. **Prioritize focus brand** - if focus brand specified, tailor loopholes to their gaps
+{_canonical_json(matrix)}"""
+
+
+# Fixed request that follows the focus brand line in the last prompt block
+_FOCUS_SECTION_TAIL = """
 
 Generate 5-7 loopholes, ranked by priority_score descending.
 
 Return ONLY valid JSON, no markdown formatting."""
 
-    return prompt
 
+def _build_loophole_generation_prompt(
+    market_map: StrategicMarketMap,
+    brand_reports: list[BrandReport],
+    focus_brand: Optional[str],
+) -> tuple[str, str, str]:
+    """Build prompt for Claude to generate execution-ready loopholes.
 
-async def _generate_market_narrative(
-    market_map: StrategicMarketMap, brand_reports: list[BrandReport], config: dict
-) -> str:
-    """Generate 3-5 paragraph market narrative using Claude."""
-
-    prompt = f"""You are an expert direct response strategist writing a market overview.
-
-## Market Context
+    Returns:
+        (instructions, market_data, focus_section) — the static task
+        description, the per-market analysis (identical for every focus brand)
+        and the focus brand request, sent as separate content blocks.
+    """
 
-**Keyword**: {market_map.meta['keyword']}
-**Brands Compared**: {market_map.meta['brands_compared']}
-**Market Sophistication**: {market_map.sophistication_level.stage_name}
+    market_data = _market_data_block(market_map)
+    focus_section = (
+        f"**Focus Brand**: {focus_brand or 'None (market-wide analysis)'}{_FOCUS_SECTION_TAIL}"
+    )
+    return _LOOPHOLE_INSTRUCTIONS, market_data, focus_section
 
-## Dimension Analysis Summary
 
-- **Root Causes**: {market_map.root_cause_comparison.how_patterns_differ}
-- **Mechanisms**: {market_map.mechanism_comparison.how_patterns_differ}
-- **Audiences**: {market_map.audience_comparison.how_patterns_differ}
-- **Pain Points**: {market_map.pain_point_comparison.how_patterns_differ}
-- **Symptoms**: {market_map.symptom_comparison.how_patterns_differ}
-- **Desires**: {market_map.desire_comparison.how_patterns_differ}
+# Data-independent part of the narrative prompt; the market context follows as
+# its own block. The whole prompt is well under the 1024-token minimum
+# cacheable prefix, so it carries no cache_control breakpoint.
+_NARRATIVE_INSTRUCTIONS = """You are an expert direct response strategist writing a market overview.
 
 ## Your Task
 
-Write a 3-5 paragraph market narrative that answers:
+Using the market context below, write a 3-5 paragraph market narrative that answers:
 
 1. **What's the competitive landscape?** How deep do brands go in their root cause explanations? What's the universal mechanism positioning? What proof architecture vulnerabilities exist across all brands?
 
@@ -356,13 +459,48 @@ Write for someone who needs to EXPLOIT competitive weaknesses, not just understa
 
 Return the narrative as plain text (no JSON, no markdown formatting)."""
 
-    client = anthropic.AsyncAnthropic()
-    response = await client.messages.create(
-        model=config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514"),
+
+async def _generate_market_narrative(
+    market_map: StrategicMarketMap, brand_reports: list[BrandReport], config: dict
+) -> str:
+    """Generate 3-5 paragraph market narrative using Claude."""
+
+    market_context = f"""## Market Context
+
+**Keyword**: {market_map.meta['keyword']}
+**Brands Compared**: {market_map.meta['brands_compared']}
+**Market Sophistication**: {market_map.sophistication_level.stage_name}
+
+## Dimension Analysis Summary
+
+- **Root Causes**: {market_map.root_cause_comparison.how_patterns_differ}
+- **Mechanisms**: {market_map.mechanism_comparison.how_patterns_differ}
+- **Audiences**: {market_map.audience_comparison.how_patterns_differ}
+- **Pain Points**: {market_map.pain_point_comparison.how_patterns_differ}
+- **Symptoms**: {market_map.symptom_comparison.how_patterns_differ}
+- **Desires**: {market_map.desire_comparison.how_patterns_differ}"""
+
+    model = config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514")
+    params = dict(
+        model=model,
         max_tokens=2048,
         temperature=0.3,
-        messages=[{"role": "user", "content": prompt}],
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": _NARRATIVE_INSTRUCTIONS},
+                    {"type": "text", "text": market_context},
+                ],
+            }
+        ],
     )
+    if batch_mode(config):
+        label = f"{market_map.meta.get('keyword', '')}-narrative"
+        return message_text(await batch_message(label, **params)).strip()
+
+    response = await get_claude().messages.create(**params)
+    log_usage(response.usage, model)
 
     return response.content[0].text.strip()
 
@@ -372,32 +510,34 @@ def _generate_what_not_to_do(market_map: StrategicMarketMap) -> list[str]:
     what_not_to_do = []
 
     # Warning 1: Saturated root cause + mechanism combos from matrix
-    saturated_combos = [
-        row for row in market_map.root_cause_mechanism_matrix
-        if row.get("gap") == "SATURATED" or row.get("market_share", 0) >= 50
-    ]
-    if saturated_combos:
-        top_saturated = saturated_combos[0]
+    top_saturated = next(
+        (
+            row for row in market_map.root_cause_mechanism_matrix
+            if row.get("gap") == "SATURATED" or row.get("market_share", 0) >= 50
+        ),
+        None,
+    )
+    if top_saturated:
         what_not_to_do.append(
             f"DON'T use the saturated root cause + mechanism combo that {top_saturated['num_brands']}/{market_map.meta['brands_compared']} brands already use: '{top_saturated['root_cause'][:50]}...' → '{top_saturated['mechanism'][:50]}...'"
         )
 
-    # Warning 2: Avoid dominant root cause pattern
-    if market_map.root_cause_comparison.pattern_1:
-        pattern1 = market_map.root_cause_comparison.pattern_1
-        brands_count = len(pattern1.get("brands_using", []))
-        if brands_count >= 2:
-            what_not_to_do.append(
-                f"DON'T explain the same root cause as {brands_count} competitors - '{pattern1.get('text', '')[:60]}...' is already crowded positioning"
-            )
-
-    # Warning 3: Avoid dominant mechanism pattern
-    if market_map.mechanism_comparison.pattern_1:
-        pattern1 = market_map.mechanism_comparison.pattern_1
-        brands_count = len(pattern1.get("brands_using", []))
+    # Warnings 2-3: Avoid the dominant root cause and mechanism patterns
+    dominant_warnings = (
+        (
+            market_map.root_cause_comparison.pattern_1,
+            "DON'T explain the same root cause as {count} competitors - '{text}...' is already crowded positioning",
+        ),
+        (
+            market_map.mechanism_comparison.pattern_1,
+            "DON'T claim the same mechanism as {count} competitors - '{text}...' won't differentiate",
+        ),
+    )
+    for pattern1, warning in dominant_warnings:
+        brands_count = len(pattern1.get("brands_using") or ())
         if brands_count >= 2:
             what_not_to_do.append(
-                f"DON'T claim the same mechanism as {brands_count} competitors - '{pattern1.get('text', '')[:60]}...' won't differentiate"
+                warning.format(count=brands_count, text=(pattern1.get("text") or "")[:60])
             )
 
     # Warning 4: Sophistication-appropriate response
@@ -426,43 +566,27 @@ def _generate_what_not_to_do(market_map: StrategicMarketMap) -> list[str]:
     )
 
     # Warning 7: Matrix-based strategic warning
-    underexploited = [
-        row for row in market_map.root_cause_mechanism_matrix
+    underexploited = sum(
+        1 for row in market_map.root_cause_mechanism_matrix
         if row.get("gap") == "Underexploited" and row.get("market_share", 0) < 30
-    ]
-    if len(underexploited) >= 3:
+    )
+    if underexploited >= 3:
         what_not_to_do.append(
-            f"DON'T invent entirely new mechanisms without proof - {len(underexploited)} underexploited positioning angles already exist that need better execution, not replacement"
+            f"DON'T invent entirely new mechanisms without proof - {underexploited} underexploited positioning angles already exist that need better execution, not replacement"
         )
 
     # Ensure we have 5-6 items (trim if too many)
     return what_not_to_do[:6]
 
-    return what_not_to_do
-
 
 def _parse_loopholes_response(text: str) -> dict:
     """Parse Claude's loopholes generation response."""
     try:
-        # Look for JSON code block
-        if "```json" in text:
-            start = text.find("```json") + 7
-            end = text.find("```", start)
-            json_text = text[start:end].strip()
-        elif "```" in text:
-            start = text.find("```") + 3
-            end = text.find("```", start)
-            json_text = text[start:end].strip()
-        else:
-            # Assume entire response is JSON
-            json_text = text.strip()
-
-        data = json.loads(json_text)
-        return data
+        return loads_fenced(text)
 
     except json.JSONDecodeError as e:
         logger.error(f"Failed to parse loopholes response as JSON: {e}")
-        logger.debug(f"Response text: {text[:500]}...")
+        logger.debug("Response text: %.500s...", text)
 
         # Return empty structure
         return {"loopholes": []}
@@ -483,13 +607,30 @@ def save_strategic_loophole_doc(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     json_path = output_dir / "strategic_loophole_doc.json"
-    with open(json_path, "w") as f:
-        json.dump(doc.model_dump(mode="json"), f, indent=2, default=str)
+    write_model_json(json_path, doc)
 
     logger.info(f"Strategic loophole document saved: {json_path}")
     return json_path
 
 
+async def asave_strategic_loophole_doc(
+    doc: StrategicLoopholeDocument, output_dir: Path
+) -> Path:
+    """Save strategic loophole document from a worker thread.
+
+    Same as save_strategic_loophole_doc, but serialization and the disk write
+    don't block the event loop.
+
+    Args:
+        doc: StrategicLoopholeDocument to save
+        output_dir: Output directory
+
+    Returns:
+        Path to saved file
+    """
+    return await asyncio.to_thread(save_strategic_loophole_doc, doc, output_dir)
+
+
 def format_strategic_loophole_doc_text(doc: StrategicLoopholeDocument) -> str:
     """Format strategic loophole document for console display.
 
@@ -500,9 +641,9 @@ def format_strategic_loophole_doc_text(doc: StrategicLoopholeDocument) -> str:
         Formatted text string
     """
     from rich.table import Table
-    from rich.console import Console
 
-    console = Console()
+    from meta_ads_analyzer.utils.rich_markup import render_markup
+
     lines = []
 
     lines.append(
@@ -547,7 +688,7 @@ def format_strategic_loophole_doc_text(doc: StrategicLoopholeDocument) -> str:
                 loop.effort_level,
             )
 
-        console.print(table)
+        lines.append(render_markup(table))
         lines.append("")
 
     # What NOT to do
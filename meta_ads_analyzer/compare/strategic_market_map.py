@@ -13,26 +13,27 @@ For each dimension, identifies top 3 patterns with frequency, brands, and exampl
 
 from __future__ import annotations
 
-import json
+import functools
+import itertools
+import re
+from bisect import bisect_right
 from collections import Counter, defaultdict
-from datetime import datetime
+from datetime import datetime, timezone
+from operator import attrgetter, itemgetter
 from pathlib import Path
-from typing import Any, Optional
-
-from rich.console import Console
-from rich.table import Table
+from typing import Any, Callable, Optional
 
 from meta_ads_analyzer.compare.strategic_dimensions import (
     DimensionComparison,
     MarketSophisticationLevel,
     StrategicMarketMap,
 )
-from meta_ads_analyzer.compare.strategic_extractor import extract_strategic_dimensions
+from meta_ads_analyzer.compare.strategic_extractor import extract_strategic_dimensions_many
 from meta_ads_analyzer.models import BrandReport
+from meta_ads_analyzer.utils.jsonio import write_model_json
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
-console = Console()
 
 
 async def generate_strategic_market_map(
@@ -55,24 +56,24 @@ async def generate_strategic_market_map(
     logger.info(
         f"Generating strategic market map for {len(brand_reports)} brands")
 
-    # Extract strategic dimensions for each brand
-    brand_dimensions = {}
-    for report in brand_reports:
-        dims = await extract_strategic_dimensions(report, config)
-        brand_dimensions[report.advertiser.page_name] = dims
+    # Extract strategic dimensions for each brand (one Claude call each, run
+    # concurrently)
+    all_dims = await extract_strategic_dimensions_many(brand_reports, config)
+    brand_dimensions = {
+        report.advertiser.page_name: dims
+        for report, dims in zip(brand_reports, all_dims)
+    }
 
     # Assess market sophistication
     sophistication = await _assess_market_sophistication(
         brand_dimensions, brand_reports, config
     )
 
-    # Build 6 dimension comparisons
-    root_cause_comp = _compare_root_causes(brand_dimensions, focus_brand)
-    mechanism_comp = _compare_mechanisms(brand_dimensions, focus_brand)
-    audience_comp = _compare_audiences(brand_dimensions, focus_brand)
-    pain_point_comp = _compare_pain_points(brand_dimensions, focus_brand)
-    symptom_comp = _compare_symptoms(brand_dimensions, focus_brand)
-    desire_comp = _compare_desires(brand_dimensions, focus_brand)
+    # Build 6 dimension comparisons from one grouping pass over the brands
+    comparisons = {
+        dimension: _compare_dimension(dimension, ranked_patterns, brand_dimensions, focus_brand)
+        for dimension, ranked_patterns in _rank_all_dimensions(brand_dimensions).items()
+    }
 
     # Build brand summaries
     brand_summaries = _build_brand_summaries(brand_reports, brand_dimensions)
@@ -82,404 +83,192 @@ async def generate_strategic_market_map(
 
     # Update meta
     meta["brands_compared"] = len(brand_reports)
-    meta["generated_at"] = datetime.utcnow().isoformat()
+    meta["generated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
     meta["focus_brand"] = focus_brand
 
     return StrategicMarketMap(
         meta=meta,
         sophistication_level=sophistication,
-        root_cause_comparison=root_cause_comp,
-        mechanism_comparison=mechanism_comp,
-        audience_comparison=audience_comp,
-        pain_point_comparison=pain_point_comp,
-        symptom_comparison=symptom_comp,
-        desire_comparison=desire_comp,
+        root_cause_comparison=comparisons["root_causes"],
+        mechanism_comparison=comparisons["mechanisms"],
+        audience_comparison=comparisons["target_audiences"],
+        pain_point_comparison=comparisons["pain_points"],
+        symptom_comparison=comparisons["symptoms"],
+        desire_comparison=comparisons["mass_desires"],
         brand_summaries=brand_summaries,
         root_cause_mechanism_matrix=rc_mech_matrix,
     )
 
 
-def _compare_root_causes(
-    brand_dimensions: dict, focus_brand: Optional[str]
-) -> DimensionComparison:
-    """Compare root cause patterns across brands."""
-    # Aggregate all root causes across brands
-    all_causes = []
-    for brand_name, dims in brand_dimensions.items():
-        for rc in dims.root_causes:
-            all_causes.append(
-                {
-                    "text": rc.text,
-                    "depth_level": rc.depth_level,
-                    "upstream_gap": rc.upstream_gap,
-                    "frequency": rc.frequency,
-                    "brand": brand_name,
-                    "example": rc.example_ad_copy,
-                    "psychological_principle": rc.psychological_principle,
-                }
-            )
-
-    # Group by similar text and count
-    pattern_groups = defaultdict(list)
-    for cause in all_causes:
-        # Simple grouping by first 50 chars (could be improved with embedding similarity)
-        key = cause["text"][:50].lower()
-        pattern_groups[key].append(cause)
-
-    # Rank by total frequency
-    ranked_patterns = []
-    for group in pattern_groups.values():
-        total_freq = sum(c["frequency"] for c in group)
-        brands_using = list(set(c["brand"] for c in group))
-        representative = group[0]  # Use first as representative
-
-        ranked_patterns.append(
-            {
-                "text": representative["text"],
-                "depth_level": representative["depth_level"],
-                "upstream_gap": representative["upstream_gap"],
-                "frequency": total_freq,
-                "brands_using": brands_using,
-                "example": representative["example"],
-                "psychological_principle": representative["psychological_principle"],
-            }
-        )
-
-    # Sort by frequency descending
-    ranked_patterns.sort(key=lambda p: p["frequency"], reverse=True)
-
-    # Extract top 3
-    pattern_1 = ranked_patterns[0] if len(ranked_patterns) > 0 else {}
-    pattern_2 = ranked_patterns[1] if len(ranked_patterns) > 1 else {}
-    pattern_3 = ranked_patterns[2] if len(ranked_patterns) > 2 else {}
-
-    # Analyze differences
-    differences = _analyze_root_cause_differences(ranked_patterns)
-
-    # Identify loopholes
-    loopholes = _identify_root_cause_loopholes(
-        ranked_patterns, brand_dimensions, focus_brand
-    )
-
-    return DimensionComparison(
-        dimension_type="root_causes",
-        pattern_1=pattern_1,
-        pattern_2=pattern_2,
-        pattern_3=pattern_3,
-        how_patterns_differ=differences,
-        loopholes=loopholes,
-    )
-
-
-def _compare_mechanisms(
-    brand_dimensions: dict, focus_brand: Optional[str]
-) -> DimensionComparison:
-    """Compare mechanism patterns across brands."""
-    all_mechanisms = []
-    for brand_name, dims in brand_dimensions.items():
-        for mech in dims.mechanisms:
-            all_mechanisms.append(
-                {
-                    "text": mech.text,
-                    "mechanism_type": mech.mechanism_type,
-                    "depth": mech.depth,
-                    "frequency": mech.frequency,
-                    "brand": brand_name,
-                    "example": mech.example_ad_copy,
-                    "believability_score": mech.believability_score,
-                    "connects_to_root_cause": mech.connects_to_root_cause,
-                }
-            )
-
-    # Group and rank
-    pattern_groups = defaultdict(list)
-    for mech in all_mechanisms:
-        key = mech["text"][:50].lower()
-        pattern_groups[key].append(mech)
-
-    ranked_patterns = []
-    for group in pattern_groups.values():
-        total_freq = sum(m["frequency"] for m in group)
-        brands_using = list(set(m["brand"] for m in group))
-        representative = group[0]
-
-        ranked_patterns.append(
-            {
-                "text": representative["text"],
-                "mechanism_type": representative["mechanism_type"],
-                "depth": representative["depth"],
-                "frequency": total_freq,
-                "brands_using": brands_using,
-                "example": representative["example"],
-                "believability_score": representative["believability_score"],
-                "connects_to_root_cause": representative["connects_to_root_cause"],
-            }
-        )
-
-    ranked_patterns.sort(key=lambda p: p["frequency"], reverse=True)
-
-    pattern_1 = ranked_patterns[0] if ranked_patterns else {}
-    pattern_2 = ranked_patterns[1] if len(ranked_patterns) > 1 else {}
-    pattern_3 = ranked_patterns[2] if len(ranked_patterns) > 2 else {}
-
-    differences = _analyze_mechanism_differences(ranked_patterns)
-    loopholes = _identify_mechanism_loopholes(
-        ranked_patterns, brand_dimensions, focus_brand
-    )
-
-    return DimensionComparison(
-        dimension_type="mechanisms",
-        pattern_1=pattern_1,
-        pattern_2=pattern_2,
-        pattern_3=pattern_3,
-        how_patterns_differ=differences,
-        loopholes=loopholes,
-    )
-
-
-def _compare_audiences(
-    brand_dimensions: dict, focus_brand: Optional[str]
-) -> DimensionComparison:
-    """Compare target audience patterns across brands."""
-    all_audiences = []
-    for brand_name, dims in brand_dimensions.items():
-        for aud in dims.target_audiences:
-            all_audiences.append(
-                {
-                    "demographics": aud.demographics,
-                    "psychographics": aud.psychographics,
-                    "identity": aud.identity,
-                    "frequency": aud.frequency,
-                    "brand": brand_name,
-                    "example": aud.example_ad_copy,
-                }
-            )
-
-    # Group by identity (most distinctive element)
-    pattern_groups = defaultdict(list)
-    for aud in all_audiences:
-        key = aud["identity"][:30].lower() if aud["identity"] else "generic"
-        pattern_groups[key].append(aud)
-
-    ranked_patterns = []
-    for group in pattern_groups.values():
-        total_freq = sum(a["frequency"] for a in group)
-        brands_using = list(set(a["brand"] for a in group))
-        representative = group[0]
-
-        ranked_patterns.append(
-            {
-                "demographics": representative["demographics"],
-                "psychographics": representative["psychographics"],
-                "identity": representative["identity"],
-                "frequency": total_freq,
-                "brands_using": brands_using,
-                "example": representative["example"],
-            }
-        )
-
-    ranked_patterns.sort(key=lambda p: p["frequency"], reverse=True)
-
-    pattern_1 = ranked_patterns[0] if ranked_patterns else {}
-    pattern_2 = ranked_patterns[1] if len(ranked_patterns) > 1 else {}
-    pattern_3 = ranked_patterns[2] if len(ranked_patterns) > 2 else {}
-
-    differences = _analyze_audience_differences(ranked_patterns)
-    loopholes = _identify_audience_loopholes(
-        ranked_patterns, brand_dimensions, focus_brand
-    )
-
-    return DimensionComparison(
-        dimension_type="target_audiences",
-        pattern_1=pattern_1,
-        pattern_2=pattern_2,
-        pattern_3=pattern_3,
-        how_patterns_differ=differences,
-        loopholes=loopholes,
-    )
-
+# Output fields for each dimension's ranked patterns, in report order.
+# (output_key, source attribute); None marks the aggregated frequency/brands.
+_ROOT_CAUSE_FIELDS = (
+    ("text", "text"),
+    ("depth_level", "depth_level"),
+    ("upstream_gap", "upstream_gap"),
+    ("frequency", None),
+    ("brands_using", None),
+    ("example", "example_ad_copy"),
+    ("psychological_principle", "psychological_principle"),
+)
+_MECHANISM_FIELDS = (
+    ("text", "text"),
+    ("mechanism_type", "mechanism_type"),
+    ("depth", "depth"),
+    ("frequency", None),
+    ("brands_using", None),
+    ("example", "example_ad_copy"),
+    ("believability_score", "believability_score"),
+    ("connects_to_root_cause", "connects_to_root_cause"),
+)
+_AUDIENCE_FIELDS = (
+    ("demographics", "demographics"),
+    ("psychographics", "psychographics"),
+    ("identity", "identity"),
+    ("frequency", None),
+    ("brands_using", None),
+    ("example", "example_ad_copy"),
+)
+_PAIN_POINT_FIELDS = (
+    ("pain_point", "pain_point"),
+    ("intensity", "intensity"),
+    ("frequency", None),
+    ("brands_using", None),
+    ("example", "example_ad_copy"),
+    ("emotional_trigger", "emotional_trigger"),
+)
+_SYMPTOM_FIELDS = (
+    ("symptom", "symptom"),
+    ("frequency", None),
+    ("brands_using", None),
+    ("example", "example_ad_copy"),
+)
+_DESIRE_FIELDS = (
+    ("desire", "desire"),
+    ("timeframe", "timeframe"),
+    ("specificity", "specificity"),
+    ("frequency", None),
+    ("brands_using", None),
+    ("example", "example_ad_copy"),
+)
 
-def _compare_pain_points(
-    brand_dimensions: dict, focus_brand: Optional[str]
-) -> DimensionComparison:
-    """Compare pain point patterns across brands."""
-    all_pain_points = []
-    for brand_name, dims in brand_dimensions.items():
-        for pp in dims.pain_points:
-            all_pain_points.append(
-                {
-                    "pain_point": pp.pain_point,
-                    "intensity": pp.intensity,
-                    "frequency": pp.frequency,
-                    "brand": brand_name,
-                    "example": pp.example_ad_copy,
-                    "emotional_trigger": pp.emotional_trigger,
-                }
-            )
 
-    # Group by pain point text
-    pattern_groups = defaultdict(list)
-    for pp in all_pain_points:
-        key = pp["pain_point"][:40].lower()
-        pattern_groups[key].append(pp)
+_WORD_RE = re.compile(r"\w+")
 
-    ranked_patterns = []
-    for group in pattern_groups.values():
-        total_freq = sum(p["frequency"] for p in group)
-        brands_using = list(set(p["brand"] for p in group))
-        representative = group[0]
 
-        ranked_patterns.append(
-            {
-                "pain_point": representative["pain_point"],
-                "intensity": representative["intensity"],
-                "frequency": total_freq,
-                "brands_using": brands_using,
-                "example": representative["example"],
-                "emotional_trigger": representative["emotional_trigger"],
-            }
-        )
+# The same pattern text recurs across brands and across reruns of a market,
+# so each distinct text is normalized once.
+@functools.lru_cache(maxsize=4096)
+def _group_key(text: str, length: int) -> str:
+    """Truncated pattern text with case, punctuation and spacing normalized.
 
-    ranked_patterns.sort(key=lambda p: p["frequency"], reverse=True)
+    "Liver overload." and "liver  overload" land in the same group. Merging
+    stops at wording: fuzzy matching would also join opposite claims such as
+    "low stomach acid" and "high stomach acid".
+    """
+    return " ".join(_WORD_RE.findall(text.lower()))[:length]
 
-    pattern_1 = ranked_patterns[0] if ranked_patterns else {}
-    pattern_2 = ranked_patterns[1] if len(ranked_patterns) > 1 else {}
-    pattern_3 = ranked_patterns[2] if len(ranked_patterns) > 2 else {}
 
-    differences = "Top pain points by frequency. Intensity and emotional triggers vary by brand positioning."
-    loopholes = _identify_pain_point_loopholes(
-        ranked_patterns, brand_dimensions, focus_brand
-    )
+def _grouping(
+    group_key: Callable[[Any], str], fields: tuple
+) -> tuple[Callable[[Any], str], tuple[str, ...], tuple[str, ...], attrgetter]:
+    """Precompute how one dimension's grouped rows are built.
 
-    return DimensionComparison(
-        dimension_type="pain_points",
-        pattern_1=pattern_1,
-        pattern_2=pattern_2,
-        pattern_3=pattern_3,
-        how_patterns_differ=differences,
-        loopholes=loopholes,
+    Returns the group key, every output key in order, the output keys copied
+    from the pattern and an attrgetter reading their source attributes in one
+    call.
+    """
+    copied = [(out, src) for out, src in fields if src]
+    return (
+        group_key,
+        tuple(out for out, _ in fields),
+        tuple(out for out, _ in copied),
+        attrgetter(*(src for _, src in copied)),
     )
 
 
-def _compare_symptoms(
-    brand_dimensions: dict, focus_brand: Optional[str]
-) -> DimensionComparison:
-    """Compare symptom patterns across brands."""
-    all_symptoms = []
+# How each dimension's patterns are grouped across brands: attribute name →
+# (group key, output keys, copied keys, source getter). Keys are truncated,
+# normalized pattern text.
+_DIMENSION_GROUPING: dict[str, tuple] = {
+    "root_causes": _grouping(lambda rc: _group_key(rc.text, 50), _ROOT_CAUSE_FIELDS),
+    "mechanisms": _grouping(lambda m: _group_key(m.text, 50), _MECHANISM_FIELDS),
+    "target_audiences": _grouping(
+        lambda a: _group_key(a.identity, 30) if a.identity else "generic",
+        _AUDIENCE_FIELDS,
+    ),
+    "pain_points": _grouping(lambda p: _group_key(p.pain_point, 40), _PAIN_POINT_FIELDS),
+    "symptoms": _grouping(lambda s: _group_key(s.symptom, 40), _SYMPTOM_FIELDS),
+    "mass_desires": _grouping(lambda d: _group_key(d.desire, 40), _DESIRE_FIELDS),
+}
+
+
+def _rank_all_dimensions(brand_dimensions: dict) -> dict[str, list[dict]]:
+    """Group every dimension's patterns across brands and rank by total frequency.
+
+    One pass over the brands feeds all six dimensions: the most frequent
+    pattern in a group is its representative (the first seen on ties),
+    frequencies are summed and brands collected as they are seen. Groups keep
+    first-seen order for ties.
+    """
+    groups: dict[str, dict[str, dict]] = {attr: {} for attr in _DIMENSION_GROUPING}
+    group_brands: dict[str, dict[str, set[str]]] = {attr: {} for attr in _DIMENSION_GROUPING}
+    # Frequency of each group's current representative
+    representative_frequency: dict[str, dict[str, int]] = {
+        attr: {} for attr in _DIMENSION_GROUPING
+    }
     for brand_name, dims in brand_dimensions.items():
-        for sym in dims.symptoms:
-            all_symptoms.append(
-                {
-                    "symptom": sym.symptom,
-                    "frequency": sym.frequency,
-                    "brand": brand_name,
-                    "example": sym.example_ad_copy,
-                }
-            )
-
-    # Group by symptom text
-    pattern_groups = defaultdict(list)
-    for sym in all_symptoms:
-        key = sym["symptom"][:40].lower()
-        pattern_groups[key].append(sym)
-
-    ranked_patterns = []
-    for group in pattern_groups.values():
-        total_freq = sum(s["frequency"] for s in group)
-        brands_using = list(set(s["brand"] for s in group))
-        representative = group[0]
-
-        ranked_patterns.append(
-            {
-                "symptom": representative["symptom"],
-                "frequency": total_freq,
-                "brands_using": brands_using,
-                "example": representative["example"],
-            }
+        for attr, (group_key, keys, copied, read_fields) in _DIMENSION_GROUPING.items():
+            dim_groups = groups[attr]
+            dim_brands = group_brands[attr]
+            dim_representatives = representative_frequency[attr]
+            for item in getattr(dims, attr):
+                key = group_key(item)
+                entry = dim_groups.get(key)
+                if entry is None:
+                    entry = dim_groups[key] = dict.fromkeys(keys)
+                    entry.update(zip(copied, read_fields(item)))
+                    entry["frequency"] = item.frequency
+                    dim_representatives[key] = item.frequency
+                    dim_brands[key] = {brand_name}
+                    continue
+                if item.frequency > dim_representatives[key]:
+                    entry.update(zip(copied, read_fields(item)))
+                    dim_representatives[key] = item.frequency
+                entry["frequency"] += item.frequency
+                dim_brands[key].add(brand_name)
+
+    ranked_by_dimension = {}
+    for attr, dim_groups in groups.items():
+        dim_brands = group_brands[attr]
+        for key, entry in dim_groups.items():
+            entry["brands_using"] = sorted(dim_brands[key])
+        # The full ranking is kept, not just the top three: the difference
+        # and loophole analyses read every pattern and their wording (counter
+        # order, ties) follows this order.
+        ranked_by_dimension[attr] = sorted(
+            dim_groups.values(), key=itemgetter("frequency"), reverse=True
         )
+    return ranked_by_dimension
 
-    ranked_patterns.sort(key=lambda p: p["frequency"], reverse=True)
-
-    pattern_1 = ranked_patterns[0] if ranked_patterns else {}
-    pattern_2 = ranked_patterns[1] if len(ranked_patterns) > 1 else {}
-    pattern_3 = ranked_patterns[2] if len(ranked_patterns) > 2 else {}
 
-    differences = (
-        "Symptoms ranked by frequency. More specific symptoms signal deeper understanding of lived experience."
-    )
-    loopholes = _identify_symptom_loopholes(
-        ranked_patterns, brand_dimensions, focus_brand
-    )
-
-    return DimensionComparison(
-        dimension_type="symptoms",
-        pattern_1=pattern_1,
-        pattern_2=pattern_2,
-        pattern_3=pattern_3,
-        how_patterns_differ=differences,
-        loopholes=loopholes,
-    )
-
-
-def _compare_desires(
-    brand_dimensions: dict, focus_brand: Optional[str]
+def _compare_dimension(
+    dimension_type: str,
+    ranked_patterns: list[dict],
+    brand_dimensions: dict,
+    focus_brand: Optional[str],
 ) -> DimensionComparison:
-    """Compare mass desire patterns across brands."""
-    all_desires = []
-    for brand_name, dims in brand_dimensions.items():
-        for des in dims.mass_desires:
-            all_desires.append(
-                {
-                    "desire": des.desire,
-                    "timeframe": des.timeframe,
-                    "specificity": des.specificity,
-                    "frequency": des.frequency,
-                    "brand": brand_name,
-                    "example": des.example_ad_copy,
-                }
-            )
-
-    # Group by desire text
-    pattern_groups = defaultdict(list)
-    for des in all_desires:
-        key = des["desire"][:40].lower()
-        pattern_groups[key].append(des)
-
-    ranked_patterns = []
-    for group in pattern_groups.values():
-        total_freq = sum(d["frequency"] for d in group)
-        brands_using = list(set(d["brand"] for d in group))
-        representative = group[0]
-
-        ranked_patterns.append(
-            {
-                "desire": representative["desire"],
-                "timeframe": representative["timeframe"],
-                "specificity": representative["specificity"],
-                "frequency": total_freq,
-                "brands_using": brands_using,
-                "example": representative["example"],
-            }
-        )
-
-    ranked_patterns.sort(key=lambda p: p["frequency"], reverse=True)
-
-    pattern_1 = ranked_patterns[0] if ranked_patterns else {}
-    pattern_2 = ranked_patterns[1] if len(ranked_patterns) > 1 else {}
-    pattern_3 = ranked_patterns[2] if len(ranked_patterns) > 2 else {}
-
-    differences = _analyze_desire_differences(ranked_patterns)
-    loopholes = _identify_desire_loopholes(
-        ranked_patterns, brand_dimensions, focus_brand
-    )
+    """Compare one dimension's ranked patterns across brands."""
+    describe_differences, identify_loopholes = _DIMENSION_ANALYSIS[dimension_type]
+    pattern_1, pattern_2, pattern_3 = [*ranked_patterns[:3], {}, {}, {}][:3]
 
     return DimensionComparison(
-        dimension_type="mass_desires",
+        dimension_type=dimension_type,
         pattern_1=pattern_1,
         pattern_2=pattern_2,
         pattern_3=pattern_3,
-        how_patterns_differ=differences,
-        loopholes=loopholes,
+        how_patterns_differ=describe_differences(ranked_patterns),
+        loopholes=identify_loopholes(ranked_patterns, brand_dimensions, focus_brand),
     )
 
 
@@ -544,6 +333,21 @@ def _analyze_desire_differences(patterns: list[dict]) -> str:
     )
 
 
+_GENERIC_ROOT_CAUSE_TERMS = ("congestion", "clogging", "stuck", "blocked", "sluggish")
+_GENERIC_MECHANISM_TERMS = ("support", "helps", "promotes", "aids", "assists", "enhances")
+
+
+def _count_texts_with_terms(patterns: list[dict], terms: tuple[str, ...]) -> int:
+    """Count patterns whose text contains any of terms (case-insensitive)."""
+    count = 0
+    for p in patterns:
+        # Lowercase once per pattern, not once per term
+        text = p.get("text", "").lower()
+        if any(term in text for term in terms):
+            count += 1
+    return count
+
+
 def _identify_root_cause_loopholes(
     patterns: list[dict], brand_dimensions: dict, focus_brand: Optional[str]
 ) -> list[str]:
@@ -571,8 +375,7 @@ def _identify_root_cause_loopholes(
         )
 
     # Check for generic vs specific
-    generic_terms = ["congestion", "clogging", "stuck", "blocked", "sluggish"]
-    generic_count = sum(1 for p in patterns if any(term in p.get("text", "").lower() for term in generic_terms))
+    generic_count = _count_texts_with_terms(patterns, _GENERIC_ROOT_CAUSE_TERMS)
     if generic_count >= len(patterns) * 0.75:
         loopholes.append(
             f"GENERIC ROOT CAUSES: {generic_count}/{len(patterns)} root cause explanations use generic terms. Opportunity for specific, differentiated causation (e.g., hepatic-specific, hormonal, cellular waste)."
@@ -622,8 +425,7 @@ def _identify_mechanism_loopholes(
         )
 
     # Check for generic claims
-    generic_terms = ["support", "helps", "promotes", "aids", "assists", "enhances"]
-    vague_count = sum(1 for p in patterns if any(term in p.get("text", "").lower() for term in generic_terms))
+    vague_count = _count_texts_with_terms(patterns, _GENERIC_MECHANISM_TERMS)
     if vague_count >= len(patterns) * 0.6:
         loopholes.append(
             f"VAGUE MECHANISMS: {vague_count}/{len(patterns)} mechanism explanations use generic support language. Opportunity for specific action verbs and pathways."
@@ -724,6 +526,24 @@ def _identify_desire_loopholes(
     return loopholes
 
 
+# How each dimension's comparison is written up: attribute name →
+# (how_patterns_differ from the ranked patterns, loophole finder)
+_DIMENSION_ANALYSIS: dict[str, tuple[Callable[[list[dict]], str], Callable[..., list[str]]]] = {
+    "root_causes": (_analyze_root_cause_differences, _identify_root_cause_loopholes),
+    "mechanisms": (_analyze_mechanism_differences, _identify_mechanism_loopholes),
+    "target_audiences": (_analyze_audience_differences, _identify_audience_loopholes),
+    "pain_points": (
+        lambda patterns: "Top pain points by frequency. Intensity and emotional triggers vary by brand positioning.",
+        _identify_pain_point_loopholes,
+    ),
+    "symptoms": (
+        lambda patterns: "Symptoms ranked by frequency. More specific symptoms signal deeper understanding of lived experience.",
+        _identify_symptom_loopholes,
+    ),
+    "mass_desires": (_analyze_desire_differences, _identify_desire_loopholes),
+}
+
+
 async def _assess_market_sophistication(
     brand_dimensions: dict, brand_reports: list[BrandReport], config: dict
 ) -> MarketSophisticationLevel:
@@ -806,10 +626,16 @@ def _build_brand_summaries(
     return summaries
 
 
+_LYMPHATIC_BLOCKAGE_TERMS = ("congestion", "backup", "clog")
+
+
+# Each root cause appears in one matrix row per mechanism it's paired with, so
+# the same text is clustered many times per market map.
+@functools.lru_cache(maxsize=1024)
 def _cluster_root_cause(text: str) -> str:
     """Cluster similar root causes into categories."""
     text_lower = text.lower()
-    if 'lymphatic' in text_lower and any(term in text_lower for term in ['congestion', 'backup', 'clog']):
+    if 'lymphatic' in text_lower and any(term in text_lower for term in _LYMPHATIC_BLOCKAGE_TERMS):
         return "lymphatic_congestion"
     elif 'none stated' in text_lower:
         return "none_stated"
@@ -819,6 +645,18 @@ def _cluster_root_cause(text: str) -> str:
         return "other"
 
 
+# Market share (whole percent) tiers for matrix rows: 0 → WIDE OPEN,
+# 1-29 → Underexploited, 30-59 → MODERATE, 60+ → SATURATED.
+_GAP_THRESHOLDS = (1, 30, 60)
+_GAP_LABELS = ("WIDE OPEN", "Underexploited", "MODERATE", "SATURATED")
+_GAP_COLORS = {
+    "SATURATED": "red",
+    "MODERATE": "yellow",
+    "Underexploited": "green",
+    "WIDE OPEN": "cyan",
+}
+
+
 def _build_root_cause_mechanism_matrix(
     brand_reports: list[BrandReport], brand_dimensions: dict
 ) -> list[dict]:
@@ -827,10 +665,10 @@ def _build_root_cause_mechanism_matrix(
     Shows which root cause + mechanism combinations are used by which brands.
     Makes it easy to spot saturated, underexploited, and missing combos.
     """
-    from collections import defaultdict
-
-    # Collect all root cause + mechanism pairs from all brands' ads
-    matrix_data = defaultdict(lambda: {"brands": set(), "total_ads": 0})
+    # Collect all root cause + mechanism pairs from all brands' ads, keyed by
+    # (root cause, mechanism)
+    combo_brands: dict[tuple[str, str], set[str]] = defaultdict(set)
+    combo_ads: Counter[tuple[str, str]] = Counter()
 
     for report in brand_reports:
         brand_name = report.advertiser.page_name
@@ -838,68 +676,51 @@ def _build_root_cause_mechanism_matrix(
         # Get root causes and mechanisms from the brand's pattern report
         pr = report.pattern_report
 
-        # Extract from root_cause_patterns and mechanism_patterns
+        # Clean (without truncation) once per brand, not once per pair
         root_causes = [
-            rc.get("root_cause", "none stated") for rc in pr.root_cause_patterns
-        ]
-        mechanisms = [m.get("mechanism", "none stated") for m in pr.mechanism_patterns]
+            rc.get("root_cause", "none stated").strip() for rc in pr.root_cause_patterns
+        ] or ["none stated"]
+        mechanisms = [
+            m.get("mechanism", "none stated").strip() for m in pr.mechanism_patterns
+        ] or ["none stated"]
 
         # Create combinations
-        if not root_causes:
-            root_causes = ["none stated"]
-        if not mechanisms:
-            mechanisms = ["none stated"]
-
-        for root in root_causes:
-            for mech in mechanisms:
-                # Clean without truncation
-                root_clean = root.strip()
-                mech_clean = mech.strip()
-
-                key = (root_clean, mech_clean)
-                matrix_data[key]["brands"].add(brand_name)
-                matrix_data[key]["total_ads"] += 1
-                matrix_data[key]["root_cause"] = root_clean
-                matrix_data[key]["mechanism"] = mech_clean
+        combos = list(itertools.product(root_causes, mechanisms))
+        combo_ads.update(combos)
+        for combo in combos:
+            combo_brands[combo].add(brand_name)
 
     # Convert to list and calculate market share
     total_brands = len(brand_reports)
-    total_ads = sum(r.pattern_report.total_ads_analyzed for r in brand_reports)
 
-    matrix_rows = []
-    for combo_data in matrix_data.values():
-        brands_using = list(combo_data["brands"])
-        num_brands = len(brands_using)
+    # Market share and gap depend only on how many brands use a combo, so
+    # classify each possible brand count once instead of once per row
+    share_and_gap = []
+    for num_brands in range(total_brands + 1):
         market_share = round((num_brands / total_brands) * 100) if total_brands > 0 else 0
+        share_and_gap.append(
+            (market_share, _GAP_LABELS[bisect_right(_GAP_THRESHOLDS, market_share)])
+        )
 
-        # Classify as gap
-        if market_share >= 60:
-            gap = "SATURATED"
-        elif market_share >= 30:
-            gap = "MODERATE"
-        elif market_share > 0:
-            gap = "Underexploited"
-        else:
-            gap = "WIDE OPEN"
-
-        # Add root cause cluster
-        cluster = _cluster_root_cause(combo_data["root_cause"])
-
+    matrix_rows = []
+    for (root, mech), brands in combo_brands.items():
+        market_share, gap = share_and_gap[len(brands)]
         matrix_rows.append(
             {
-                "root_cause": combo_data["root_cause"],
-                "mechanism": combo_data["mechanism"],
-                "root_cause_cluster": cluster,
-                "brands_using": brands_using,
-                "num_brands": num_brands,
-                "total_ads": combo_data["total_ads"],
+                "root_cause": root,
+                "mechanism": mech,
+                "root_cause_cluster": _cluster_root_cause(root),
+                "brands_using": sorted(brands),
+                "num_brands": len(brands),
+                "total_ads": combo_ads[(root, mech)],
                 "market_share": market_share,
                 "gap": gap,
             }
         )
 
-    # Sort by market share descending (saturated first)
-    matrix_rows.sort(key=lambda x: x["market_share"], reverse=True)
+    # Sort by market share descending (saturated first); ties broken by text so
+    # the order doesn't depend on which brand report arrived first
+    matrix_rows.sort(key=lambda x: (-x["market_share"], x["root_cause"], x["mechanism"]))
 
     return matrix_rows
 
@@ -917,8 +738,7 @@ def save_strategic_market_map(market_map: StrategicMarketMap, output_dir: Path)
     output_dir.mkdir(parents=True, exist_ok=True)
 
     json_path = output_dir / "strategic_market_map.json"
-    with open(json_path, "w") as f:
-        json.dump(market_map.model_dump(mode="json"), f, indent=2, default=str)
+    write_model_json(json_path, market_map)
 
     logger.info(f"Strategic market map saved: {json_path}")
     return json_path
@@ -933,6 +753,10 @@ def format_strategic_market_map_text(market_map: StrategicMarketMap) -> str:
     Returns:
         Formatted text string
     """
+    from rich.table import Table
+
+    from meta_ads_analyzer.utils.rich_markup import render_markup
+
     lines = []
 
     lines.append(
@@ -965,7 +789,7 @@ def format_strategic_market_map_text(market_map: StrategicMarketMap) -> str:
                 summary["primary_mechanism"][:28],
             )
 
-        console.print(table)
+        lines.append(render_markup(table))
         lines.append("")
 
     # Root Cause x Mechanism Matrix
@@ -982,23 +806,19 @@ def format_strategic_market_map_text(market_map: StrategicMarketMap) -> str:
         matrix_table.add_column("Status", width=15)
 
         # Show top 10 rows
+        num_brands = len(market_map.brand_summaries)
         for row in market_map.root_cause_mechanism_matrix[:10]:
-            status_color = {
-                "SATURATED": "red",
-                "MODERATE": "yellow",
-                "Underexploited": "green",
-                "WIDE OPEN": "cyan",
-            }.get(row["gap"], "white")
+            status_color = _GAP_COLORS.get(row["gap"], "white")
 
             matrix_table.add_row(
                 row["root_cause"][:26],
                 row["mechanism"][:26],
-                f"{row['num_brands']}/{len(market_map.brand_summaries)}",
+                f"{row['num_brands']}/{num_brands}",
                 f"{row['market_share']}%",
                 f"[{status_color}]{row['gap']}[/{status_color}]",
             )
 
-        console.print(matrix_table)
+        lines.append(render_markup(matrix_table))
         lines.append("")
 
     return "\n".join(lines)
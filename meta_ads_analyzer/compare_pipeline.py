@@ -5,28 +5,25 @@ Transformation: Replaced ad craft analysis (hooks, angles, formats) with DR stra
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+import asyncio
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
-from meta_ads_analyzer.models import BrandReport
+from meta_ads_analyzer.models import BrandReport, utcnow
 from meta_ads_analyzer.compare.strategic_market_map import (
     generate_strategic_market_map,
     save_strategic_market_map,
-    format_strategic_market_map_text,
 )
 from meta_ads_analyzer.compare.strategic_loophole_doc import (
+    asave_strategic_loophole_doc,
     generate_strategic_loophole_doc,
-    save_strategic_loophole_doc,
-    format_strategic_loophole_doc_text,
 )
 from meta_ads_analyzer.compare.strategic_dimensions import StrategicCompareResult
+from meta_ads_analyzer.utils.jsonio import read_json
 from meta_ads_analyzer.utils.logging import get_logger
-from rich.console import Console
 
 logger = get_logger(__name__)
-console = Console()
 
 
 class ComparePipeline:
@@ -108,15 +105,19 @@ class ComparePipeline:
         logger.info("Generating strategic market map (root causes, mechanisms, audiences, pain points, symptoms, desires)")
         market_map = await generate_strategic_market_map(
             brand_reports,
-            meta={'keyword': keyword, 'scan_date': datetime.utcnow()},
+            meta={'keyword': keyword, 'scan_date': utcnow()},
             focus_brand=focus_brand,
             config=self.config,
         )
 
-        # Display market map summary
-        console.print(format_strategic_market_map_text(market_map))
+        # Stage 3: Save the market map from a worker thread while Claude
+        # generates the loophole document
+        output_subdir = self._create_output_dir(keyword)
+        map_saved = asyncio.create_task(
+            asyncio.to_thread(save_strategic_market_map, market_map, output_subdir)
+        )
 
-        # Stage 3: Generate strategic loophole document (5-7 execution-ready opportunities)
+        # Stage 4: Generate strategic loophole document (5-7 execution-ready opportunities)
         loophole_doc = None
         if enhance:
             logger.info("Generating strategic loophole document (arbitrage opportunities)")
@@ -124,20 +125,13 @@ class ComparePipeline:
                 loophole_doc = await generate_strategic_loophole_doc(
                     market_map, brand_reports, focus_brand, self.config
                 )
-
-                # Display loophole summary
-                console.print(format_strategic_loophole_doc_text(loophole_doc))
-
             except Exception as e:
                 logger.error(f"Failed to generate strategic loopholes: {e}")
                 logger.warning("Continuing with market map only")
 
-        # Stage 4: Save results
-        output_subdir = self._create_output_dir(keyword)
-        save_strategic_market_map(market_map, output_subdir)
-
+        await map_saved
         if loophole_doc:
-            save_strategic_loophole_doc(loophole_doc, output_subdir)
+            await asave_strategic_loophole_doc(loophole_doc, output_subdir)
 
         logger.info(f"Strategic compare complete, results saved to: {output_subdir}")
 
@@ -183,12 +177,12 @@ class ComparePipeline:
         latest_dir = max(matching_dirs, key=lambda p: p.stat().st_mtime)
         logger.info(f"Loading reports from: {latest_dir}")
 
-        # Load all brand reports from directory
-        brand_reports = []
-        for json_file in latest_dir.glob("brand_report_*.json"):
-            with open(json_file) as f:
-                data = json.load(f)
-            brand_reports.append(BrandReport(**data))
+        # Load all brand reports from directory; pydantic-core parses and
+        # validates each file in one pass, without an intermediate dict
+        brand_reports = [
+            BrandReport.model_validate_json(json_file.read_bytes())
+            for json_file in latest_dir.glob("brand_report_*.json")
+        ]
 
         logger.info(f"Loaded {len(brand_reports)} brand reports")
 
@@ -251,8 +245,7 @@ class ComparePipeline:
         latest_dir = max(matching_dirs, key=lambda p: p.stat().st_mtime)
         bo_path = latest_dir / "blue_ocean_report.json"
         if bo_path.exists():
-            with open(bo_path) as f:
-                return json.load(f)
+            return read_json(bo_path)
         return None
 
     def _create_output_dir(self, keyword: str) -> Path:
@@ -265,7 +258,7 @@ class ComparePipeline:
             Path to output subdirectory
         """
         keyword_slug = "".join(c if c.isalnum() else "_" for c in keyword)[:50]
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         subdir = self.output_dir / f"compare_{keyword_slug}_{timestamp}"
         subdir.mkdir(parents=True, exist_ok=True)
 
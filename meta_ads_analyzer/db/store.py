@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -16,6 +15,7 @@ from meta_ads_analyzer.models import (
     AdType,
     FilterReason,
     ScrapedAd,
+    utcnow,
 )
 
 DB_PATH = Path("output/meta_ads.db")
@@ -119,14 +119,14 @@ class AdStore:
         await self._db.execute(
             "INSERT INTO runs (run_id, search_query, brand, started_at, config_json) "
             "VALUES (?, ?, ?, ?, ?)",
-            (run_id, search_query, brand, datetime.utcnow().isoformat(), json.dumps(config)),
+            (run_id, search_query, brand, utcnow().isoformat(), json.dumps(config)),
         )
         await self._db.commit()
 
     async def complete_run(self, run_id: str, status: str = "completed") -> None:
         await self._db.execute(
             "UPDATE runs SET completed_at = ?, status = ? WHERE run_id = ?",
-            (datetime.utcnow().isoformat(), status, run_id),
+            (utcnow().isoformat(), status, run_id),
         )
         await self._db.commit()
 
@@ -267,7 +267,7 @@ class AdStore:
                 analysis.model_dump_json(),
                 analysis.analysis_confidence,
                 analysis.copy_quality_score,
-                datetime.utcnow().isoformat(),
+                utcnow().isoformat(),
             ),
         )
         await self._db.commit()
@@ -11,9 +11,8 @@ Coordinates multi-brand competitive analysis:
 
 from __future__ import annotations
 
-import json
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
@@ -28,10 +27,12 @@ from meta_ads_analyzer.classifier.keyword_expander import (
 from meta_ads_analyzer.classifier.product_type import (
     filter_ads_by_product_type,
     get_dominant_product_type,
+    product_type_breakdown,
 )
-from meta_ads_analyzer.models import BrandReport, BrandSelection, ClassifiedAd, MarketResult, ProductType, ScanResult, ScrapedAd, SelectionStats
+from meta_ads_analyzer.models import BrandReport, BrandSelection, ClassifiedAd, MarketResult, ProductType, ScanResult, ScrapedAd, SelectionStats, utcnow
 from meta_ads_analyzer.pipeline import Pipeline
 from meta_ads_analyzer.selector import aggregate_by_advertiser, extract_root_domain, rank_advertisers, select_ads_for_brand
+from meta_ads_analyzer.utils.jsonio import read_json
 from meta_ads_analyzer.utils.logging import get_logger
 
 # Minimum keyword-scan ads a brand must have to be considered a real competitor.
@@ -135,7 +136,7 @@ class MarketPipeline:
 
         if page_to_network:
             # Count unique networks by network_name (PageNetwork isn't hashable)
-            unique_network_names = set(network.network_name for network in page_to_network.values())
+            unique_network_names = {network.network_name for network in page_to_network.values()}
             unique_networks = len(unique_network_names)
             logger.info(f"Detected {unique_networks} brand networks across {len(page_to_network)} pages")
             # TODO: Update advertiser aggregation to use networks in future version
@@ -257,7 +258,7 @@ class MarketPipeline:
 
         # Create market subdirectory for reports
         keyword_slug = "".join(c if c.isalnum() else "_" for c in keyword)[:50]
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         output_dir = Path(self.config.get("reporting", {}).get("output_dir", "output/reports"))
         self.market_subdir = output_dir / f"market_{keyword_slug}_{timestamp}"
         self.market_subdir.mkdir(parents=True, exist_ok=True)
@@ -295,10 +296,11 @@ class MarketPipeline:
             try:
                 brand_report = await self._analyze_brand(selection, keyword)
                 brand_reports.append(brand_report)
-                analyzed = len([
-                    a for a in brand_report.pattern_report.analyzed_ads
-                    if a is not None
-                ]) if brand_report.pattern_report and hasattr(brand_report.pattern_report, 'analyzed_ads') else "?"
+                analyzed = (
+                    brand_report.pattern_report.total_ads_analyzed
+                    if brand_report.pattern_report
+                    else "?"
+                )
                 console.print(
                     f"[green]✓ Completed {brand_name}[/]"
                 )
@@ -393,9 +395,7 @@ class MarketPipeline:
         if from_scan:
             logger.info(f"Loading scan from {from_scan}")
             console.print(f"[cyan]Loading scan from:[/] {from_scan}")
-            with open(from_scan) as f:
-                data = json.load(f)
-            return ScanResult(**data)
+            return ScanResult.model_validate_json(Path(from_scan).read_bytes())
         else:
             logger.info(f"Running fresh scan for '{keyword}'")
             console.print("[cyan]Scanning Meta Ads Library...[/]")
@@ -506,10 +506,7 @@ class MarketPipeline:
                     f"{len(brand_ads)} for '{brand_name}' ({new_count} new)"
                 )
                 if self._debug and brand_ads:
-                    type_dist = {}
-                    for ad in brand_ads:
-                        t = ad.product_type.value if ad.product_type else "None"
-                        type_dist[t] = type_dist.get(t, 0) + 1
+                    type_dist = product_type_breakdown(brand_ads)
                     logger.info(f"  DEBUG product_type breakdown for '{query}' brand ads: {type_dist}")
                 # Collect page_ids surfaced in advertiser header sections
                 for pid in scan.found_page_ids:
@@ -559,20 +556,14 @@ class MarketPipeline:
                     f"{len(brand_ads)} for '{brand_name}' ({new_count} new)"
                 )
                 if self._debug and brand_ads:
-                    type_dist = {}
-                    for ad in brand_ads:
-                        t = ad.product_type.value if ad.product_type else "None"
-                        type_dist[t] = type_dist.get(t, 0) + 1
+                    type_dist = product_type_breakdown(brand_ads)
                     logger.info(f"  DEBUG product_type breakdown for page_id={page_id} brand ads: {type_dist}")
             except Exception as e:
                 logger.warning(f"Deep brand search (page_id={page_id}) failed: {e}")
 
         combined = list(all_brand_ads.values())
         if self._debug:
-            type_dist: dict[str, int] = {}
-            for ad in combined:
-                t = ad.product_type.value if ad.product_type else "None"
-                type_dist[t] = type_dist.get(t, 0) + 1
+            type_dist = product_type_breakdown(combined)
             logger.info(
                 f"DEBUG '{brand_name}' funnel — "
                 f"unique ads (all UNKNOWN since classify_products=False): {len(combined)}  "
@@ -781,7 +772,7 @@ class MarketPipeline:
 
         # Create output directory first (needed for saving brand reports during cross-category analysis)
         keyword_slug = "".join(c if c.isalnum() else "_" for c in keyword)[:50]
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         output_dir = Path(self.config.get("reporting", {}).get("output_dir", "output/reports"))
         self.market_subdir = output_dir / f"market_{keyword_slug}_{timestamp}"
         self.market_subdir.mkdir(parents=True, exist_ok=True)
@@ -1174,12 +1165,13 @@ class MarketPipeline:
 
         for report_file in output_dir.glob("*/brand_report_*.json"):
             try:
-                with open(report_file) as f:
-                    data = json.load(f)
-                report = BrandReport(**data)
+                data = read_json(report_file)
 
-                # Verify it's the right brand (case insensitive)
-                if report.advertiser.page_name.lower() == focus_brand_lower:
+                # Check the brand (case insensitive) on the raw JSON so only the
+                # matching report pays for full model validation
+                page_name = data.get("advertiser", {}).get("page_name", "")
+                if page_name.lower() == focus_brand_lower:
+                    report = BrandReport(**data)
                     logger.info(f"Loaded focus brand report from: {report_file}")
                     return report
             except Exception as e:
@@ -1281,7 +1273,7 @@ class MarketPipeline:
             keyword=keyword,
             selection_stats=selection.selection_stats,
             pattern_report=pattern_report,
-            generated_at=datetime.utcnow(),
+            generated_at=utcnow(),
             **(extra_fields or {}),
         )
 
@@ -1369,17 +1361,15 @@ class MarketPipeline:
         Sorts by impression_lower desc, caps at ads_per_brand.
         All ads get priority_label="P1" — we want all ad types from these brands.
         """
-        from datetime import timezone
-
         sorted_ads = sorted(ads, key=lambda a: a.impression_lower, reverse=True)[:ads_per_brand]
 
+        now = datetime.now(timezone.utc)
         classified = []
         for ad in sorted_ads:
             days_since_launch = None
             if ad.started_running:
                 try:
                     started = datetime.fromisoformat(ad.started_running.replace("Z", "+00:00"))
-                    now = datetime.now(timezone.utc)
                     days_since_launch = (now - started).days
                 except Exception:
                     pass
@@ -6,9 +6,11 @@ and triggers keyword expansion to find real competitors.
 
 from __future__ import annotations
 
-import anthropic
+import json
 
 from meta_ads_analyzer.models import BrandReport, PatternReport
+from meta_ads_analyzer.utils.claude_client import get_claude
+from meta_ads_analyzer.utils.jsonio import loads_enclosed
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -19,7 +21,6 @@ class ProductMatcher:
 
     def __init__(self, config: dict):
         self.config = config
-        self.client = anthropic.AsyncAnthropic()
         self.model = config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514")
 
     async def extract_product_attributes(self, brand_report: BrandReport) -> dict:
@@ -64,42 +65,38 @@ Return JSON:
   "category": "broad category"
 }}"""
 
-        response = await self.client.messages.create(
+        response = await get_claude().messages.create(
             model=self.model,
             max_tokens=1024,
             temperature=0,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        import json
         text = response.content[0].text.strip()
 
-        logger.debug(f"Claude response for product attributes: {text[:500]}")
+        logger.debug("Claude response for product attributes: %.500s", text)
 
         # Extract JSON from response
-        if "{" in text and "}" in text:
-            try:
-                start = text.find("{")
-                end = text.rfind("}") + 1
-                json_str = text[start:end]
-                data = json.loads(json_str)
-
-                # Validate required fields
-                required = ['product_type', 'category']
-                missing = [f for f in required if f not in data]
-                if missing:
-                    logger.error(f"Missing required fields in response: {missing}")
-                    raise ValueError(f"Missing fields: {missing}")
-
-                logger.info(
-                    f"Extracted product attributes: {data['product_type']} | "
-                    f"Category: {data['category']}"
-                )
-                return data
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error: {e}")
-                logger.error(f"Failed JSON string: {json_str}")
-                raise ValueError(f"Failed to parse JSON: {e}")
+        try:
+            data = loads_enclosed(text, "{")
+        except json.JSONDecodeError as e:
+            logger.error(f"JSON decode error: {e}")
+            logger.error(f"Failed JSON string: {text}")
+            raise ValueError(f"Failed to parse JSON: {e}")
+
+        if data is not None:
+            # Validate required fields
+            required = ['product_type', 'category']
+            missing = [f for f in required if f not in data]
+            if missing:
+                logger.error(f"Missing required fields in response: {missing}")
+                raise ValueError(f"Missing fields: {missing}")
+
+            logger.info(
+                f"Extracted product attributes: {data['product_type']} | "
+                f"Category: {data['category']}"
+            )
+            return data
 
         logger.error(f"No JSON found in response: {text}")
         raise ValueError("Failed to extract product attributes from response")
@@ -220,22 +217,18 @@ Rules:
 Return JSON array of 4-5 keywords:
 ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]"""
 
-        response = await self.client.messages.create(
+        response = await get_claude().messages.create(
             model=self.model,
             max_tokens=512,
             temperature=0,
             messages=[{"role": "user", "content": prompt}]
         )
 
-        import json
         text = response.content[0].text.strip()
 
         # Extract JSON array from response
-        if "[" in text and "]" in text:
-            start = text.find("[")
-            end = text.rfind("]") + 1
-            keywords = json.loads(text[start:end])
-
+        keywords = loads_enclosed(text)
+        if keywords is not None:
             logger.info(f"Generated {len(keywords)} expansion keywords: {keywords}")
             return keywords
 
@@ -3,13 +3,23 @@
 from __future__ import annotations
 
 import enum
-from datetime import datetime
+import functools
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
 
+def utcnow() -> datetime:
+    """Current UTC time as a naive datetime.
+
+    Timestamps stay naive so they compare with those in previously saved
+    scans and reports; this replaces the deprecated datetime.utcnow().
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class AdType(str, enum.Enum):
     VIDEO = "video"
     STATIC = "static"
@@ -89,7 +99,7 @@ class ScrapedAd(BaseModel):
     started_running: Optional[str] = None
     platforms: list[str] = Field(default_factory=list)
     scrape_position: int = 0  # Order on Meta Ads Library page (0-indexed, sorted by impressions)
-    scraped_at: datetime = Field(default_factory=datetime.utcnow)
+    scraped_at: datetime = Field(default_factory=utcnow)
 
     # Impression and spend data (Meta returns these as ranges like "10K-50K")
     impression_lower: int = 0
@@ -105,6 +115,14 @@ class ScrapedAd(BaseModel):
             return 0
         return len(self.primary_text.strip().split())
 
+    @functools.cached_property
+    def searchable_text_lower(self) -> str:
+        """Lowercased primary text, headline and description for keyword scans.
+
+        Computed once per ad; scraped ads are not mutated after construction.
+        """
+        return f"{self.primary_text or ''} {self.headline or ''} {self.description or ''}".lower()
+
 
 class DownloadedMedia(BaseModel):
     """Info about downloaded media file."""
@@ -251,7 +269,7 @@ class PatternReport(BaseModel):
     search_query: str
     brand: Optional[str] = None
     total_ads_analyzed: int = 0
-    generated_at: datetime = Field(default_factory=datetime.utcnow)
+    generated_at: datetime = Field(default_factory=utcnow)
 
     # Patterns (legacy, still populated)
     common_pain_points: list[dict] = Field(default_factory=list)
@@ -400,7 +418,7 @@ class ScanResult(BaseModel):
 
     keyword: str
     country: str = "US"
-    scan_date: datetime = Field(default_factory=datetime.utcnow)
+    scan_date: datetime = Field(default_factory=utcnow)
     ads: list[ScrapedAd] = Field(default_factory=list)
     advertisers: list[AdvertiserEntry] = Field(default_factory=list)
     total_fetched: int = 0
@@ -429,7 +447,7 @@ class BrandReport(BaseModel):
     keyword: str
     selection_stats: SelectionStats
     pattern_report: PatternReport
-    generated_at: datetime = Field(default_factory=datetime.utcnow)
+    generated_at: datetime = Field(default_factory=utcnow)
     cross_category: bool = False
     cross_category_product_type: Optional[str] = None
 
@@ -566,4 +584,4 @@ class CompareResult(BaseModel):
     keyword: str
     market_map: MarketMap
     loophole_doc: LoopholeDocument
-    generated_at: datetime = Field(default_factory=datetime.utcnow)
+    generated_at: datetime = Field(default_factory=utcnow)
@@ -4,9 +4,9 @@ from collections import defaultdict
 from typing import Optional
 from urllib.parse import urlparse
 
-import anthropic
-
 from meta_ads_analyzer.models import PageNetwork, NetworkPage, PageType, ScrapedAd
+from meta_ads_analyzer.utils.claude_client import get_claude
+from meta_ads_analyzer.utils.jsonio import loads_enclosed
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -176,7 +176,7 @@ Return JSON:
 ONLY return the JSON array, no other text."""
 
     try:
-        client = anthropic.AsyncAnthropic()
+        client = get_claude()
         response = await client.messages.create(
             model=config.get("analyzer", {}).get("model", "claude-sonnet-4-20250514"),
             max_tokens=2048,
@@ -184,16 +184,10 @@ ONLY return the JSON array, no other text."""
             messages=[{"role": "user", "content": prompt}]
         )
 
-        # Parse response
-        import json
+        # Parse JSON array from response
         text = response.content[0].text.strip()
-
-        # Extract JSON array from response
-        if "[" in text and "]" in text:
-            start = text.find("[")
-            end = text.rfind("]") + 1
-            data = json.loads(text[start:end])
-
+        data = loads_enclosed(text)
+        if data is not None:
             networks = []
             for item in data:
                 if item.get("is_network"):
@@ -406,18 +406,25 @@ class BatchPipeline:
         pipeline_cfg = config.get("pipeline", {})
         self.max_brands = pipeline_cfg.get("max_brands_per_batch", 15)
         self.brand_pause = pipeline_cfg.get("brand_pause", 10)
+        self.concurrency = pipeline_cfg.get("batch_concurrency", 1)
 
     async def run_batch(
         self,
         queries: list[dict[str, str]],
+        concurrency: int | None = None,
     ) -> list[PatternReport]:
-        """Run pipeline for multiple brands sequentially.
+        """Run pipeline for multiple brands, up to `concurrency` at a time.
+
+        Each concurrent slot owns one Pipeline instance (its filter state is
+        reset between brands). With concurrency=1 brands run sequentially.
 
         Args:
             queries: List of {"query": "...", "brand": "..."} dicts.
+            concurrency: Max brands in flight. Defaults to
+                [pipeline].batch_concurrency.
 
         Returns:
-            List of PatternReport objects.
+            List of PatternReport objects, in the same order as queries.
         """
         if len(queries) > self.max_brands:
             console.print(
@@ -426,40 +433,57 @@ class BatchPipeline:
             )
             queries = queries[: self.max_brands]
 
-        reports: list[PatternReport] = []
-        pipeline = Pipeline(self.config)
+        concurrency = max(1, min(concurrency or self.concurrency, len(queries) or 1))
+        pipelines: asyncio.Queue[Pipeline] = asyncio.Queue()
+        for _ in range(concurrency):
+            pipelines.put_nowait(Pipeline(self.config))
+
+        started = 0
 
-        for i, q in enumerate(queries):
+        async def _run_one(i: int, q: dict[str, str]) -> tuple[int, PatternReport]:
+            nonlocal started
             query = q["query"]
             brand = q.get("brand", query)
 
-            console.print(
-                f"\n[bold]═══ Brand {i + 1}/{len(queries)}: {brand} ═══[/]"
-            )
-
+            pipeline = await pipelines.get()
+            started += 1
             try:
-                report = await pipeline.run(query=query, brand=brand)
-                reports.append(report)
-            except Exception as e:
-                logger.error(f"Pipeline failed for {brand}: {e}")
-                console.print(f"[red]Failed: {e}[/]")
-                reports.append(
-                    PatternReport(
+                console.print(
+                    f"\n[bold]═══ Brand {i + 1}/{len(queries)}: {brand} ═══[/]"
+                )
+
+                try:
+                    report = await pipeline.run(query=query, brand=brand)
+                except Exception as e:
+                    logger.error(f"Pipeline failed for {brand}: {e}")
+                    console.print(f"[red]Failed: {e}[/]")
+                    report = PatternReport(
                         search_query=query,
                         brand=brand,
                         executive_summary=f"Pipeline failed: {e}",
                     )
-                )
 
-            # Pause between brands to avoid rate limits
-            if i < len(queries) - 1:
-                console.print(
-                    f"[dim]Pausing {self.brand_pause}s before next brand...[/]"
-                )
-                await asyncio.sleep(self.brand_pause)
-
-            # Reset filter state between brands
-            pipeline.ad_filter.reset()
+                # Pause before this slot picks up the next brand to avoid rate limits
+                if started < len(queries):
+                    console.print(
+                        f"[dim]Pausing {self.brand_pause}s before next brand...[/]"
+                    )
+                    await asyncio.sleep(self.brand_pause)
+
+                return i, report
+            finally:
+                # Reset filter state between brands
+                pipeline.ad_filter.reset()
+                pipelines.put_nowait(pipeline)
+
+        tasks = [asyncio.create_task(_run_one(i, q)) for i, q in enumerate(queries)]
+        reports: list[PatternReport | None] = [None] * len(queries)
+        for next_done in asyncio.as_completed(tasks):
+            i, report = await next_done
+            reports[i] = report
+            console.print(
+                f"[green]✓[/] {report.brand}: {report.total_ads_analyzed} ads analyzed"
+            )
 
         console.print(f"\n[bold green]Batch complete: {len(reports)} brands processed[/]")
         return reports
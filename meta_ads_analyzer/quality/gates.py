@@ -26,6 +26,13 @@ from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Words whose absence from a long transcript suggests gibberish
+_COMMON_WORDS = frozenset({
+    "the", "a", "is", "are", "was", "were", "and", "or", "but",
+    "in", "on", "at", "to", "for", "of", "with", "that", "this",
+    "you", "i", "we", "they", "it", "not", "have", "has", "do",
+})
+
 
 class QualityGates:
     """Run quality checks before pattern analysis."""
@@ -194,19 +201,16 @@ class CopyQualityChecker:
                 score -= 0.3
 
         # All caps (sign of OCR or bad extraction)
-        upper_ratio = sum(1 for c in transcript if c.isupper()) / max(len(transcript), 1)
+        upper_ratio = sum(map(str.isupper, transcript)) / max(len(transcript), 1)
         if upper_ratio > 0.7:
             issues.append("Mostly uppercase text")
             score -= 0.2
 
         # Gibberish detection (very few common English words)
-        common_words = {
-            "the", "a", "is", "are", "was", "were", "and", "or", "but",
-            "in", "on", "at", "to", "for", "of", "with", "that", "this",
-            "you", "i", "we", "they", "it", "not", "have", "has", "do",
-        }
-        lower_words = [w.lower().strip(".,!?;:") for w in words]
-        common_ratio = sum(1 for w in lower_words if w in common_words) / max(word_count, 1)
+        common_count = sum(
+            1 for w in words if w.lower().strip(".,!?;:") in _COMMON_WORDS
+        )
+        common_ratio = common_count / max(word_count, 1)
         if word_count > 20 and common_ratio < 0.05:
             issues.append("Very few common English words (possible gibberish)")
             score -= 0.3
@@ -237,7 +241,7 @@ class CopyQualityChecker:
             score -= 0.15
 
         # Check for excessive emoji/special chars
-        special_count = sum(1 for c in text if ord(c) > 127)
+        special_count = len(text) - len(text.encode("ascii", "ignore"))
         special_ratio = special_count / max(len(text), 1)
         if special_ratio > 0.3:
             issues.append("High ratio of special/emoji characters")
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-import json
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 from meta_ads_analyzer.models import BrandReport, PatternReport
+from meta_ads_analyzer.utils.jsonio import write_model_json
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -28,7 +28,7 @@ class ReportWriter:
 
         Returns path to the saved report file.
         """
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         safe_query = "".join(
             c if c.isalnum() or c in "-_ " else "" for c in report.search_query
         )[:50].strip().replace(" ", "_")
@@ -54,8 +54,7 @@ class ReportWriter:
         self, report: PatternReport, run_id: str, timestamp: str, safe_query: str
     ) -> Path:
         path = self.output_dir / f"{timestamp}_{safe_query}_{run_id}.json"
-        data = report.model_dump(mode="json")
-        path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+        write_model_json(path, report)
         logger.info(f"Report saved: {path}")
         return path
 
@@ -122,8 +121,7 @@ class ReportWriter:
 
         # Save JSON
         json_path = market_subdir / f"{filename}.json"
-        with open(json_path, "w") as f:
-            json.dump(brand_report.model_dump(mode="json"), f, indent=2, default=str)
+        write_model_json(json_path, brand_report)
 
         # Save markdown (reuse existing pattern report markdown)
         md_path = market_subdir / f"{filename}.md"
@@ -15,7 +15,7 @@ Usage:
 
 from __future__ import annotations
 
-import json
+import heapq
 import re
 import tempfile
 from datetime import datetime
@@ -26,6 +26,7 @@ from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 import os
 
+from meta_ads_analyzer.utils.jsonio import read_json
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -48,8 +49,7 @@ def _slugify(text: str) -> str:
 
 def _load_json(path: Path) -> dict:
     """Load and parse a JSON file."""
-    with open(path) as f:
-        return json.load(f)
+    return read_json(path)
 
 
 def _render_html(loophole_data: dict, market_map_data: Optional[dict]) -> str:
@@ -198,6 +198,11 @@ def generate_pdf_sync(
 
 
 
+def _pattern_reach(pattern: dict) -> tuple[int, int]:
+    """Rank aggregated patterns by brand spread, then total frequency."""
+    return len(pattern["brands"]), pattern["frequency"]
+
+
 def _aggregate_market_patterns(brands: list[dict]) -> dict:
     """Aggregate patterns across all brand reports for the market-level section.
 
@@ -213,7 +218,7 @@ def _aggregate_market_patterns(brands: list[dict]) -> dict:
     rc_map: dict[str, dict] = defaultdict(lambda: {"frequency": 0, "brands": [], "scientific_explanation": "", "upstream_gap": ""})
     mech_map: dict[str, dict] = defaultdict(lambda: {"frequency": 0, "brands": [], "scientific_explanation": "", "ingredients_involved": []})
     pain_map: dict[str, dict] = defaultdict(lambda: {"frequency": 0, "brands": [], "symptoms": []})
-    nobody_does_well: list[str] = []
+    nobody_does_well: dict[str, None] = {}  # insertion-ordered set
 
     for brand in brands:
         bname = brand.get("brand_name", "Unknown")
@@ -222,65 +227,62 @@ def _aggregate_market_patterns(brands: list[dict]) -> dict:
             key = (rc.get("root_cause") or "")[:80]
             if not key or key.lower() in ("none stated", "none stated in ad"):
                 continue
-            rc_map[key]["frequency"] += rc.get("frequency", 1)
-            if bname not in rc_map[key]["brands"]:
-                rc_map[key]["brands"].append(bname)
-            if not rc_map[key]["scientific_explanation"] and rc.get("scientific_explanation"):
-                rc_map[key]["scientific_explanation"] = rc["scientific_explanation"]
-            if not rc_map[key]["upstream_gap"] and rc.get("upstream_gap"):
-                rc_map[key]["upstream_gap"] = rc["upstream_gap"]
+            entry = rc_map[key]
+            entry["frequency"] += rc.get("frequency", 1)
+            if bname not in entry["brands"]:
+                entry["brands"].append(bname)
+            if not entry["scientific_explanation"] and rc.get("scientific_explanation"):
+                entry["scientific_explanation"] = rc["scientific_explanation"]
+            if not entry["upstream_gap"] and rc.get("upstream_gap"):
+                entry["upstream_gap"] = rc["upstream_gap"]
 
         for mech in brand.get("mechanisms", []):
             key = (mech.get("mechanism") or "")[:80]
             if not key or key.lower() in ("none stated", "none stated in ad"):
                 continue
-            mech_map[key]["frequency"] += mech.get("frequency", 1)
-            if bname not in mech_map[key]["brands"]:
-                mech_map[key]["brands"].append(bname)
-            if not mech_map[key]["scientific_explanation"] and mech.get("scientific_explanation"):
-                mech_map[key]["scientific_explanation"] = mech["scientific_explanation"]
+            entry = mech_map[key]
+            entry["frequency"] += mech.get("frequency", 1)
+            if bname not in entry["brands"]:
+                entry["brands"].append(bname)
+            if not entry["scientific_explanation"] and mech.get("scientific_explanation"):
+                entry["scientific_explanation"] = mech["scientific_explanation"]
+            ingredients = entry["ingredients_involved"]
             for ing in mech.get("ingredients_involved", []):
-                if ing and ing not in mech_map[key]["ingredients_involved"]:
-                    mech_map[key]["ingredients_involved"].append(ing)
+                if ing and ing not in ingredients:
+                    ingredients.append(ing)
 
         for pp in brand.get("pain_points", []):
             key = (pp.get("pain_point") or "")[:80]
             if not key:
                 continue
-            pain_map[key]["frequency"] += pp.get("frequency", 1)
-            if bname not in pain_map[key]["brands"]:
-                pain_map[key]["brands"].append(bname)
+            entry = pain_map[key]
+            entry["frequency"] += pp.get("frequency", 1)
+            if bname not in entry["brands"]:
+                entry["brands"].append(bname)
+            symptoms = entry["symptoms"]
             for sym in pp.get("symptoms", []):
-                if sym and sym not in pain_map[key]["symptoms"]:
-                    pain_map[key]["symptoms"].append(sym)
-
-        for item in brand.get("what_nobody_does_well", []):
-            if item and item not in nobody_does_well:
-                nobody_does_well.append(item)
-
-    top_root_causes = sorted(
-        [{"root_cause": k, **v} for k, v in rc_map.items()],
-        key=lambda x: (len(x["brands"]), x["frequency"]),
-        reverse=True,
-    )[:6]
-
-    top_mechanisms = sorted(
-        [{"mechanism": k, **v} for k, v in mech_map.items()],
-        key=lambda x: (len(x["brands"]), x["frequency"]),
-        reverse=True,
-    )[:6]
-
-    top_pain_points = sorted(
-        [{"pain_point": k, **v} for k, v in pain_map.items()],
-        key=lambda x: (len(x["brands"]), x["frequency"]),
-        reverse=True,
-    )[:8]
+                if sym and sym not in symptoms:
+                    symptoms.append(sym)
+
+        nobody_does_well.update(
+            dict.fromkeys(item for item in brand.get("what_nobody_does_well", []) if item)
+        )
+
+    top_root_causes = heapq.nlargest(
+        6, ({"root_cause": k, **v} for k, v in rc_map.items()), key=_pattern_reach
+    )
+    top_mechanisms = heapq.nlargest(
+        6, ({"mechanism": k, **v} for k, v in mech_map.items()), key=_pattern_reach
+    )
+    top_pain_points = heapq.nlargest(
+        8, ({"pain_point": k, **v} for k, v in pain_map.items()), key=_pattern_reach
+    )
 
     return {
         "top_root_causes": top_root_causes,
         "top_mechanisms": top_mechanisms,
         "top_pain_points": top_pain_points,
-        "what_nobody_does_well": nobody_does_well,
+        "what_nobody_does_well": list(nobody_does_well),
     }
 
 
@@ -376,8 +378,10 @@ async def generate_market_pdf(
     output_dir = Path(output_dir).expanduser()
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    date_str = datetime.now().strftime("%B %d, %Y")
-    date_slug = datetime.now().strftime("%Y%m%d")
+    # One clock read so the filename and the report date can't straddle midnight
+    now = datetime.now()
+    date_str = now.strftime("%B %d, %Y")
+    date_slug = now.strftime("%Y%m%d")
     keyword_slug = _slugify(keyword)
     slug = "blue_ocean_cross_category" if blue_ocean_framing else "market_analysis"
     pdf_path = output_dir / f"{keyword_slug}_{date_slug}_{slug}.pdf"
@@ -491,9 +495,10 @@ async def generate_blue_ocean_pdf(
     output_dir = Path(output_dir).expanduser()
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    now = datetime.now()
     if output_filename is None:
         keyword = blue_ocean_doc.keyword
-        date_str = datetime.now().strftime("%Y%m%d")
+        date_str = now.strftime("%Y%m%d")
         output_filename = f"{_slugify(keyword)}_{date_str}_blue_ocean"
 
     pdf_path = output_dir / f"{output_filename}.pdf"
@@ -509,7 +514,7 @@ async def generate_blue_ocean_pdf(
     template = env.get_template("blue_ocean_report.html")
     html_content = template.render(
         report=blue_ocean_doc,
-        generated_date=datetime.now().strftime("%B %d, %Y"),
+        generated_date=now.strftime("%B %d, %Y"),
     )
 
     # Write to temp file
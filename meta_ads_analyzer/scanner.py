@@ -6,6 +6,7 @@ from typing import Any, Optional
 
 from meta_ads_analyzer.classifier.product_type import classify_product_type_batch
 from meta_ads_analyzer.models import ScanResult
+from meta_ads_analyzer.scraper.browser_pool import BrowserPool
 from meta_ads_analyzer.scraper.meta_library import MetaAdsScraper
 from meta_ads_analyzer.selector import aggregate_by_advertiser, rank_advertisers
 from meta_ads_analyzer.utils.logging import get_logger
@@ -19,6 +20,7 @@ async def run_scan(
     classify_products: bool = True,
     page_id: Optional[str] = None,
     expected_page_name: Optional[str] = None,
+    browser_pool: Optional[BrowserPool] = None,
 ) -> ScanResult:
     """Run metadata-only scan of Meta Ads Library.
 
@@ -30,6 +32,8 @@ async def run_scan(
                  which returns ALL ads from that specific page directly.
         expected_page_name: When set, abort early if no ads match this page_name
                  after 3 scrolls (used in Stage B to skip other brands' pages fast).
+        browser_pool: Optional shared browser; when set the scan opens a context
+                 on it instead of launching its own Chromium.
 
     Returns:
         ScanResult with ads and ranked advertisers
@@ -40,7 +44,7 @@ async def run_scan(
         logger.info(f"Starting scan for: {query}")
 
     # Use existing MetaAdsScraper
-    scraper = MetaAdsScraper(config)
+    scraper = MetaAdsScraper(config, browser_pool=browser_pool)
     ads = await scraper.scrape(query, page_id=page_id, expected_page_name=expected_page_name)
     found_page_ids = list(scraper._found_page_ids)  # view_all_page_id from advertiser header
 
@@ -0,0 +1,91 @@
+"""Shared Playwright browser for back-to-back Meta Ads Library scans.
+
+Launching Chromium dominates the cost of a short scan. The pool launches one
+browser and hands out isolated contexts (cheap, separate cookies/storage), so
+several scans can share a single browser process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from meta_ads_analyzer.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+LAUNCH_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+
+class BrowserPool:
+    """Single Chromium instance shared across scans via per-scan contexts.
+
+    Usage:
+        async with BrowserPool(headless=True) as pool:
+            async with pool.context(viewport=...) as context:
+                page = await context.new_page()
+    """
+
+    def __init__(self, headless: bool = True, max_uses: int = 20):
+        self.headless = headless
+        self.max_uses = max_uses
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+        self._uses = 0
+        self._active = 0
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict[str, Any]) -> BrowserPool:
+        scraper_cfg = config.get("scraper", {})
+        return cls(
+            headless=scraper_cfg.get("headless", True),
+            max_uses=scraper_cfg.get("browser_max_uses", 20),
+        )
+
+    async def __aenter__(self) -> BrowserPool:
+        self._playwright = await async_playwright().start()
+        await self._launch()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self) -> None:
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=LAUNCH_ARGS,
+        )
+        self._uses = 0
+
+    @asynccontextmanager
+    async def context(self, **context_options: Any) -> AsyncIterator[BrowserContext]:
+        """Yield a fresh browser context, closing it on exit.
+
+        The underlying browser is relaunched after max_uses contexts, but only
+        once no other context is still open on it.
+        """
+        async with self._lock:
+            if self._uses >= self.max_uses and self._active == 0:
+                logger.debug(f"Recycling pooled browser after {self._uses} contexts")
+                await self._browser.close()
+                await self._launch()
+            self._uses += 1
+            self._active += 1
+
+        try:
+            context = await self._browser.new_context(**context_options)
+            try:
+                yield context
+            finally:
+                await context.close()
+        finally:
+            self._active -= 1
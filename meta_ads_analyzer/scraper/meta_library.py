@@ -13,15 +13,25 @@ from pathlib import Path
 from typing import Any
 from urllib.parse import quote_plus
 
-from playwright.async_api import Browser, Page, async_playwright
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 
 from meta_ads_analyzer.models import AdType, ScrapedAd
+from meta_ads_analyzer.scraper.browser_pool import LAUNCH_ARGS, BrowserPool
 from meta_ads_analyzer.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
 ADS_LIBRARY_URL = "https://www.facebook.com/ads/library/"
 
+CONTEXT_OPTIONS: dict[str, Any] = {
+    "viewport": {"width": 1920, "height": 1080},
+    "user_agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+}
+
 
 def _parse_number_text(text: str) -> int:
     """Parse human-readable numbers like '10K', '1.5M', '1,250' to integers."""
@@ -71,8 +81,9 @@ def _parse_impression_range(text: str) -> tuple[int, int | None]:
 class MetaAdsScraper:
     """Scrape ads from Meta Ads Library."""
 
-    def __init__(self, config: dict[str, Any]):
+    def __init__(self, config: dict[str, Any], browser_pool: BrowserPool | None = None):
         self.config = config
+        self.browser_pool = browser_pool
         self.scraper_cfg = config.get("scraper", {})
         self.max_ads = self.scraper_cfg.get("max_ads", 100)
         self.headless = self.scraper_cfg.get("headless", True)
@@ -110,32 +121,38 @@ class MetaAdsScraper:
         else:
             logger.info(f"Starting scrape for query: {query} (max {self.max_ads} ads)")
 
+        if self.browser_pool is not None:
+            async with self.browser_pool.context(**CONTEXT_OPTIONS) as context:
+                return await self._scrape_in_context(context, query, page_id, expected_page_name)
+
         async with async_playwright() as p:
             self._browser = await p.chromium.launch(
                 headless=self.headless,
-                args=["--disable-blink-features=AutomationControlled"],
-            )
-            context = await self._browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent=(
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
+                args=LAUNCH_ARGS,
             )
-            page = await context.new_page()
-
+            context = await self._browser.new_context(**CONTEXT_OPTIONS)
             try:
-                ads = await self._scrape_ads(
-                    page, query, page_id=page_id, expected_page_name=expected_page_name
-                )
-                label = f"page_id:{page_id}" if page_id else f"query:{query}"
-                logger.info(f"Scraped {len(ads)} ads for {label}")
-                return ads
+                return await self._scrape_in_context(context, query, page_id, expected_page_name)
             finally:
                 await context.close()
                 await self._browser.close()
 
+    async def _scrape_in_context(
+        self,
+        context: BrowserContext,
+        query: str,
+        page_id: str | None,
+        expected_page_name: str | None,
+    ) -> list[ScrapedAd]:
+        """Open a page in the given browser context and scrape it."""
+        page = await context.new_page()
+        ads = await self._scrape_ads(
+            page, query, page_id=page_id, expected_page_name=expected_page_name
+        )
+        label = f"page_id:{page_id}" if page_id else f"query:{query}"
+        logger.info(f"Scraped {len(ads)} ads for {label}")
+        return ads
+
     async def _scrape_ads(
         self,
         page: Page,
@@ -8,8 +8,9 @@ Ranks advertisers by composite score (recent activity + impression volume).
 from __future__ import annotations
 
 import math
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 from urllib.parse import urlparse
 
 from meta_ads_analyzer.models import (
@@ -26,10 +27,51 @@ from meta_ads_analyzer.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+class _Thresholds(NamedTuple):
+    """[selection] thresholds with defaults applied, resolved once per run."""
+
+    active_winner_max_days: int
+    active_winner_min_impressions: int
+    proven_recent_max_days: int
+    proven_recent_min_impressions: int
+    strategic_direction_max_days: int
+    recent_moderate_max_days: int
+    recent_moderate_min_impressions: int
+    skip_older_than_days: int
+    min_primary_text_words: int
+    failed_test_max_impressions: int
+    failed_test_min_days: int
+
+
+_THRESHOLD_DEFAULTS = _Thresholds(
+    active_winner_max_days=14,
+    active_winner_min_impressions=50000,
+    proven_recent_max_days=30,
+    proven_recent_min_impressions=10000,
+    strategic_direction_max_days=7,
+    recent_moderate_max_days=60,
+    recent_moderate_min_impressions=50000,
+    skip_older_than_days=180,
+    min_primary_text_words=50,
+    failed_test_max_impressions=1000,
+    failed_test_min_days=30,
+)
+
+
+def _selection_thresholds(config: dict) -> _Thresholds:
+    """Read the [selection] thresholds from config, filling in defaults."""
+    selection_cfg = config.get("selection", {})
+    return _Thresholds._make(
+        selection_cfg.get(name, default)
+        for name, default in zip(_Thresholds._fields, _THRESHOLD_DEFAULTS)
+    )
+
+
 def classify_ad(
     ad: ScrapedAd,
     config: dict,
     now: Optional[datetime] = None,
+    thresholds: Optional[_Thresholds] = None,
 ) -> tuple[Optional[Priority], str, Optional[SkipReason], Optional[int]]:
     """Classify a single ad by priority level.
 
@@ -37,14 +79,16 @@ def classify_ad(
         ad: Ad to classify
         config: Config dict with [selection] section
         now: Current datetime (for testing)
+        thresholds: Pre-resolved thresholds; read from config when omitted
 
     Returns:
         (priority, label, skip_reason, days_since_launch)
     """
     if now is None:
         now = datetime.now(timezone.utc)
+    if thresholds is None:
+        thresholds = _selection_thresholds(config)
 
-    selection_cfg = config.get("selection", {})
     impressions = ad.impression_lower
 
     # Try to parse launch date first (to have it available for skip reasons)
@@ -65,20 +109,21 @@ def classify_ad(
             has_date = False
 
     # Skip rule: thin text (<50 words) - applies regardless of date
-    if ad.max_primary_text_words < selection_cfg.get("min_primary_text_words", 50):
+    if ad.max_primary_text_words < thresholds.min_primary_text_words:
         return None, "SKIP", SkipReason.THIN_TEXT, days_since_launch
 
     # If we have a valid date, apply date-based skip rules
     if has_date:
         # Skip rule: legacy autopilot (>=180 days old)
-        if days_since_launch >= selection_cfg.get("skip_older_than_days", 180):
+        if days_since_launch >= thresholds.skip_older_than_days:
             return None, "SKIP", SkipReason.LEGACY_AUTOPILOT, days_since_launch
 
         # Skip rule: failed test (low impressions + old)
         if impressions > 0:
-            failed_test_max_impressions = selection_cfg.get("failed_test_max_impressions", 1000)
-            failed_test_min_days = selection_cfg.get("failed_test_min_days", 30)
-            if impressions < failed_test_max_impressions and days_since_launch > failed_test_min_days:
+            if (
+                impressions < thresholds.failed_test_max_impressions
+                and days_since_launch > thresholds.failed_test_min_days
+            ):
                 return None, "SKIP", SkipReason.FAILED_TEST, days_since_launch
 
     # Priority classification
@@ -86,20 +131,20 @@ def classify_ad(
         # Date-based classification (preferred when dates available)
         # P1: Active winner (<=14 days + >=50K impressions)
         if (
-            days_since_launch <= selection_cfg.get("active_winner_max_days", 14)
-            and impressions >= selection_cfg.get("active_winner_min_impressions", 50000)
+            days_since_launch <= thresholds.active_winner_max_days
+            and impressions >= thresholds.active_winner_min_impressions
         ):
             return Priority.P1_ACTIVE_WINNER, "ACTIVE_WINNER", None, days_since_launch
 
         # P2: Proven recent (<=30 days + >=10K impressions)
         if (
-            days_since_launch <= selection_cfg.get("proven_recent_max_days", 30)
-            and impressions >= selection_cfg.get("proven_recent_min_impressions", 10000)
+            days_since_launch <= thresholds.proven_recent_max_days
+            and impressions >= thresholds.proven_recent_min_impressions
         ):
             return Priority.P2_PROVEN_RECENT, "PROVEN_RECENT", None, days_since_launch
 
         # P3: Strategic direction (<=7 days, any impressions)
-        if days_since_launch <= selection_cfg.get("strategic_direction_max_days", 7):
+        if days_since_launch <= thresholds.strategic_direction_max_days:
             return (
                 Priority.P3_STRATEGIC_DIRECTION,
                 "STRATEGIC_DIRECTION",
@@ -109,30 +154,30 @@ def classify_ad(
 
         # P4: Recent moderate (<=60 days + >=50K impressions)
         if (
-            days_since_launch <= selection_cfg.get("recent_moderate_max_days", 60)
-            and impressions >= selection_cfg.get("recent_moderate_min_impressions", 50000)
+            days_since_launch <= thresholds.recent_moderate_max_days
+            and impressions >= thresholds.recent_moderate_min_impressions
         ):
             return Priority.P4_RECENT_MODERATE, "RECENT_MODERATE", None, days_since_launch
 
     elif has_date and impressions == 0:
         # Fallback when date available but impressions hidden
-        if days_since_launch <= selection_cfg.get("active_winner_max_days", 14):
+        if days_since_launch <= thresholds.active_winner_max_days:
             return Priority.P1_ACTIVE_WINNER, "ACTIVE_WINNER", None, days_since_launch
 
-        if days_since_launch <= selection_cfg.get("proven_recent_max_days", 30):
+        if days_since_launch <= thresholds.proven_recent_max_days:
             return Priority.P2_PROVEN_RECENT, "PROVEN_RECENT", None, days_since_launch
 
-        if days_since_launch <= selection_cfg.get("recent_moderate_max_days", 60):
+        if days_since_launch <= thresholds.recent_moderate_max_days:
             return Priority.P4_RECENT_MODERATE, "RECENT_MODERATE", None, days_since_launch
 
     else:
         # No date available - use impression-based classification as fallback
         # This handles real-world Meta ads that don't expose launch dates
-        if impressions >= selection_cfg.get("active_winner_min_impressions", 50000):
+        if impressions >= thresholds.active_winner_min_impressions:
             # High impressions = likely active winner
             return Priority.P1_ACTIVE_WINNER, "ACTIVE_WINNER", None, None
 
-        elif impressions >= selection_cfg.get("proven_recent_min_impressions", 10000):
+        elif impressions >= thresholds.proven_recent_min_impressions:
             # Medium-high impressions = likely proven
             return Priority.P2_PROVEN_RECENT, "PROVEN_RECENT", None, None
 
@@ -203,10 +248,13 @@ def select_ads(
     """
     logger.info(f"Selecting ads from {len(ads)} total ads")
 
-    # Classify all ads
+    # Classify all ads against one clock and one set of thresholds
+    if now is None:
+        now = datetime.now(timezone.utc)
+    thresholds = _selection_thresholds(config)
     classified_ads: list[ClassifiedAd] = []
     for ad in ads:
-        priority, label, skip_reason, days = classify_ad(ad, config, now)
+        priority, label, skip_reason, days = classify_ad(ad, config, now, thresholds)
         classified_ads.append(
             ClassifiedAd(
                 ad=ad,
@@ -226,12 +274,10 @@ def select_ads(
     # Deduplicate within each priority group to preserve ads with different priorities
     # This prevents deduplication of ads that happen to have same text but different strategic value
     total_dup_count = 0
-    deduped_by_priority: dict[Priority, list[ClassifiedAd]] = {}
+    deduped_by_priority: dict[Priority, list[ClassifiedAd]] = defaultdict(list)
 
     # Group by priority
     for ca in selected:
-        if ca.priority not in deduped_by_priority:
-            deduped_by_priority[ca.priority] = []
         deduped_by_priority[ca.priority].append(ca)
 
     # Deduplicate within each priority group
@@ -275,20 +321,10 @@ def select_ads(
         total_selected=len(selected),
         total_skipped=len(skipped),
         duplicates_removed=total_dup_count,
+        by_priority=Counter(ca.priority_label for ca in selected if ca.priority),
+        skip_reasons=Counter(ca.skip_reason.value for ca in skipped if ca.skip_reason),
     )
 
-    # Count by priority
-    for ca in selected:
-        if ca.priority:
-            label = ca.priority_label
-            stats.by_priority[label] = stats.by_priority.get(label, 0) + 1
-
-    # Count skip reasons
-    for ca in skipped:
-        if ca.skip_reason:
-            reason = ca.skip_reason.value
-            stats.skip_reasons[reason] = stats.skip_reasons.get(reason, 0) + 1
-
     logger.info(
         f"Selection complete: {stats.total_selected} selected, "
         f"{stats.total_skipped} skipped, {stats.duplicates_removed} duplicates removed"
@@ -345,16 +381,13 @@ def _merge_by_domain(
     stored in all_page_names for downstream filtering.
     """
     # Count how often each page links to each domain
-    page_domain_freq: dict[str, dict[str, int]] = {}
+    page_domain_freq: dict[str, Counter[str]] = defaultdict(Counter)
     for ad in ads:
         if not ad.link_url or not ad.page_name:
             continue
         domain = extract_root_domain(ad.link_url)
         if domain:
-            page_domain_freq.setdefault(ad.page_name, {})
-            page_domain_freq[ad.page_name][domain] = (
-                page_domain_freq[ad.page_name].get(domain, 0) + 1
-            )
+            page_domain_freq[ad.page_name][domain] += 1
 
     # Primary domain for each page = most frequent domain
     page_primary_domain: dict[str, str] = {
@@ -364,12 +397,12 @@ def _merge_by_domain(
     }
 
     # Group advertiser entries by primary domain
-    domain_groups: dict[str, list[AdvertiserEntry]] = {}
+    domain_groups: dict[str, list[AdvertiserEntry]] = defaultdict(list)
     no_domain: list[AdvertiserEntry] = []
     for entry in advertisers:
         domain = page_primary_domain.get(entry.page_name)
         if domain:
-            domain_groups.setdefault(domain, []).append(entry)
+            domain_groups[domain].append(entry)
         else:
             entry.all_page_names = [entry.page_name]
             no_domain.append(entry)
@@ -0,0 +1,119 @@
+"""Route Claude calls through the Message Batches API.
+
+With ``[analyzer] batch_mode = true`` callers hand their request to
+batch_message() instead of calling the API directly. Requests queued on the
+same event loop within BATCH_WINDOW_SECONDS of each other are submitted as
+one Message Batch, which is billed at half the online price and isn't held
+to the per-request rate limit. Each caller awaits its own future, resolved
+with the Message once the batch has ended, so nightly multi-market runs keep
+their gather()-based structure unchanged.
+
+Batches can take minutes to hours to finish, so this is meant for
+non-interactive runs only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import re
+import weakref
+from typing import Any, Optional
+
+import anthropic
+
+from meta_ads_analyzer.utils.claude_client import get_claude, log_usage
+from meta_ads_analyzer.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+BATCH_WINDOW_SECONDS = 1.0
+POLL_INTERVAL_SECONDS = 30.0
+
+_pending: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, tuple[dict[str, Any], asyncio.Future]]
+] = weakref.WeakKeyDictionary()
+_ids = itertools.count(1)
+_flushes: set[asyncio.Task] = set()
+
+
+def batch_mode(config: dict) -> bool:
+    """Whether Claude calls should be queued for a Message Batch."""
+    return bool(config.get("analyzer", {}).get("batch_mode", False))
+
+
+async def batch_message(label: str, **params: Any) -> Any:
+    """Queue a messages request for the next batch and wait for its Message.
+
+    Takes the same keyword arguments as ``messages.create``. ``label`` names
+    the request in the batch (e.g. ``"sea-moss-loopholes"``); a counter is
+    appended so repeated labels stay unique.
+
+    Raises:
+        RuntimeError: If the request errored, expired or was canceled.
+    """
+    loop = asyncio.get_running_loop()
+    queue = _pending.get(loop)
+    if queue is None:
+        queue = _pending[loop] = {}
+        loop.call_later(BATCH_WINDOW_SECONDS, _schedule_flush, loop)
+
+    custom_id = f"{re.sub(r'[^A-Za-z0-9_-]+', '-', label)[:48]}-{next(_ids)}"
+    future = loop.create_future()
+    queue[custom_id] = (params, future)
+    return await future
+
+
+def _schedule_flush(loop: asyncio.AbstractEventLoop) -> None:
+    # Hold a reference so the flush task isn't garbage-collected mid-poll
+    task = loop.create_task(flush_batch())
+    _flushes.add(task)
+    task.add_done_callback(_flushes.discard)
+
+
+async def flush_batch(client: Optional[anthropic.AsyncAnthropic] = None) -> None:
+    """Submit the requests queued on this loop and resolve them when it ends.
+
+    Every queued future is resolved: with its Message, or with an exception
+    if its request failed or the batch couldn't be submitted.
+    """
+    queue = _pending.pop(asyncio.get_running_loop(), None)
+    if not queue:
+        return
+
+    client = client or get_claude()
+    try:
+        batch = await client.messages.batches.create(
+            requests=[
+                {"custom_id": custom_id, "params": params}
+                for custom_id, (params, _) in queue.items()
+            ]
+        )
+        logger.info(f"Submitted Claude message batch {batch.id} ({len(queue)} requests)")
+        while batch.processing_status != "ended":
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+            batch = await client.messages.batches.retrieve(batch.id)
+
+        async for entry in await client.messages.batches.results(batch.id):
+            _, future = queue.pop(entry.custom_id, (None, None))
+            if future is None or future.done():
+                continue
+            if entry.result.type == "succeeded":
+                message = entry.result.message
+                log_usage(message.usage, message.model)
+                future.set_result(message)
+            else:
+                future.set_exception(
+                    RuntimeError(f"Batch request {entry.custom_id} {entry.result.type}")
+                )
+    except Exception as e:
+        logger.error(f"Claude message batch failed: {e}")
+        for _, future in queue.values():
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for custom_id, (_, future) in queue.items():
+        if not future.done():
+            future.set_exception(RuntimeError(f"Batch request {custom_id} has no result"))
+
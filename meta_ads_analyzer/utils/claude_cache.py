@@ -0,0 +1,100 @@
+"""On-disk cache for parsed Claude JSON responses.
+
+Entries are keyed by a hash of the model and the full prompt, so any change to
+the prompt inputs produces a miss. Disabled unless
+``[analyzer] response_cache = true`` is set (or a call site opts in, as the
+strategic dimension extractor does); useful when iterating on report
+rendering without paying for identical Claude calls. Recent entries are also
+kept in a small in-process LRU so repeat lookups in one run skip the disk.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from meta_ads_analyzer.utils.jsonio import dumps, loads
+from meta_ads_analyzer.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = "output/claude_cache"
+MEMORY_CACHE_SIZE = 64
+
+_memory: OrderedDict[str, Any] = OrderedDict()
+
+
+def prompt_hash(model: str, prompt: str) -> str:
+    """Stable 128-bit hex digest for a (model, prompt) pair."""
+    return hashlib.blake2b(f"{model}\0{prompt}".encode(), digest_size=16).hexdigest()
+
+
+def response_cache_dir(config: dict, enabled: bool = False) -> Optional[Path]:
+    """Return the cache directory if response caching is enabled, else None.
+
+    ``enabled`` turns caching on for one call site regardless of
+    ``[analyzer] response_cache``.
+    """
+    analyzer_cfg = config.get("analyzer", {})
+    if not (enabled or analyzer_cfg.get("response_cache", False)):
+        return None
+    return Path(analyzer_cfg.get("response_cache_dir", DEFAULT_CACHE_DIR))
+
+
+async def cached_json_response(
+    prompt: str,
+    model: str,
+    config: dict,
+    fetch: Callable[[], Awaitable[Any]],
+    should_cache: Optional[Callable[[Any], bool]] = None,
+    enabled: bool = False,
+) -> Any:
+    """Return parsed JSON for prompt, calling fetch() only on a cache miss.
+
+    fetch must perform the Claude call and return the parsed JSON. Exceptions
+    from fetch propagate and nothing is cached for that prompt; likewise when
+    should_cache is given and returns False for the result (e.g. a parse
+    fallback). Callers receive their own copy and may mutate it. enabled
+    caches this call even when ``[analyzer] response_cache`` is off.
+    """
+    cache_dir = response_cache_dir(config, enabled)
+    if cache_dir is None:
+        return await fetch()
+
+    path = cache_dir / f"{prompt_hash(model, prompt)}.json"
+    key = str(path)
+    if key in _memory:
+        _memory.move_to_end(key)
+        return copy.deepcopy(_memory[key])
+
+    if path.exists():
+        try:
+            data = loads(path.read_bytes())
+            logger.debug(f"Claude response cache hit: {path.name}")
+            _remember(key, data)
+            return copy.deepcopy(data)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.debug(f"Ignoring unreadable cache entry {path.name}: {e}")
+
+    data = await fetch()
+    if should_cache is not None and not should_cache(data):
+        return data
+    _remember(key, copy.deepcopy(data))
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(dumps(data))
+    except OSError as e:
+        logger.warning(f"Could not write Claude response cache entry: {e}")
+    return data
+
+
+def _remember(key: str, data: Any) -> None:
+    """Store data in the in-process LRU, evicting the oldest entry when full."""
+    _memory[key] = data
+    _memory.move_to_end(key)
+    if len(_memory) > MEMORY_CACHE_SIZE:
+        _memory.popitem(last=False)
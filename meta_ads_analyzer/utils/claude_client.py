@@ -0,0 +1,101 @@
+"""Shared AsyncAnthropic client.
+
+Creating a client per call opens a fresh connection pool (TCP + TLS handshake)
+every time. get_claude() hands out one client per event loop so calls within a
+run reuse keep-alive connections. Keying by loop keeps separate asyncio.run()
+invocations from sharing connections bound to a closed loop. When the
+optional h2 package is installed (``pip install meta-ads-analyzer[speedups]``)
+the client speaks HTTP/2, so concurrent calls multiplex over one connection
+instead of each opening its own.
+
+stream_message() is for long generations: streaming keeps the connection
+active while tokens arrive instead of holding one request open for the whole
+reply. stream_text() wraps it for callers that only need the reply text.
+
+log_usage() reports token counts at debug level, including prompt cache
+reads and writes, so cache_control breakpoints can be checked for hits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import weakref
+from typing import Any, Callable, Optional
+
+import anthropic
+
+from meta_ads_analyzer.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, anthropic.AsyncAnthropic] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_claude() -> anthropic.AsyncAnthropic:
+    """Return the AsyncAnthropic client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        if _HTTP2:
+            client = anthropic.AsyncAnthropic(
+                http_client=anthropic.DefaultAsyncHttpxClient(http2=True)
+            )
+        else:
+            client = anthropic.AsyncAnthropic()
+        _clients[loop] = client
+    return client
+
+
+async def stream_message(
+    client: Optional[anthropic.AsyncAnthropic] = None,
+    on_text: Optional[Callable[[str], None]] = None,
+    **params: Any,
+) -> Any:
+    """Stream a messages request and return the final Message.
+
+    Takes the same keyword arguments as ``messages.create``. Uses the
+    shared client for the running loop unless one is given. ``on_text`` is
+    called with each text delta as it arrives. Callers that need to tell a
+    reply cut off at max_tokens (``stop_reason == "max_tokens"``) from a
+    complete one check the returned Message.
+    """
+    client = client or get_claude()
+    async with client.messages.stream(**params) as stream:
+        if on_text is not None:
+            async for chunk in stream.text_stream:
+                on_text(chunk)
+        message = await stream.get_final_message()
+    log_usage(message.usage, params.get("model"))
+    return message
+
+
+async def stream_text(
+    client: Optional[anthropic.AsyncAnthropic] = None,
+    on_text: Optional[Callable[[str], None]] = None,
+    **params: Any,
+) -> str:
+    """Stream a messages request and return the concatenated response text.
+
+    Same arguments as stream_message().
+    """
+    return message_text(await stream_message(client, on_text, **params))
+
+
+def message_text(message: Any) -> str:
+    """Concatenate the text blocks of a Message."""
+    return "".join(block.text for block in message.content if block.type == "text")
+
+
+def log_usage(usage: Any, model: Optional[str] = None) -> None:
+    """Debug-log a response's token usage, including prompt cache activity."""
+    logger.debug(
+        f"Claude usage ({model}): input={usage.input_tokens} "
+        f"output={usage.output_tokens} "
+        f"cache_read={usage.cache_read_input_tokens or 0} "
+        f"cache_write={usage.cache_creation_input_tokens or 0}"
+    )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import copy
 import os
 from pathlib import Path
 from typing import Any
@@ -15,15 +16,28 @@ except ImportError:
 DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "default.toml"
 
 
+# Parsed TOML keyed by (resolved path, mtime_ns); edits to the file invalidate it
+_toml_cache: dict[tuple[str, int], dict[str, Any]] = {}
+
+
 def load_config(config_path: Path | None = None) -> dict[str, Any]:
-    """Load config from TOML file, with environment variable overrides."""
+    """Load config from TOML file, with environment variable overrides.
+
+    The parsed TOML is cached per file and modification time. Each call returns
+    a fresh deep copy, so callers may mutate the result freely.
+    """
     path = config_path or DEFAULT_CONFIG_PATH
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
 
-    with open(path, "rb") as f:
-        config = tomllib.load(f)
+    key = (str(path.resolve()), path.stat().st_mtime_ns)
+    parsed = _toml_cache.get(key)
+    if parsed is None:
+        with open(path, "rb") as f:
+            parsed = tomllib.load(f)
+        _toml_cache[key] = parsed
 
+    config = copy.deepcopy(parsed)
     _apply_env_overrides(config)
     return config
 
@@ -0,0 +1,188 @@
+"""JSON encode/decode helpers backed by orjson when it is installed.
+
+orjson is an optional speedup (``pip install meta-ads-analyzer[speedups]``);
+without it these fall back to the stdlib json module with the same output
+shape: 2-space indented, UTF-8 and non-serializable values stringified.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+import pydantic_core
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without the extra
+    orjson = None
+
+# A ``` or ```json fenced block; Claude often wraps JSON replies in one.
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes, stringifying unknown types."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option | orjson.OPT_NON_STR_KEYS, default=str)
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        ensure_ascii=False,
+        default=str,
+    ).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def loads_fenced(text: str) -> Any:
+    """Parse a JSON reply, unwrapping a markdown code fence if there is one.
+
+    If that doesn't parse (prose around an unfenced object, or a ``` inside a
+    string value cutting the fence short), the first balanced ``{...}`` or
+    ``[...]`` in the reply is tried before giving up.
+    """
+    stripped = text.strip()
+    if stripped.startswith("```") and "\n" in stripped:
+        # The whole reply is one fenced block: drop the opening ```json line
+        # and the closing fence without scanning for an inner one.
+        payload = stripped.partition("\n")[2].rstrip().removesuffix("```")
+    else:
+        fence = _JSON_FENCE_RE.search(text)
+        payload = fence.group(1) if fence else stripped
+    try:
+        return loads(payload.strip())
+    except json.JSONDecodeError:
+        span = _balanced_span(text)
+        if span is None or span == payload.strip():
+            raise
+        return loads(span)
+
+
+def _balanced_span(text: str) -> str | None:
+    """Return the first balanced JSON object or array in text, if any.
+
+    One pass tracking nesting depth, skipping brackets inside string literals.
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+    start = min(starts)
+    depth = 0
+    in_string = escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+class StreamedArrayItems:
+    """Parse the objects of a streamed JSON reply's array as each one completes.
+
+    Feed text deltas in order; ``feed`` returns the objects that closed in
+    that delta. Only objects that are direct elements of a top-level array,
+    or of an array directly inside the top-level object (``{"items": [...]}``),
+    are returned. Text before the JSON starts, such as a code fence, is
+    skipped. ``failed`` is set if an element doesn't parse, after which
+    nothing more is returned.
+    """
+
+    def __init__(self) -> None:
+        self.failed = False
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._item: list[str] | None = None
+        self._item_depth = 0
+
+    def feed(self, chunk: str) -> list[Any]:
+        items = []
+        for ch in chunk:
+            if self._item is not None:
+                self._item.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = bool(self._stack)
+            elif ch in "{[":
+                if (
+                    ch == "{"
+                    and self._item is None
+                    and self._stack
+                    and self._stack[-1] == "["
+                    and len(self._stack) <= 2
+                ):
+                    self._item = [ch]
+                    self._item_depth = len(self._stack)
+                self._stack.append(ch)
+            elif ch in "}]" and self._stack:
+                self._stack.pop()
+                if self._item is not None and len(self._stack) == self._item_depth:
+                    text, self._item = "".join(self._item), None
+                    if not self.failed:
+                        try:
+                            items.append(loads(text))
+                        except json.JSONDecodeError:
+                            self.failed = True
+        return items if not self.failed else []
+
+
+def loads_enclosed(text: str, opener: str = "[") -> Any:
+    """Parse the span from the first ``[`` (or ``{``) to the last matching closer.
+
+    Returns None when the reply contains no such span.
+    """
+    closer = "]" if opener == "[" else "}"
+    start = text.find(opener)
+    end = text.rfind(closer)
+    if start == -1 or end < start:
+        return None
+    return loads(text[start:end + 1])
+
+
+def write_json(path: Path, obj: Any) -> None:
+    """Write obj to path as indented JSON."""
+    Path(path).write_bytes(dumps(obj, indent=True))
+
+
+def write_model_json(path: Path, model: BaseModel) -> None:
+    """Write a pydantic model as indented JSON.
+
+    pydantic-core serializes the model straight to bytes, so large reports
+    never exist as an intermediate model_dump() dict.
+    """
+    Path(path).write_bytes(pydantic_core.to_json(model, indent=2))
+
+
+def read_json(path: Path) -> Any:
+    """Read and parse a JSON file."""
+    return loads(Path(path).read_bytes())
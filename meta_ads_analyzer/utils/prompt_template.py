@@ -0,0 +1,46 @@
+"""Pre-parsed str.format-style prompt templates.
+
+Large prompt constants are rendered on every Claude call. str.format re-scans
+the whole template each time; PromptTemplate splits it into literal chunks and
+field names once at import, so rendering is a single join.
+"""
+
+from __future__ import annotations
+
+from string import Formatter
+from typing import Any
+
+
+class PromptTemplate:
+    """A str.format template with plain ``{name}`` fields, parsed once.
+
+    ``{{`` / ``}}`` escapes behave as in str.format. Format specs, conversions
+    and positional or attribute fields are not supported.
+    """
+
+    __slots__ = ("_literals", "_fields")
+
+    def __init__(self, template: str):
+        literals: list[str] = []
+        fields: list[str] = []
+        pending: list[str] = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            pending.append(literal)
+            if field is None:
+                continue
+            if spec or conversion or not field.isidentifier():
+                raise ValueError(f"Unsupported prompt template field: {{{field}}}")
+            literals.append("".join(pending))
+            fields.append(field)
+            pending = []
+        literals.append("".join(pending))
+        self._literals = tuple(literals)
+        self._fields = tuple(fields)
+
+    def format(self, **values: Any) -> str:
+        """Render the template; raises KeyError for a missing field."""
+        parts = [self._literals[0]]
+        for field, literal in zip(self._fields, self._literals[1:]):
+            parts.append(str(values[field]))
+            parts.append(literal)
+        return "".join(parts)
@@ -0,0 +1,30 @@
+"""Render rich renderables back into console markup.
+
+The format_*_text helpers build a markup string that callers hand to
+console.print. Tables can't be appended to that string directly, so they are
+rendered here into equivalent markup and kept in their place in the output.
+"""
+
+from __future__ import annotations
+
+import functools
+
+from rich.console import Console, RenderableType
+from rich.text import Text
+
+
+@functools.lru_cache(maxsize=None)
+def _console(width: int | None) -> Console:
+    # Rendering doesn't mutate the console, so one per width is reused across
+    # every table instead of detecting the terminal again each time.
+    return Console(width=width)
+
+
+def render_markup(renderable: RenderableType, width: int | None = None) -> str:
+    """Render ``renderable`` to a markup string that prints identically."""
+    console = _console(width)
+    text = Text()
+    for segment in console.render(renderable):
+        if not segment.control:
+            text.append(segment.text, segment.style)
+    return text.markup.rstrip("\n")
@@ -192,6 +192,19 @@ def test_fallback_classification_when_no_impressions(config, now):
     assert days == 10
 
 
+def test_classify_uses_defaults_and_overrides(now):
+    """Missing [selection] keys fall back to defaults; present keys override them."""
+    ad = make_ad("11", days_ago=20, impressions=75000, word_count=30, now=now)
+
+    assert classify_ad(ad, {}, now)[2] == SkipReason.THIN_TEXT
+
+    config = {"selection": {"min_primary_text_words": 10, "active_winner_max_days": 21}}
+    priority, label, skip_reason, days = classify_ad(ad, config, now)
+
+    assert priority == Priority.P1_ACTIVE_WINNER
+    assert skip_reason is None
+
+
 def test_deduplication():
     """Test duplicate removal by advertiser + text prefix."""
     ads = [
@@ -12,6 +12,7 @@ Run a specific section:
 
 import asyncio
 import json
+import logging
 import tempfile
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -75,6 +76,75 @@ def test_all_modules_import():
     from meta_ads_analyzer.utils.logging import setup_logging, get_logger
 
 
+def test_report_writer_saves_json_report(tmp_path):
+    from meta_ads_analyzer.models import PatternReport
+    from meta_ads_analyzer.reporter.output import ReportWriter
+    from meta_ads_analyzer.utils.jsonio import read_json
+
+    writer = ReportWriter({"reporting": {"output_dir": str(tmp_path), "format": "json"}})
+    path = writer.save_report(
+        PatternReport(search_query="sea moss", total_ads_analyzed=12), "run1"
+    )
+    data = read_json(path)
+    assert data["search_query"] == "sea moss"
+    assert data["total_ads_analyzed"] == 12
+    assert PatternReport.model_validate(data).total_ads_analyzed == 12
+
+
+def test_compare_loads_saved_brand_reports(tmp_path):
+    from meta_ads_analyzer.compare_pipeline import ComparePipeline
+    from meta_ads_analyzer.reporter.output import ReportWriter
+
+    market_dir = tmp_path / "market_sea_moss_20250101"
+    writer = ReportWriter({"reporting": {"output_dir": str(tmp_path)}})
+    for name, total in (("Acme", 3), ("Idle", 0)):
+        writer.save_brand_report(
+            _make_brand_report(name, ["Liver overload"], total_ads=total), market_dir
+        )
+
+    pipeline = ComparePipeline({"reporting": {"output_dir": str(tmp_path)}})
+    reports = pipeline._load_brand_reports("sea moss", None)
+    assert [r.advertiser.page_name for r in reports] == ["Acme"]
+    assert reports[0].pattern_report.root_cause_patterns[0]["root_cause"] == "Liver overload"
+
+
+@pytest.mark.asyncio
+async def test_compare_pipeline_saves_map_during_loopholes_and_prints_nothing(tmp_path, capsys):
+    from meta_ads_analyzer import compare_pipeline
+    from meta_ads_analyzer.compare.strategic_dimensions import StrategicLoopholeDocument
+    from meta_ads_analyzer.reporter.output import ReportWriter
+
+    market_dir = tmp_path / "market_sea_moss_20250101"
+    writer = ReportWriter({"reporting": {"output_dir": str(tmp_path)}})
+    for name in ("Acme", "Beta"):
+        writer.save_brand_report(_make_brand_report(name, ["Liver overload"], total_ads=3), market_dir)
+
+    market_map = _make_market_map()
+
+    async def _loophole_doc(*args):
+        # The market map is written while the loophole document is generated
+        for _ in range(100):
+            saved_maps = list(tmp_path.glob("compare_*/strategic_market_map.json"))
+            if saved_maps:
+                break
+            await asyncio.sleep(0.01)
+        assert saved_maps
+        return StrategicLoopholeDocument(
+            meta={"keyword": "sea moss"}, sophistication_assessment=market_map.sophistication_level
+        )
+
+    pipeline = compare_pipeline.ComparePipeline({"reporting": {"output_dir": str(tmp_path)}})
+    with patch.object(
+        compare_pipeline, "generate_strategic_market_map", AsyncMock(return_value=market_map)
+    ), patch.object(compare_pipeline, "generate_strategic_loophole_doc", _loophole_doc):
+        result = await pipeline.run("sea moss", enhance=True)
+
+    assert result.market_map is not None and result.loophole_doc is not None
+    assert list(tmp_path.glob("compare_*/strategic_loophole_doc.json"))
+    # The CLI prints the formatted map itself; with --json stdout must stay JSON
+    assert capsys.readouterr().out == ""
+
+
 # ── Model tests ──
 
 
@@ -92,6 +162,57 @@ def test_scraped_ad_creation():
     assert ad.ad_id == "test_123"
     assert ad.ad_type == AdType.VIDEO
     assert len(ad.platforms) == 2
+    # Naive UTC, comparable with timestamps in previously saved scans
+    assert ad.scraped_at.tzinfo is None
+
+
+def test_product_type_breakdown_and_dominance():
+    from meta_ads_analyzer.classifier.product_type import (
+        get_dominant_product_type,
+        product_type_breakdown,
+    )
+    from meta_ads_analyzer.models import ProductType, ScrapedAd
+
+    types = [ProductType.SUPPLEMENT] * 3 + [ProductType.SKINCARE, ProductType.UNKNOWN]
+    ads = [ScrapedAd(ad_id=str(i), page_name="P", product_type=t) for i, t in enumerate(types)]
+    assert product_type_breakdown(ads) == {"supplement": 3, "skincare": 1, "unknown": 1}
+    dominant, distribution = get_dominant_product_type(ads)
+    assert dominant == ProductType.SUPPLEMENT
+    assert distribution[ProductType.SUPPLEMENT] == 3
+
+
+def test_dominant_product_type_requires_margin_over_runner_up():
+    from meta_ads_analyzer.classifier.product_type import get_dominant_product_type
+    from meta_ads_analyzer.models import ProductType, ScrapedAd
+
+    types = (
+        [ProductType.SUPPLEMENT] * 5
+        + [ProductType.SKINCARE] * 4
+        + [ProductType.UNKNOWN] * 6
+    )
+    ads = [ScrapedAd(ad_id=str(i), page_name="P", product_type=t) for i, t in enumerate(types)]
+    dominant, distribution = get_dominant_product_type(ads)
+    assert dominant == ProductType.UNKNOWN
+    assert distribution[ProductType.UNKNOWN] == 6
+
+    ads += [ScrapedAd(ad_id="s6", page_name="P", product_type=ProductType.SUPPLEMENT)] * 2
+    dominant, _ = get_dominant_product_type(ads)
+    assert dominant == ProductType.SUPPLEMENT
+
+
+def test_scraped_ad_searchable_text_lower():
+    from meta_ads_analyzer.classifier.product_type import detect_supplement_signals
+    from meta_ads_analyzer.models import ScrapedAd
+
+    ad = ScrapedAd(
+        ad_id="test_124",
+        page_name="Test Brand",
+        primary_text="Two CAPSULES a day",
+        description="Free shipping",
+    )
+    assert ad.searchable_text_lower == "two capsules a day  free shipping"
+    assert "searchable_text_lower" not in ad.model_dump()
+    assert detect_supplement_signals(ad)
 
 
 def test_ad_content_creation():
@@ -416,6 +537,14 @@ async def test_db_store_roundtrip():
             assert stats["scraped_ads"] == 1
             assert stats["ad_content"] == 1
 
+            # Timestamps stay naive, like rows written before
+            await store.complete_run("run_1")
+            async with store._db.execute(
+                "SELECT started_at, completed_at FROM runs WHERE run_id = ?", ("run_1",)
+            ) as cursor:
+                started_at, completed_at = await cursor.fetchone()
+            assert "+" not in started_at and "+" not in completed_at
+
 
 # ── Config tests ──
 
@@ -437,6 +566,341 @@ def test_config_env_nested_underscore_key(monkeypatch):
     assert config["filter"]["min_static_copy_words"] == 300
 
 
+def test_config_cached_copy_is_isolated():
+    """Cached config parses must not leak caller mutations between loads."""
+    from meta_ads_analyzer.utils.config import load_config
+
+    config = load_config()
+    config["scraper"]["max_ads"] = 5
+    assert load_config()["scraper"]["max_ads"] == 100
+
+
+@pytest.mark.asyncio
+async def test_claude_response_cache_roundtrip(tmp_path):
+    from meta_ads_analyzer.utils.claude_cache import cached_json_response
+
+    config = {"analyzer": {"response_cache": True, "response_cache_dir": str(tmp_path)}}
+    fetch = AsyncMock(return_value={"loopholes": [1, 2]})
+
+    first = await cached_json_response("prompt", "model", config, fetch)
+    second = await cached_json_response("prompt", "model", config, fetch)
+    assert first == second == {"loopholes": [1, 2]}
+    assert fetch.await_count == 1
+
+    await cached_json_response("prompt", "model", {"analyzer": {}}, fetch)
+    assert fetch.await_count == 2
+
+    # Results rejected by should_cache are returned but not stored
+    empty = AsyncMock(return_value={"loopholes": []})
+    for _ in range(2):
+        await cached_json_response(
+            "other", "model", config, empty, should_cache=lambda d: bool(d["loopholes"])
+        )
+    assert empty.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_response_cache_reads_entries_back_from_disk(tmp_path, monkeypatch):
+    from meta_ads_analyzer.utils import claude_cache
+
+    config = {"analyzer": {"response_cache": True, "response_cache_dir": str(tmp_path)}}
+    data = {"loopholes": [{"title": "Café – 95%", "score": 0.5}]}
+    await claude_cache.cached_json_response("p", "m", config, AsyncMock(return_value=data))
+
+    monkeypatch.setattr(claude_cache, "_memory", claude_cache.OrderedDict())
+    fetch = AsyncMock()
+    assert await claude_cache.cached_json_response("p", "m", config, fetch) == data
+    fetch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_strategic_dimension_extraction_uses_response_cache(tmp_path):
+    from meta_ads_analyzer.compare import strategic_extractor
+
+    config = {"analyzer": {"response_cache": True, "response_cache_dir": str(tmp_path)}}
+    report = _make_brand_report("Acme", ["Liver overload"], ["binding"])
+    reply = '{"root_causes": [{"text": "Liver overload", "depth_level": "deep"}]}'
+
+    with patch.object(
+        strategic_extractor, "stream_text", AsyncMock(return_value=reply)
+    ) as stream:
+        first = await strategic_extractor.extract_strategic_dimensions(report, config)
+        second = await strategic_extractor.extract_strategic_dimensions(report, config)
+
+    assert first == second and first.root_causes[0].text == "Liver overload"
+    assert stream.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_dimension_cache_works_without_response_cache(tmp_path):
+    from meta_ads_analyzer.compare import strategic_extractor
+
+    config = {"analyzer": {"dimension_cache": True, "response_cache_dir": str(tmp_path)}}
+    report = _make_brand_report("Acme", ["Gut lining damage"], ["sealing"])
+    reply = '{"mechanisms": [{"text": "Sealing", "mechanism_type": "process"}]}'
+
+    with patch.object(
+        strategic_extractor, "stream_text", AsyncMock(return_value=reply)
+    ) as stream:
+        await strategic_extractor.extract_strategic_dimensions(report, config)
+        await strategic_extractor.extract_strategic_dimensions(report, config)
+
+    assert stream.await_count == 1
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+@pytest.mark.asyncio
+async def test_strategic_dimension_extraction_validates_every_dimension():
+    from meta_ads_analyzer.compare import strategic_extractor
+    from meta_ads_analyzer.compare.strategic_dimensions import MassDesirePattern
+
+    reply = json.dumps({
+        "root_causes": [{"text": "Liver overload", "depth_level": "deep"}],
+        "mechanisms": None,
+        "symptoms": [{"symptom": "Bloating", "frequency": 2}],
+        "mass_desires": [{"desire": "Energy"}],
+    })
+    with patch.object(strategic_extractor, "stream_text", AsyncMock(return_value=reply)):
+        dims = await strategic_extractor.extract_strategic_dimensions(
+            _make_brand_report("Acme"), {}
+        )
+
+    assert dims.root_causes[0].depth_level == "deep"
+    assert dims.mechanisms == [] and dims.pain_points == []
+    assert dims.symptoms[0].frequency == 2
+    assert isinstance(dims.mass_desires[0], MassDesirePattern)
+
+
+@pytest.mark.asyncio
+async def test_strategic_dimension_prompt_compiled_once(tmp_path, monkeypatch):
+    from meta_ads_analyzer.compare import strategic_extractor
+
+    # The prompt is located relative to the package, not the working directory
+    monkeypatch.chdir(tmp_path)
+    strategic_extractor._prompt_template.cache_clear()
+    stream = AsyncMock(return_value="{}")
+    with patch.object(strategic_extractor, "stream_text", stream), patch.object(
+        strategic_extractor, "Template", wraps=strategic_extractor.Template
+    ) as template_cls:
+        for name in ("A", "B"):
+            await strategic_extractor.extract_strategic_dimensions(
+                _make_brand_report(name, ["Leber überlastung"]), {}
+            )
+
+    assert template_cls.call_count == 1
+    assert stream.await_count == 2
+    prompt = stream.call_args.kwargs["messages"][0]["content"]
+    assert "B" in prompt
+    # Pattern data is embedded as compact JSON
+    assert '"root_cause":"Leber überlastung"' in prompt
+
+
+@pytest.mark.asyncio
+async def test_strategic_dimension_extraction_many_is_bounded_and_ordered():
+    from meta_ads_analyzer.compare import strategic_extractor
+
+    names = ["A", "B", "C", "D"]
+    reports = [_make_brand_report(name) for name in names]
+    in_flight = 0
+    peak = 0
+
+    async def fake_extract(report, config):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Earlier brands finish last
+        await asyncio.sleep(0.01 * (len(names) - names.index(report.advertiser.page_name)))
+        in_flight -= 1
+        return report.advertiser.page_name
+
+    with patch.object(strategic_extractor, "extract_strategic_dimensions", fake_extract):
+        results = await strategic_extractor.extract_strategic_dimensions_many(
+            reports, {"analyzer": {"max_concurrent": 2}}
+        )
+
+    assert results == names
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_strategic_dimension_extraction_many_survives_one_failure():
+    from meta_ads_analyzer.compare import strategic_extractor
+    from meta_ads_analyzer.compare.strategic_dimensions import StrategicDimensions
+
+    reports = [_make_brand_report(name) for name in ("A", "B")]
+
+    async def fake_extract(report, config):
+        if report.advertiser.page_name == "A":
+            raise RuntimeError("overloaded")
+        return report.advertiser.page_name
+
+    with patch.object(strategic_extractor, "extract_strategic_dimensions", fake_extract):
+        results = await strategic_extractor.extract_strategic_dimensions_many(reports, {})
+
+    assert results == [StrategicDimensions(), "B"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_jsonio_roundtrip(tmp_path, monkeypatch, use_orjson):
+    from meta_ads_analyzer.utils import jsonio
+
+    if not use_orjson:
+        monkeypatch.setattr(jsonio, "orjson", None)
+    elif jsonio.orjson is None:
+        pytest.skip("orjson not installed")
+
+    path = tmp_path / "out.json"
+    jsonio.write_json(path, {"brand": "Café", "path": Path("a/b.mp4")})
+    assert path.read_text(encoding="utf-8").startswith('{\n  "brand": "Café"')
+    assert jsonio.read_json(path) == {"brand": "Café", "path": "a/b.mp4"}
+
+
+def test_write_model_json_matches_model_dump(tmp_path):
+    """write_model_json writes the same data as dumping via model_dump()."""
+    from meta_ads_analyzer.models import ScanResult
+    from meta_ads_analyzer.utils.jsonio import read_json, write_model_json
+
+    result = ScanResult(keyword="café", total_fetched=2)
+    path = tmp_path / "scan.json"
+    write_model_json(path, result)
+    assert path.read_text(encoding="utf-8").startswith("{\n  ")
+    assert read_json(path) == result.model_dump(mode="json")
+
+
+def test_save_strategic_market_map_writes_model_json(tmp_path):
+    from meta_ads_analyzer.compare.strategic_market_map import save_strategic_market_map
+    from meta_ads_analyzer.utils.jsonio import read_json
+
+    market_map = _make_market_map("café crème")
+    path = save_strategic_market_map(market_map, tmp_path / "compare")
+    assert '"keyword": "café crème"' in path.read_text(encoding="utf-8")
+    assert read_json(path) == market_map.model_dump(mode="json")
+
+
+def test_loads_fenced_unwraps_code_blocks():
+    from meta_ads_analyzer.utils.jsonio import loads_fenced
+
+    assert loads_fenced('Here:\n```json\n{"a": [1]}\n```\nDone') == {"a": [1]}
+    assert loads_fenced('```\n{"a": 2}\n```') == {"a": 2}
+    assert loads_fenced('  {"a": 3}\n') == {"a": 3}
+    assert loads_fenced('```json {"a": 4}```') == {"a": 4}
+    # A fence inside a string value doesn't cut a fenced reply short
+    assert loads_fenced('```json\n{"hook": "use ``` here"}\n```') == {"hook": "use ``` here"}
+    # Prose around an unfenced object falls back to the first balanced span
+    assert loads_fenced('Here you go: {"a": {"b": "}"}} Hope it helps!') == {"a": {"b": "}"}}
+    with pytest.raises(json.JSONDecodeError):
+        loads_fenced("not json")
+    with pytest.raises(json.JSONDecodeError):
+        loads_fenced('{"a": [1, 2')
+
+
+def test_loads_enclosed_takes_outermost_span():
+    from meta_ads_analyzer.utils.jsonio import loads_enclosed
+
+    assert loads_enclosed('Sure! ["a", ["b"]] hope that helps') == ["a", ["b"]]
+    assert loads_enclosed('Result: {"x": {"y": 1}}.', "{") == {"x": {"y": 1}}
+    assert loads_enclosed("no json here") is None
+    assert loads_enclosed("] backwards [") is None
+    with pytest.raises(json.JSONDecodeError):
+        loads_enclosed("[not json]")
+
+
+@needs_full_deps
+@pytest.mark.asyncio
+async def test_blue_ocean_doc_skips_claude_for_empty_market():
+    from meta_ads_analyzer.compare import blue_ocean_doc
+
+    with patch.object(blue_ocean_doc, "get_claude") as get_claude, patch.object(
+        blue_ocean_doc, "_scan_adjacent_keywords", AsyncMock(return_value=[])
+    ) as scan:
+        result = await blue_ocean_doc.generate_blue_ocean_doc(
+            "sea moss", None, {}, None, config={}
+        )
+
+    get_claude.return_value.messages.create.assert_not_called()
+    scan.assert_awaited_once()
+    assert result.brands_scanned == 0
+    assert result.market_loopholes
+
+
+@pytest.mark.asyncio
+async def test_blue_ocean_doc_calls_claude_for_focus_brand_in_empty_market():
+    from meta_ads_analyzer.compare import blue_ocean_doc
+
+    focus_report = _make_brand_report("Acme", ["Liver overload"], ["binding"], 3).pattern_report
+    response = MagicMock()
+    response.content = [MagicMock(text='{"market_loopholes": []}')]
+    with patch.object(blue_ocean_doc, "get_claude") as get_claude, patch.object(
+        blue_ocean_doc, "_scan_adjacent_keywords", AsyncMock(return_value=[])
+    ):
+        get_claude.return_value.messages.create = AsyncMock(return_value=response)
+        await blue_ocean_doc.generate_blue_ocean_doc(
+            "sea moss", "Acme", {}, focus_report, config={}
+        )
+
+    create = get_claude.return_value.messages.create
+    create.assert_awaited_once()
+    assert "Liver overload" in create.call_args.kwargs["messages"][0]["content"]
+
+
+def test_blue_ocean_extract_patterns_text_and_values():
+    from meta_ads_analyzer.compare.blue_ocean_doc import _extract_patterns
+
+    patterns = [{"root_cause": "Gut lining"}, {"pattern": "Cortisol"}, {"frequency": 3}]
+    text, values = _extract_patterns(patterns, "root_cause", 5)
+    assert values == ["Gut lining", "Cortisol"]
+    assert text == "  - Gut lining\n  - Cortisol"
+    assert _extract_patterns([], "root_cause", 5) == ("  - (none detected)", [])
+
+
+@needs_full_deps
+@pytest.mark.asyncio
+async def test_adjacent_keyword_scans_cached_per_day(tmp_path):
+    from meta_ads_analyzer.compare import blue_ocean_doc
+
+    config = {"scan": {"adjacent_cache_dir": str(tmp_path)}}
+    rows = [{"keyword": "irish moss", "total_brands": 2, "has_competition": False}]
+    with patch.object(
+        blue_ocean_doc, "_run_adjacent_scans", AsyncMock(return_value=rows)
+    ) as run_scans:
+        assert await blue_ocean_doc._scan_adjacent_keywords("Sea Moss", config) == rows
+        assert await blue_ocean_doc._scan_adjacent_keywords("sea moss", config) == rows
+        assert run_scans.await_count == 1
+
+        config["scan"]["adjacent_cache"] = False
+        await blue_ocean_doc._scan_adjacent_keywords("sea moss", config)
+        assert run_scans.await_count == 2
+
+
+@needs_full_deps
+@pytest.mark.asyncio
+async def test_adjacent_scan_summary_failure_is_logged(caplog):
+    from meta_ads_analyzer.compare import blue_ocean_doc
+    from meta_ads_analyzer.models import ProductType
+
+    def _dominant(ads):
+        if ads == ["bad"]:
+            raise ValueError("no product type")
+        return ProductType.UNKNOWN, 0
+
+    pool = MagicMock()
+    pool.__aenter__ = AsyncMock(return_value=pool)
+    pool.__aexit__ = AsyncMock(return_value=False)
+    with patch.object(
+        blue_ocean_doc, "generate_related_keywords", AsyncMock(return_value=["good", "bad"])
+    ), patch.object(blue_ocean_doc.BrowserPool, "from_config", return_value=pool), patch.object(
+        blue_ocean_doc,
+        "run_scan",
+        AsyncMock(side_effect=lambda kw, *a, **k: MagicMock(ads=[kw])),
+    ), patch.object(blue_ocean_doc, "get_dominant_product_type", _dominant), patch.object(
+        blue_ocean_doc, "aggregate_by_advertiser", return_value=[]
+    ):
+        results = await blue_ocean_doc._run_adjacent_scans("sea moss", {})
+
+    assert [r["keyword"] for r in results] == ["good"]
+    assert "Adjacent scan failed for 'bad': no product type" in caplog.text
+
+
 # ── Report generation test ──
 
 
@@ -542,6 +1006,31 @@ def test_scraper_generate_id_different_content():
     assert id1 != id2
 
 
+@needs_playwright
+@pytest.mark.asyncio
+async def test_browser_pool_recycles_browser():
+    """Pooled browser is relaunched after max_uses contexts."""
+    from meta_ads_analyzer.scraper.browser_pool import BrowserPool
+
+    pool = BrowserPool(max_uses=2)
+    pool._playwright = MagicMock()
+    pool._playwright.chromium.launch = AsyncMock(
+        side_effect=lambda **kw: MagicMock(
+            close=AsyncMock(),
+            new_context=AsyncMock(side_effect=lambda **kw: MagicMock(close=AsyncMock())),
+        )
+    )
+    await pool._launch()
+
+    for _ in range(3):
+        async with pool.context() as context:
+            context.close.assert_not_called()
+        context.close.assert_awaited_once()
+
+    assert pool._playwright.chromium.launch.await_count == 2
+    assert pool._active == 0
+
+
 # ── Pipeline wiring test ──
 
 
@@ -566,6 +1055,732 @@ def test_pipeline_no_debug_by_default():
     assert pipeline.scraper.debug_dir is None
 
 
+@needs_full_deps
+@pytest.mark.asyncio
+async def test_batch_pipeline_concurrent_keeps_query_order():
+    """Concurrent batch runs return reports in input order, one Pipeline per slot."""
+    from meta_ads_analyzer.models import PatternReport
+    from meta_ads_analyzer.pipeline import BatchPipeline
+
+    config = _make_pipeline_config()
+    config["pipeline"]["brand_pause"] = 0
+    delays = {"a": 0.03, "b": 0.0, "c": 0.01}
+
+    async def fake_run(query, brand):
+        await asyncio.sleep(delays[query])
+        return PatternReport(search_query=query, brand=brand)
+
+    with patch("meta_ads_analyzer.pipeline.Pipeline") as pipeline_cls:
+        pipeline_cls.return_value.run = AsyncMock(side_effect=fake_run)
+        reports = await BatchPipeline(config).run_batch(
+            [{"query": q} for q in "abc"], concurrency=2
+        )
+
+    assert [r.search_query for r in reports] == ["a", "b", "c"]
+    assert pipeline_cls.call_count == 2
+
+
+def test_prompt_template_matches_str_format():
+    """PromptTemplate renders byte-identical output to str.format."""
+    from meta_ads_analyzer.compare.blue_ocean_doc import _FOCUS_SECTION
+    from meta_ads_analyzer.utils.prompt_template import PromptTemplate
+
+    raw = 'Brand {name}: {{"count": {count}}} {name}'
+    assert PromptTemplate(raw).format(name="x", count=3) == raw.format(name="x", count=3)
+    rendered = _FOCUS_SECTION.format(
+        focus_brand="Acme", ads_analyzed=5, root_causes="rc", mechanisms="m", avatar="a",
+        pain_points="p", summary="s",
+    )
+    assert "Acme" in rendered
+    with pytest.raises(ValueError):
+        PromptTemplate("{value:>10}")
+
+
+def test_compare_json_output_when_piped():
+    from typer.testing import CliRunner
+
+    from meta_ads_analyzer.cli import app
+    from meta_ads_analyzer.compare.strategic_dimensions import StrategicCompareResult
+    from meta_ads_analyzer.compare_pipeline import ComparePipeline
+
+    result = StrategicCompareResult(keyword="café", market_map=_make_market_map("café"))
+    with patch.object(ComparePipeline, "run", AsyncMock(return_value=result)):
+        out = CliRunner().invoke(app, ["compare", "café", "--json"])
+
+    assert out.exit_code == 0, out.output
+    payload = out.output[out.output.index("{"):]
+    assert payload == result.model_dump_json(indent=2) + "\n"
+    assert json.loads(payload) == result.model_dump(mode="json")
+
+
+def test_compare_no_cache_bypasses_dimension_cache():
+    from typer.testing import CliRunner
+
+    from meta_ads_analyzer import compare_pipeline
+    from meta_ads_analyzer.cli import app
+    from meta_ads_analyzer.compare.strategic_dimensions import StrategicCompareResult
+
+    result = StrategicCompareResult(keyword="sea moss", market_map=_make_market_map())
+    configs = []
+    for args in ([], ["--no-cache"]):
+        with patch.object(compare_pipeline, "ComparePipeline") as pipeline:
+            pipeline.return_value.run = AsyncMock(return_value=result)
+            out = CliRunner().invoke(app, ["compare", "sea moss", "--json", *args])
+        assert out.exit_code == 0, out.output
+        configs.append(pipeline.call_args.args[0]["analyzer"])
+
+    assert configs[0]["dimension_cache"] is True
+    assert configs[1]["dimension_cache"] is False
+    assert configs[1]["response_cache"] is False
+
+
+def test_cli_run_async_returns_result():
+    """_run_async works with or without uvloop installed."""
+    from meta_ads_analyzer.cli import _run_async
+
+    async def answer():
+        await asyncio.sleep(0)
+        return 42
+
+    assert _run_async(answer()) == 42
+
+
+def test_loophole_prompt_splits_static_instructions():
+    """Loophole instructions are data-independent so they can be prompt-cached."""
+    from meta_ads_analyzer.compare.strategic_loophole_doc import (
+        _build_loophole_generation_prompt,
+    )
+
+    instr_a, data_a, focus_a = _build_loophole_generation_prompt(
+        _make_market_map("sea moss"), [], None
+    )
+    instr_b, data_b, focus_b = _build_loophole_generation_prompt(
+        _make_market_map("sea moss"), [], "Acme"
+    )
+    instr_c, data_c, _ = _build_loophole_generation_prompt(_make_market_map("collagen"), [], None)
+    assert instr_a == instr_b == instr_c
+    assert "sea moss" not in instr_a and "{{" not in instr_a
+    # Market data is shared across focus brands; only the last block varies
+    assert data_a == data_b != data_c
+    assert "Acme" in focus_b and "Acme" not in focus_a
+
+
+@pytest.mark.asyncio
+async def test_loophole_schema_sent_as_leading_block():
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    assert "</output_schema>" not in doc._LOOPHOLE_INSTRUCTIONS
+    with patch.object(
+        doc, "stream_message", AsyncMock(return_value=_final_message('{"loopholes": []}'))
+    ) as stream:
+        await doc._generate_loopholes_with_claude(_make_market_map(), [], None, {})
+    blocks = stream.call_args.kwargs["messages"][0]["content"]
+    assert blocks[0]["text"] == doc._LOOPHOLE_OUTPUT_SCHEMA
+    # Schema + instructions form one cached prefix; the schema alone is too short
+    assert [bool(b.get("cache_control")) for b in blocks] == [False, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_loopholes_parsed_as_they_stream_survive_truncation(tmp_path, caplog):
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    loophole = {
+        key: "x"
+        for key in (
+            "title", "the_gap", "tam_size", "tam_rationale", "meta_competition",
+            "meta_competition_evidence", "root_cause", "mechanism", "target_avatar",
+            "pain_point", "mass_desire", "sophistication_response", "response_rationale",
+        )
+    }
+    loophole["title"] = 'The "}" gap'
+    # Cut off at max_tokens partway through the second loophole
+    reply = '```json\n{"loopholes": [' + json.dumps(loophole) + ', {"title": "Half'
+
+    async def _stream(on_text=None, **params):
+        for i in range(0, len(reply), 7):
+            on_text(reply[i : i + 7])
+        return _final_message(reply, stop_reason="max_tokens")
+
+    config = {"analyzer": {"response_cache": True, "response_cache_dir": str(tmp_path)}}
+    with patch.object(doc, "stream_message", _stream):
+        loopholes = await doc._generate_loopholes_with_claude(
+            _make_market_map(), [], None, config
+        )
+
+    assert [(lh.loophole_id, lh.title) for lh in loopholes] == [("L1", 'The "}" gap')]
+    # A short set from a cut-off reply is used once but never cached
+    assert not list(tmp_path.iterdir())
+    assert "max_tokens" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_batch_mode_sends_loophole_doc_calls_as_one_batch():
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+    from meta_ads_analyzer.utils import claude_batch
+
+    replies = {"loopholes": '{"loopholes": []}', "narrative": " Narrative. "}
+
+    def _entry(request):
+        kind = "loopholes" if "loopholes" in request["custom_id"] else "narrative"
+        entry = MagicMock(custom_id=request["custom_id"])
+        entry.result.type = "succeeded"
+        entry.result.message.content = [MagicMock(type="text", text=replies[kind])]
+        return entry
+
+    async def _results(entries):
+        for entry in entries:
+            yield entry
+
+    client = MagicMock()
+    client.messages.batches.create = AsyncMock(
+        return_value=MagicMock(id="batch_1", processing_status="ended")
+    )
+    client.messages.batches.results = AsyncMock(
+        side_effect=lambda _id: _results(
+            [_entry(r) for r in client.messages.batches.create.call_args.kwargs["requests"]]
+        )
+    )
+    config = {"analyzer": {"batch_mode": True}}
+    with patch.object(claude_batch, "BATCH_WINDOW_SECONDS", 0), patch.object(
+        claude_batch, "get_claude", return_value=client
+    ), patch.object(doc, "stream_message", AsyncMock()) as stream:
+        result = await doc.generate_strategic_loophole_doc(_make_market_map(), [], None, config)
+
+    stream.assert_not_called()
+    client.messages.batches.create.assert_awaited_once()
+    requests = client.messages.batches.create.call_args.kwargs["requests"]
+    assert [r["custom_id"].rsplit("-", 1)[0] for r in requests] == [
+        "sea-moss-market-loopholes",
+        "sea-moss-narrative",
+    ]
+    assert result.market_narrative == "Narrative."
+    assert result.loopholes == []
+
+
+@pytest.mark.asyncio
+async def test_loophole_extended_thinking_is_opt_in():
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    with patch.object(
+        doc, "stream_message", AsyncMock(return_value=_final_message('{"loopholes": []}'))
+    ) as stream:
+        await doc._generate_loopholes_with_claude(_make_market_map(), [], None, {})
+        await doc._generate_loopholes_with_claude(
+            _make_market_map(), [], None, {"analyzer": {"extended_thinking": True}}
+        )
+
+    default, thinking = (call.kwargs for call in stream.call_args_list)
+    assert "thinking" not in default and default["temperature"] == 0.3
+    assert thinking["thinking"] == {"type": "enabled", "budget_tokens": 4000}
+    assert "temperature" not in thinking
+    assert thinking["max_tokens"] == default["max_tokens"] + 4000
+
+
+@pytest.mark.asyncio
+async def test_loophole_cache_key_includes_request_options(tmp_path):
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    cache = {"response_cache": True, "response_cache_dir": str(tmp_path)}
+    reply = '{"loopholes": [{"title": "Gap"}]}'
+    with patch.object(doc, "LoopholeOpportunity", MagicMock()), patch.object(
+        doc, "stream_message", AsyncMock(return_value=_final_message(reply))
+    ) as stream:
+        for thinking in (False, True, False, True):
+            await doc._generate_loopholes_with_claude(
+                _make_market_map(), [], None, {"analyzer": {**cache, "extended_thinking": thinking}}
+            )
+
+    # One call per mode; the repeats are served from the cache
+    assert ["thinking" in call.kwargs for call in stream.call_args_list] == [False, True]
+
+
+def test_unparseable_loophole_reply_logs_truncated_text(caplog):
+    from meta_ads_analyzer.compare.strategic_loophole_doc import _parse_loopholes_response
+
+    reply = "not json " + "x" * 1000
+    with caplog.at_level(logging.DEBUG):
+        assert _parse_loopholes_response(reply) == {"loopholes": []}
+    assert f"Response text: {reply[:500]}..." in caplog.messages
+
+
+@pytest.mark.asyncio
+async def test_market_narrative_leads_with_instructions():
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    client = MagicMock()
+    reply = MagicMock()
+    reply.content = [MagicMock(text=" Narrative. ")]
+    client.messages.create = AsyncMock(return_value=reply)
+    with patch.object(doc, "get_claude", return_value=client):
+        text = await doc._generate_market_narrative(_make_market_map(), [], {})
+
+    assert text == "Narrative."
+    blocks = client.messages.create.call_args.kwargs["messages"][0]["content"]
+    assert blocks[0]["text"] == doc._NARRATIVE_INSTRUCTIONS
+    assert "sea moss" in blocks[1]["text"]
+    # Too short to meet the minimum cacheable prefix, so no breakpoint
+    assert not any("cache_control" in block for block in blocks)
+
+
+def test_loophole_prompt_json_is_canonical():
+    from meta_ads_analyzer.compare.strategic_loophole_doc import _canonical_json
+
+    a = {"b": [0.1 + 0.2, "x"], "a": {"share": 1 / 3}}
+    b = {"a": {"share": 0.33333}, "b": [0.3, "x"]}
+    assert _canonical_json(a) == _canonical_json(b) == '{"a":{"share":0.3333},"b":[0.3,"x"]}'
+
+
+def test_what_not_to_do_warns_about_crowded_patterns():
+    from meta_ads_analyzer.compare.strategic_loophole_doc import _generate_what_not_to_do
+
+    market_map = _make_market_map()
+    market_map.root_cause_mechanism_matrix = []
+    market_map.root_cause_comparison.pattern_1 = {
+        "text": "Liver overload " * 10,
+        "brands_using": ["A", "B", "C"],
+    }
+    market_map.mechanism_comparison.pattern_1 = {"text": None, "brands_using": ["A", "B"]}
+
+    warnings = _generate_what_not_to_do(market_map)
+
+    assert warnings[0] == (
+        f"DON'T explain the same root cause as 3 competitors - '{('Liver overload ' * 10)[:60]}...' "
+        "is already crowded positioning"
+    )
+    assert warnings[1] == "DON'T claim the same mechanism as 2 competitors - '...' won't differentiate"
+
+
+def test_competitive_landscape_maps_brand_summaries():
+    from meta_ads_analyzer.compare.strategic_loophole_doc import _build_competitive_landscape
+
+    market_map = _make_market_map()
+    market_map.brand_summaries = [
+        {
+            "brand": "Acme",
+            "ads_analyzed": 4,
+            "primary_root_cause": "gut",
+            "primary_mechanism": "binding",
+            "primary_pain_point": "bloating",
+            "primary_desire": "energy",
+        }
+    ]
+
+    assert _build_competitive_landscape(market_map) == [
+        {
+            "brand": "Acme",
+            "root_cause": "gut",
+            "mechanism": "binding",
+            "pain_point": "bloating",
+            "desire": "energy",
+        }
+    ]
+
+
+def test_loophole_market_data_is_compacted():
+    from meta_ads_analyzer.compare.strategic_loophole_doc import _render_market_data
+
+    market_map = _make_market_map()
+    market_map.root_cause_mechanism_matrix = [
+        {
+            "root_cause": "gut",
+            "mechanism": "binding",
+            "root_cause_cluster": "digestive",
+            "brands_using": ["Brand A", "Brand B"],
+            "num_brands": 2,
+            "total_ads": 9,
+            "market_share": 100,
+            "gap": "SATURATED",
+        }
+    ]
+    block = _render_market_data(market_map)
+
+    assert '"patterns":[{"brands":["A","B"],"frequency":0.5,"pattern":"symptoms one"}]' in block
+    assert "dimension_type" not in block and "pattern_2" not in block
+    # All six dimensions are one JSON object under a single heading
+    assert block.count('"how_patterns_differ"') == 6 and "### " not in block
+    assert '"gap":"SATURATED"' in block and '"num_brands":2' in block
+    assert "Brand A" not in block
+
+
+def test_loophole_market_data_rendered_once_per_map():
+    import gc
+
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    market_map = _make_market_map()
+    with patch.object(doc, "_render_market_data", wraps=doc._render_market_data) as render:
+        first = doc._market_data_block(market_map)
+        assert doc._market_data_block(market_map) is first
+        assert render.call_count == 1
+        other = _make_market_map("irish moss")
+        assert doc._market_data_block(other) != first
+
+    key = id(market_map)
+    del market_map, render
+    gc.collect()
+    assert key not in doc._market_data_cache
+
+
+@pytest.mark.asyncio
+async def test_loophole_docs_share_map_derived_sections_across_focus_brands():
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    market_map = _make_market_map()
+    market_map.root_cause_mechanism_matrix = []
+    market_map.brand_summaries = [
+        {
+            "brand": "Acme",
+            "primary_root_cause": "gut",
+            "primary_mechanism": "binding",
+            "primary_pain_point": "bloating",
+            "primary_desire": "energy",
+        }
+    ]
+    with patch.object(
+        doc, "_generate_loopholes_with_claude", AsyncMock(return_value=[])
+    ), patch.object(doc, "_generate_market_narrative", AsyncMock(return_value="")), patch.object(
+        doc, "_build_competitive_landscape", wraps=doc._build_competitive_landscape
+    ) as landscape, patch.object(
+        doc, "_generate_what_not_to_do", wraps=doc._generate_what_not_to_do
+    ) as warnings:
+        first = await doc.generate_strategic_loophole_doc(market_map, [], "Acme", {})
+        second = await doc.generate_strategic_loophole_doc(market_map, [], "Beta", {})
+
+    assert landscape.call_count == warnings.call_count == 1
+    assert first.competitive_landscape == second.competitive_landscape
+    first.competitive_landscape[0]["brand"] = "changed"
+    assert second.competitive_landscape[0]["brand"] == "Acme"
+
+
+@pytest.mark.asyncio
+async def test_claude_stream_text_returns_final_text(caplog):
+    from meta_ads_analyzer.utils.claude_client import stream_text
+
+    stream = MagicMock()
+    final = _final_message('{"ok": true}')
+    final.usage.input_tokens = 1200
+    final.usage.output_tokens = 40
+    final.usage.cache_read_input_tokens = 1100
+    final.usage.cache_creation_input_tokens = None
+    stream.get_final_message = AsyncMock(return_value=final)
+    client = MagicMock()
+    client.messages.stream.return_value.__aenter__ = AsyncMock(return_value=stream)
+    client.messages.stream.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    with caplog.at_level(logging.DEBUG):
+        text = await stream_text(client, model="m", max_tokens=10, messages=[])
+    assert text == '{"ok": true}'
+    client.messages.stream.assert_called_once_with(model="m", max_tokens=10, messages=[])
+    assert "cache_read=1100 cache_write=0" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_claude_stream_message_returns_final_message():
+    from meta_ads_analyzer.utils.claude_client import stream_message
+
+    async def _text_stream():
+        yield '{"a"'
+        yield ": 1}"
+
+    final = _final_message('{"a": 1}', stop_reason="max_tokens")
+    final.usage.cache_read_input_tokens = final.usage.cache_creation_input_tokens = None
+    stream = MagicMock(text_stream=_text_stream())
+    stream.get_final_message = AsyncMock(return_value=final)
+    client = MagicMock()
+    client.messages.stream.return_value.__aenter__ = AsyncMock(return_value=stream)
+    client.messages.stream.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    chunks = []
+    message = await stream_message(client, chunks.append, model="m", messages=[])
+    assert message is final and message.stop_reason == "max_tokens"
+    assert "".join(chunks) == '{"a": 1}'
+
+
+def test_claude_client_uses_http2_when_h2_is_installed():
+    from meta_ads_analyzer.utils import claude_client
+
+    async def _client():
+        return claude_client.get_claude()
+
+    with patch.object(claude_client, "_HTTP2", True), patch(
+        "anthropic.DefaultAsyncHttpxClient"
+    ) as http_cls, patch("anthropic.AsyncAnthropic") as client_cls:
+        asyncio.run(_client())
+
+    http_cls.assert_called_once_with(http2=True)
+    client_cls.assert_called_once_with(http_client=http_cls.return_value)
+
+
+def test_analyzers_share_one_claude_client_per_loop():
+    from meta_ads_analyzer.analyzer.ad_analyzer import AdAnalyzer
+    from meta_ads_analyzer.analyzer.pattern_analyzer import PatternAnalyzer
+    from meta_ads_analyzer.utils.claude_client import get_claude
+
+    with patch("anthropic.AsyncAnthropic") as client_cls:
+        AdAnalyzer({})
+        PatternAnalyzer({})
+        assert client_cls.call_count == 0
+
+        async def _clients():
+            return get_claude(), get_claude()
+
+        first, second = asyncio.run(_clients())
+        assert first is second
+        assert client_cls.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_loophole_doc_runs_claude_calls_concurrently():
+    from datetime import datetime
+
+    from meta_ads_analyzer.compare import strategic_loophole_doc as doc
+
+    # Each fake waits for the other to start, which only completes if both
+    # calls are in flight together.
+    loopholes_started, narrative_started = asyncio.Event(), asyncio.Event()
+
+    async def _loopholes(*args):
+        loopholes_started.set()
+        await asyncio.wait_for(narrative_started.wait(), timeout=1)
+        return []
+
+    async def _narrative(*args):
+        narrative_started.set()
+        await asyncio.wait_for(loopholes_started.wait(), timeout=1)
+        return "narrative"
+
+    with patch.object(doc, "_generate_loopholes_with_claude", _loopholes), patch.object(
+        doc, "_generate_market_narrative", _narrative
+    ):
+        result = await doc.generate_strategic_loophole_doc(_make_market_map(), [], None, {})
+    assert result.market_narrative == "narrative"
+    assert result.loopholes == []
+    generated_at = datetime.fromisoformat(result.meta["generated_at"])
+    assert generated_at.tzinfo is not None and generated_at.microsecond == 0
+
+
+def test_market_map_text_includes_tables_without_printing(capsys):
+    from meta_ads_analyzer.compare.strategic_market_map import format_strategic_market_map_text
+
+    market_map = _make_market_map()
+    market_map.meta["generated_at"] = "now"
+    market_map.root_cause_mechanism_matrix = [
+        {
+            "root_cause": "gut",
+            "mechanism": "binding",
+            "num_brands": 1,
+            "market_share": 100,
+            "gap": "SATURATED",
+        }
+    ]
+    market_map.brand_summaries = [
+        {
+            "brand": "Acme",
+            "ads_analyzed": 4,
+            "primary_root_cause": "gut",
+            "primary_mechanism": "binding",
+        }
+    ]
+    text = format_strategic_market_map_text(market_map)
+    assert capsys.readouterr().out == ""
+    assert text.index("Brand Summaries") < text.index("Acme")
+    assert "1/1" in text and "[red]SATURATED" in text
+
+
+def test_merge_by_domain_groups_pages_on_primary_domain():
+    from meta_ads_analyzer.models import AdvertiserEntry, ScrapedAd
+    from meta_ads_analyzer.selector import _merge_by_domain
+
+    links = {
+        "Brand": ["https://brand.com/a", "https://brand.com/b"],
+        "Brand Dr": ["https://www.brand.com/c", "https://other.shop/x", "https://brand.com/d"],
+        "Solo": [],
+    }
+    ads = [
+        ScrapedAd(ad_id=f"{page}{i}", page_name=page, link_url=url)
+        for page, urls in links.items()
+        for i, url in enumerate(urls)
+    ]
+    advertisers = [
+        AdvertiserEntry(page_name="Brand", ad_count=2),
+        AdvertiserEntry(page_name="Brand Dr", ad_count=3),
+        AdvertiserEntry(page_name="Solo", ad_count=1),
+    ]
+    merged = _merge_by_domain(advertisers, ads)
+    assert [(e.page_name, e.ad_count) for e in merged] == [("Brand Dr", 5), ("Solo", 1)]
+    assert merged[0].all_page_names == ["Brand Dr", "Brand"]
+
+
+def test_pdf_market_patterns_keep_top_by_reach():
+    from meta_ads_analyzer.reporter.pdf_generator import _aggregate_market_patterns
+
+    brands = [
+        {
+            "brand_name": f"B{i}",
+            "root_causes": [{"root_cause": f"cause {j}", "frequency": j} for j in range(i + 1)],
+        }
+        for i in range(8)
+    ]
+    top = _aggregate_market_patterns(brands)["top_root_causes"]
+    assert [rc["root_cause"] for rc in top] == [f"cause {j}" for j in range(6)]
+    assert top[0]["brands"] == [f"B{i}" for i in range(8)]
+
+
+def test_root_cause_mechanism_matrix_clusters_each_root_cause_once():
+    from meta_ads_analyzer.compare.strategic_market_map import (
+        _build_root_cause_mechanism_matrix,
+        _cluster_root_cause,
+    )
+
+    reports = [
+        _make_brand_report("A", [" Liver overload ", "Lymphatic congestion"], ["binding", "flush"]),
+        _make_brand_report("B", ["Liver overload"], ["binding"]),
+    ]
+    _cluster_root_cause.cache_clear()
+    rows = _build_root_cause_mechanism_matrix(reports, {})
+    assert _cluster_root_cause.cache_info().misses == 2
+
+    top = rows[0]
+    assert (top["root_cause"], top["mechanism"]) == ("Liver overload", "binding")
+    assert top["brands_using"] == ["A", "B"] and top["market_share"] == 100
+    assert top["root_cause_cluster"] == "hepatic_lymphatic" and top["gap"] == "SATURATED"
+    assert {r["root_cause_cluster"] for r in rows[1:]} == {"hepatic_lymphatic", "lymphatic_congestion"}
+    assert len(rows) == 4
+
+
+def test_pattern_report_matrix_counts_combos():
+    from meta_ads_analyzer.analyzer.pattern_analyzer import PatternAnalyzer
+    from meta_ads_analyzer.models import AdAnalysis, PatternReport
+
+    combos = [("gut", "binding")] * 4 + [("liver", "flush"), ("", "binding")]
+    analyses = [
+        AdAnalysis(ad_id=f"ad{i}", brand="B", root_cause=rc, mechanism=mech)
+        for i, (rc, mech) in enumerate(combos)
+    ]
+    with patch("anthropic.AsyncAnthropic"):
+        analyzer = PatternAnalyzer({})
+    report = analyzer._add_root_cause_mechanism_matrix(
+        PatternReport(search_query="q"), analyses
+    )
+    lines = report.executive_summary.splitlines()
+    rows = [line for line in lines if line.startswith("| ") and "Root Cause |" not in line]
+    assert len(rows) == 3
+    assert "| gut | binding | 4 | 67% |" in rows[0]
+    assert "none stated in ad" in rows[2]
+
+
+def test_pattern_matrix_status_buckets_by_percent():
+    from meta_ads_analyzer.analyzer.pattern_analyzer import PatternAnalyzer
+
+    with patch("anthropic.AsyncAnthropic"):
+        analyzer = PatternAnalyzer({})
+    percents = [75, 60, 59, 30, 29, 1, 0]
+    rows = [
+        {"root_cause": f"rc{p}", "mechanism": "m", "num_ads": p, "percent": p}
+        for p in percents
+    ]
+    text = analyzer._format_matrix_text(rows, 100)
+    statuses = [
+        line.rsplit("|", 2)[1].strip()
+        for line in text.splitlines()
+        if line.startswith("| rc")
+    ]
+    assert statuses == [
+        "🔴 SATURATED",
+        "🔴 SATURATED",
+        "🟡 MODERATE",
+        "🟡 MODERATE",
+        "🟢 UNDEREXPLOITED",
+        "🟢 UNDEREXPLOITED",
+        "⚪ NONE",
+    ]
+
+
+def test_rank_patterns_groups_across_brands():
+    from meta_ads_analyzer.compare.strategic_dimensions import StrategicDimensions, SymptomPattern
+    from meta_ads_analyzer.compare.strategic_market_map import (
+        _compare_dimension,
+        _rank_all_dimensions,
+    )
+
+    brand_dimensions = {
+        "B": StrategicDimensions(
+            symptoms=[
+                SymptomPattern(symptom="Puffy face", frequency=2),
+                SymptomPattern(symptom="Low stomach acid", frequency=1),
+            ]
+        ),
+        "A": StrategicDimensions(
+            symptoms=[
+                SymptomPattern(symptom="puffy  face.", frequency=3, example_ad_copy="quote"),
+                SymptomPattern(symptom="Brain fog", frequency=4),
+                SymptomPattern(symptom="High stomach acid", frequency=1),
+            ]
+        ),
+    }
+    ranked = _rank_all_dimensions(brand_dimensions)
+    assert ranked["root_causes"] == [] and len(ranked["symptoms"]) == 4
+    # The most frequent member of a group represents it
+    top = _compare_dimension("symptoms", ranked["symptoms"], brand_dimensions, None).pattern_1
+    assert top == {
+        "symptom": "puffy  face.",
+        "frequency": 5,
+        "brands_using": ["A", "B"],
+        "example": "quote",
+    }
+
+
+@needs_full_deps
+@pytest.mark.asyncio
+async def test_load_focus_brand_report_matches_raw_page_name(tmp_path):
+    from meta_ads_analyzer.market_pipeline import MarketPipeline
+    from meta_ads_analyzer.models import (
+        AdvertiserEntry,
+        BrandReport,
+        PatternReport,
+        SelectionStats,
+    )
+    from meta_ads_analyzer.utils.jsonio import write_model_json
+
+    for name in ("Other Brand", "Acme Labs"):
+        report = BrandReport(
+            advertiser=AdvertiserEntry(page_name=name),
+            keyword="sea moss",
+            selection_stats=SelectionStats(),
+            pattern_report=PatternReport(search_query="sea moss", brand=name),
+        )
+        market_dir = tmp_path / f"market_{name.split()[0]}"
+        market_dir.mkdir()
+        write_model_json(market_dir / "brand_report_x.json", report)
+    (tmp_path / "market_bad").mkdir()
+    (tmp_path / "market_bad" / "brand_report_bad.json").write_text("{}")
+
+    config = _make_pipeline_config()
+    config["reporting"]["output_dir"] = str(tmp_path)
+    found = await MarketPipeline(config)._load_focus_brand_report("acme labs")
+    assert found is not None and found.advertiser.page_name == "Acme Labs"
+    assert await MarketPipeline(config)._load_focus_brand_report("Nope") is None
+
+
+@pytest.mark.asyncio
+async def test_market_pipeline_loads_saved_scan(tmp_path):
+    from meta_ads_analyzer.market_pipeline import MarketPipeline
+    from meta_ads_analyzer.models import AdvertiserEntry, ScanResult, ScrapedAd
+    from meta_ads_analyzer.utils.jsonio import write_model_json
+
+    scan = ScanResult(
+        keyword="café",
+        total_fetched=1,
+        ads=[ScrapedAd(ad_id="1", page_name="Acme")],
+        advertisers=[AdvertiserEntry(page_name="Acme")],
+    )
+    path = tmp_path / "scan.json"
+    write_model_json(path, scan)
+
+    loaded = await MarketPipeline(_make_pipeline_config())._run_scan_stage("café", path)
+    assert loaded == scan
+
+
 def _make_pipeline_config(debug: bool = False) -> dict:
     """Create a minimal config for Pipeline instantiation tests."""
     from meta_ads_analyzer.utils.config import load_config
@@ -573,3 +1788,64 @@ def _make_pipeline_config(debug: bool = False) -> dict:
     config = load_config()
     config.setdefault("scraper", {})["debug"] = debug
     return config
+
+
+def _final_message(text: str, stop_reason: str = "end_turn"):
+    """Create a final Message stand-in with one text block."""
+    message = MagicMock(stop_reason=stop_reason)
+    message.content = [MagicMock(type="text", text=text)]
+    return message
+
+
+def _make_market_map(keyword: str = "sea moss"):
+    """Create a small StrategicMarketMap for prompt-building tests."""
+    from meta_ads_analyzer.compare.strategic_dimensions import (
+        DimensionComparison,
+        MarketSophisticationLevel,
+        StrategicMarketMap,
+    )
+
+    def comparison(dimension: str) -> DimensionComparison:
+        return DimensionComparison(
+            dimension_type=dimension,
+            pattern_1={"pattern": f"{dimension} one", "brands": ["A", "B"], "frequency": 0.5},
+        )
+
+    return StrategicMarketMap(
+        meta={"keyword": keyword, "brands_compared": 2},
+        sophistication_level=MarketSophisticationLevel(
+            stage=3,
+            stage_name="Stage 3",
+            evidence="",
+            strategic_response="new_mechanism",
+            response_rationale="",
+        ),
+        root_cause_comparison=comparison("root_causes"),
+        mechanism_comparison=comparison("mechanisms"),
+        audience_comparison=comparison("target_audiences"),
+        pain_point_comparison=comparison("pain_points"),
+        symptom_comparison=comparison("symptoms"),
+        desire_comparison=comparison("mass_desires"),
+        root_cause_mechanism_matrix=[
+            {"root_cause": "gut", "mechanism": "binding", "brands": ["B", "A"], "share": 0.5}
+        ],
+    )
+
+
+def _make_brand_report(name: str, root_causes=(), mechanisms=(), total_ads: int = 0):
+    """Create a BrandReport whose pattern report lists the given patterns."""
+    from meta_ads_analyzer.models import AdvertiserEntry, BrandReport, PatternReport, SelectionStats
+
+    return BrandReport(
+        advertiser=AdvertiserEntry(page_name=name),
+        keyword="sea moss",
+        selection_stats=SelectionStats(),
+        pattern_report=PatternReport(
+            search_query="sea moss",
+            brand=name,
+            total_ads_analyzed=total_ads,
+            root_cause_patterns=[{"root_cause": rc} for rc in root_causes],
+            mechanism_patterns=[{"mechanism": m} for m in mechanisms],
+        ),
+    )
+